@@ -2,3 +2,4 @@ SCHEMA_CACHE = {}
 PERMISSIONS_CACHE = {}
 FACTORY_CACHE = {}
 BEHAVIOR_CACHE = {}
+SCHEMA_PLAN_CACHE = {}
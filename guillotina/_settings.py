@@ -15,6 +15,14 @@ app_settings = {
     "default_static_filenames": ['index.html', 'index.htm'],
     "utilities": [],
     "store_json": True,
+    "state_codec": "pickle",
+    "json_encoder": "json",
+    "blob_read_ahead_size": 1024 * 1024 * 20,
+    "cache": {
+        "memory_cache_size": 209715200,  # 200mb, used by `memory` cache_strategy
+        "decoded_cache_size": 0,  # bytes of pickled state of decoded objects kept
+        "security_cache_size": 10000  # inherited security settings kept
+    },
     "root_user": {
         "password": ""
     },
@@ -55,6 +55,14 @@ class AnnotationsAdapter(object):
             return annotations[key]
         return default
 
+    async def async_load(self):
+        """
+        Get all the annotations of the object from the database in one go,
+        they are used by `async_get` instead of querying them one by one
+        """
+        if self.obj._p_jar is not None and self.obj._p_oid is not None:
+            await self.obj._p_jar.prefetch_annotations(self.obj)
+
     async def async_keys(self):
         return await self.obj._p_jar.get_annotation_keys(self.obj._p_oid)
 
@@ -43,6 +43,7 @@ from guillotina.interfaces import IPrincipalRoleMap
 from guillotina.interfaces import IResource
 from guillotina.interfaces import IResourceDeserializeFromJson
 from guillotina.interfaces import IResourceSerializeToJson
+from guillotina.interfaces import IResourceSerializeToJsonSummary
 from guillotina.interfaces import IRolePermissionManager
 from guillotina.interfaces import IRolePermissionMap
 from guillotina.json.exceptions import DeserializationError
@@ -57,6 +58,9 @@ from guillotina.utils import valid_id
 
 _zone = tzlocal()
 
+DEFAULT_ITEMS_PAGE_SIZE = 20
+MAX_ITEMS_PAGE_SIZE = 1000
+
 
 def get_content_json_schema_responses(content):
     return {
@@ -767,4 +771,54 @@ async def duplicate(context, request):
         }
     })
 async def ids(context, request):
-    return await context.async_keys()
+    # streamed while the keys are loaded in pages
+    return context.async_iter_keys()
+
+
+@configure.service(
+    context=IFolder, method='GET', name="@items",
+    permission='guillotina.ViewContent',
+    summary='Paginated listing of the items in the resource',
+    parameters=[{
+        "name": "page_size",
+        "in": "query",
+        "type": "integer"
+    }, {
+        "name": "cursor",
+        "in": "query",
+        "type": "string",
+        "description": "Value of `cursor` in the previous page"
+    }],
+    responses={
+        "200": {
+            "description": "Page of items, `cursor` is null on the last page"
+        }
+    })
+async def items(context, request):
+    try:
+        page_size = min(
+            int(request.query.get('page_size', DEFAULT_ITEMS_PAGE_SIZE)), MAX_ITEMS_PAGE_SIZE)
+    except ValueError:
+        page_size = -1
+    if page_size < 1:
+        return ErrorResponse(
+            'PreconditionFailed', 'Invalid page_size', status=412)
+
+    children = await context.async_get_page(
+        request.query.get('cursor'), page_size, suppress_events=True)
+    security = IInteraction(request)
+    result = {
+        'items': [],
+        'cursor': None
+    }
+    visible = [child for child in children if not child.id.startswith('_')]
+    allowed = security.check_permissions('guillotina.AccessContent', visible)
+    for child, child_allowed in zip(visible, allowed):
+        if child_allowed:
+            summary = await get_multi_adapter(
+                (child, request), IResourceSerializeToJsonSummary)()
+            summary['@name'] = child.id
+            result['items'].append(summary)
+    if len(children) == page_size:
+        result['cursor'] = children[-1]._p_oid
+    return result
@@ -90,10 +90,25 @@ class CatalogReindex(Service):
     async def __call__(self):
         search = query_utility(ICatalogUtility)
         if search is not None:
+            kwargs = {}
+            checkpoint = await self.get_checkpoint()
+            if checkpoint is not None:
+                # resume a reindex that failed
+                kwargs['checkpoint'] = checkpoint
             await search.reindex_all_content(
-                self.context, self._security_reindex)
+                self.context, self._security_reindex, **kwargs)
         return {}
 
+    async def get_checkpoint(self):
+        if not self.request.body_exists:
+            return None
+        try:
+            data = await self.request.json()
+        except ValueError:
+            return None
+        if isinstance(data, dict):
+            return data.get('checkpoint')
+
 
 @configure.service(
     context=IResource, method='POST',
@@ -11,6 +11,7 @@ from guillotina.interfaces import IContainer
 from guillotina.interfaces import IInteraction
 from guillotina.interfaces import IPermission
 from guillotina.interfaces import ITraversableView
+from guillotina.renderers import collect_streamed
 from guillotina.transactions import get_tm
 
 import aiohttp
@@ -75,9 +76,10 @@ class WebsocketsView(Service):
         path = tuple(p for p in message['value'].split('/') if p)
 
         # avoid circular import
-        from guillotina.traversal import do_traverse
+        from guillotina.traversal import traverse
 
-        obj, tail = await do_traverse(
+        # paths are relative to the container
+        obj, tail = await traverse(
             self.request, self.request.container, path)
 
         traverse_to = None
@@ -128,6 +130,7 @@ class WebsocketsView(Service):
         view_result = await view()
         if isinstance(view_result, Response):
             view_result = view_result.response
+        view_result = await collect_streamed(view_result)
 
         # Return the value
         ws.send_str(ujson.dumps(view_result))
@@ -1,10 +1,14 @@
+from guillotina._settings import app_settings
 from guillotina.exceptions import BlobChunkNotFound
 from guillotina.transactions import get_transaction
-from io import BytesIO
 
+import asyncio
 import uuid
 
 
+DEFAULT_READ_AHEAD_SIZE = 1024 * 1024 * 20
+
+
 class Blob:
     """
     Blob object is meant to be used with a resource object.
@@ -16,11 +20,15 @@ class Blob:
         data = await blob.async_read()
     """
 
+    # size of every chunk, None for blobs written before we kept track of it
+    chunk_sizes = None
+
     def __init__(self, resource):
         self.bid = uuid.uuid4().hex
         self.resource_zoid = resource._p_oid
         self.size = 0
         self.chunks = 0
+        self.chunk_sizes = []
 
     def open(self, mode='r', transaction=None):
         return BlobFile(self, mode, transaction)
@@ -52,6 +60,7 @@ class BlobFile:
             await self.transaction.del_blob(self.blob.bid)
             self.blob.size = 0
             self.blob.chunks = 0
+            self.blob.chunk_sizes = []
 
         self._started_writing = True
 
@@ -60,12 +69,17 @@ class BlobFile:
 
         self.blob.chunks += 1
         self.blob.size += len(data)
+        if self.blob.chunk_sizes is not None:
+            self.blob.chunk_sizes.append(len(data))
 
     async def async_write(self, data, chunk_size=1024 * 1024 * 1):
-        if isinstance(data, bytes):
-            stream = BytesIO(data)
-        else:
-            stream = data
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            # write slices of the data instead of copying it around
+            view = memoryview(data)
+            for start in range(0, len(view), chunk_size):
+                await self.async_write_chunk(view[start:start + chunk_size])
+            return
+        stream = data
         data = stream.read(chunk_size)
         while data:
             await self.async_write_chunk(data)
@@ -86,6 +100,83 @@ class BlobFile:
         for chunk_index in range(self.blob.chunks):
             yield await self.async_read_chunk(chunk_index)
 
+    async def iter_async_read_ahead(self, first=0, last=None, max_size=None):
+        '''
+        yield chunks from first to last(not included) while the next ones are
+        read from the database in the background, holding around max_size
+        bytes of read ahead data in memory
+        '''
+        if last is None:
+            last = self.blob.chunks
+        if max_size is None:
+            max_size = app_settings.get('blob_read_ahead_size', DEFAULT_READ_AHEAD_SIZE)
+        average_size = max(self.blob.size // max(self.blob.chunks, 1), 1)
+        queue = asyncio.Queue(maxsize=max(max_size // average_size, 1))
+        stopped = asyncio.Event()
+
+        async def read_ahead():
+            for chunk_index in range(first, last):
+                if stopped.is_set():
+                    return
+                try:
+                    data = await self.async_read_chunk(chunk_index)
+                except Exception as ex:
+                    data = ex
+                if stopped.is_set():
+                    return
+                await queue.put(data)
+                if isinstance(data, Exception):
+                    return
+
+        task = asyncio.ensure_future(read_ahead())
+        try:
+            for _ in range(first, last):
+                data = await queue.get()
+                if isinstance(data, Exception):
+                    raise data
+                yield data
+        except GeneratorExit:
+            # closed before the last chunk, nobody wants what is read next
+            task.cancel()
+            raise
+        finally:
+            stopped.set()
+            while not queue.empty():
+                queue.get_nowait()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def iter_async_read_range(self, start, end):
+        '''
+        yield the data between the start and end(not included) byte positions,
+        only reading the chunks that hold it
+        '''
+        first = position = 0
+        last = self.blob.chunks
+        chunk_sizes = self.blob.chunk_sizes
+        if chunk_sizes is not None:
+            while first < last and position + chunk_sizes[first] <= start:
+                position += chunk_sizes[first]
+                first += 1
+            offset = position
+            last = first
+            while last < self.blob.chunks and offset < end:
+                offset += chunk_sizes[last]
+                last += 1
+
+        chunks = self.iter_async_read_ahead(first, last)
+        try:
+            async for data in chunks:
+                if position + len(data) > start:
+                    yield data[max(start - position, 0):end - position]
+                position += len(data)
+                if position >= end:
+                    break
+        finally:
+            await chunks.aclose()
+
     async def async_read(self, chunk_size=None):
         '''
         read all the data... should this implement complete file-like api?
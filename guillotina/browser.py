@@ -7,17 +7,19 @@ from guillotina.interfaces import IResource
 from guillotina.interfaces import ISerializableException
 from guillotina.interfaces import IView
 from guillotina.utils import get_current_request
+from guillotina.utils import memoize_location
 from zope.interface import implementer
 
 
-def get_physical_path(context):
-    parts = [context.__name__]
+def _get_physical_path(context):
     parent = context.__parent__
-    while parent is not None and parent.__name__ is not None:
-        parts.append(parent.__name__)
-        parent = parent.__parent__
-    parts.append('')
-    return [x for x in reversed(parts)]
+    if parent is None or parent.__name__ is None:
+        return ('', context.__name__)
+    return memoize_location('physical', parent, _get_physical_path) + (context.__name__,)
+
+
+def get_physical_path(context):
+    return list(memoize_location('physical', context, _get_physical_path))
 
 
 @adapter(IResource, IRequest)
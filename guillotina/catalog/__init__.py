@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 from guillotina.directives import index
+from guillotina.interfaces import IContainer
 from guillotina.interfaces import IResource
 from guillotina.security.security_code import role_permission_manager
 from guillotina.security.utils import get_principals_with_access_content
 from guillotina.security.utils import get_roles_with_access_content
 from guillotina.utils import get_content_depth
 from guillotina.utils import get_content_path
+from guillotina.utils import iter_parents
 
 
 global_roles_for_permission = role_permission_manager.get_roles_for_permission
@@ -50,3 +52,10 @@ def get_parent_uuid(ob):
     if hasattr(ob, '__parent__')\
             and ob.__parent__ is not None:
         return ob.__parent__.uuid
+
+
+@index.with_accessor(IResource, 'container_id', type='keyword')
+def get_container_id(ob):
+    for parent in iter_parents(ob):
+        if IContainer.providedBy(parent):
+            return parent.id
@@ -1,11 +1,12 @@
 from guillotina import configure
-from guillotina.component import query_adapter
+from guillotina.catalog.utils import get_catalog_data
 from guillotina.content import iter_schemata
 from guillotina.directives import index
 from guillotina.directives import merged_tagged_value_dict
 from guillotina.directives import merged_tagged_value_list
 from guillotina.directives import metadata
 from guillotina.exceptions import NoIndexField
+from guillotina.interfaces import IAnnotations
 from guillotina.interfaces import IAsyncBehavior
 from guillotina.interfaces import ICatalogDataAdapter
 from guillotina.interfaces import ICatalogUtility
@@ -70,8 +71,10 @@ class DefaultSearchUtility(object):
         """
         pass
 
-    async def reindex_all_content(self, container, security=False):
-        """ For all content add a queue task that reindex the object
+    async def reindex_all_content(self, container, security=False, checkpoint=None):
+        """ Reindex all the content below the object, starting again
+        from `checkpoint` if provided. Catalogs storing data can use
+        `guillotina.catalog.reindex.Reindexer`
         """
         pass
 
@@ -87,9 +90,9 @@ class DefaultSearchUtility(object):
 
     async def get_data(self, content, indexes=None):
         data = {}
-        adapter = query_adapter(content, ICatalogDataAdapter)
-        if adapter:
-            data.update(await adapter(indexes))
+        values = await get_catalog_data(content, indexes)
+        if values:
+            data.update(values)
         return data
 
 
@@ -147,8 +150,14 @@ class DefaultCatalogDataAdapter(object):
             'type_name': self.content.type_name
         }
 
-        for schema in iter_schemata(self.content):
-            behavior = schema(self.content)
+        behaviors = [(schema, schema(self.content)) for schema in iter_schemata(self.content)]
+        if indexes is None and len([
+                behavior for _, behavior in behaviors
+                if IAsyncBehavior.implementedBy(behavior.__class__)]) > 1:
+            # all of them are going to be loaded
+            await IAnnotations(self.content).async_load()
+
+        for schema, behavior in behaviors:
             loaded = False
             for index_name, index_data in merged_tagged_value_dict(schema, index.key).items():
                 if index_name in values:
@@ -190,3 +199,26 @@ class DefaultCatalogDataAdapter(object):
                 except NoIndexField:
                     pass
         return values
+
+    def filter(self, values, indexes):
+        '''
+        Part of all the `values` of the content that would be given for `indexes`
+        '''
+        filtered = {
+            'type_name': values['type_name']
+        }
+        for schema in iter_schemata(self.content):
+            for index_name, index_data in merged_tagged_value_dict(schema, index.key).items():
+                if index_name in filtered or index_name not in values:
+                    continue
+                if (('accessor' in index_data and index_data.get('field') in indexes) or
+                        index_name in indexes or
+                        isinstance(getattr(type(self.content), index_name, None), property)):
+                    filtered[index_name] = values[index_name]
+
+            for metadata_name in merged_tagged_value_list(schema, metadata.key):
+                if metadata_name in values and (
+                        metadata_name in indexes or
+                        isinstance(getattr(type(self.content), metadata_name, None), property)):
+                    filtered[metadata_name] = values[metadata_name]
+        return filtered
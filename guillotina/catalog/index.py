@@ -22,6 +22,47 @@ class IndexFuture(object):
         self.update = {}
         self.container = container
         self.request = request
+        # uid -> (object, indexes) to get the catalog data of when committing
+        self._objects = {}
+
+    async def add(self, obj, indexes=None):
+        uid = obj.uuid
+        if indexes is not None and uid in self._objects:
+            previous = self._objects[uid][1]
+            if previous is None:
+                # already getting all the data
+                return
+            indexes = list(set(previous) | set(indexes))
+        txn = obj._p_jar
+        if txn is None:
+            await self.set_data(uid, obj, indexes)
+            return
+        self._objects[uid] = (obj, indexes)
+        for hook, _, _ in txn.get_before_commit_hooks():
+            if hook == self.get_data:
+                return
+        # the catalog data is computed when the transaction commits so the
+        # writer storing the objects can use it too. Hooks are dropped once
+        # run, a transaction object reused by the request needs it again
+        txn.add_before_commit_hook(self.get_data, args=(txn,))
+
+    def discard(self, uid):
+        self._objects.pop(uid, None)
+        self.index.pop(uid, None)
+        self.update.pop(uid, None)
+
+    async def set_data(self, uid, obj, indexes=None):
+        search = query_utility(ICatalogUtility)
+        if indexes is None:
+            self.index[uid] = await search.get_data(obj)
+        else:
+            self.update[uid] = await search.get_data(obj, indexes)
+
+    async def get_data(self, txn):
+        for uid, (obj, indexes) in list(self._objects.items()):
+            if obj._p_jar is txn:
+                del self._objects[uid]
+                await self.set_data(uid, obj, indexes)
 
     async def __call__(self):
         if self.request.view_error:
@@ -41,6 +82,8 @@ class IndexFuture(object):
         self.index = {}
         self.update = {}
         self.remove = []
+        # objects of transactions that were not committed are not indexed
+        self._objects = {}
 
 
 def get_future():
@@ -97,10 +140,7 @@ def remove_object(obj, event):
         return
 
     fut.remove.append((uid, type_name, content_path))
-    if uid in fut.index:
-        del fut.index[uid]
-    if uid in fut.update:
-        del fut.update[uid]
+    fut.discard(uid)
 
 
 @configure.subscriber(for_=(IResource, IObjectAddedEvent))
@@ -116,21 +156,19 @@ async def add_object(obj, event):
     fut = get_future()
     if fut is None:
         return
-    search = query_utility(ICatalogUtility)
-    if search:
-        if IObjectModifiedEvent.providedBy(event):
-            indexes = []
-            if event.payload and len(event.payload) > 0:
-                # get a list of potential indexes
-                for field_name in event.payload.keys():
-                    if '.' in field_name:
-                        for behavior_field_name in event.payload[field_name].keys():
-                            indexes.append(behavior_field_name)
-                    else:
-                        indexes.append(field_name)
-                fut.update[uid] = await search.get_data(obj, indexes)
-        else:
-            fut.index[uid] = await search.get_data(obj)
+    if IObjectModifiedEvent.providedBy(event):
+        indexes = []
+        if event.payload and len(event.payload) > 0:
+            # get a list of potential indexes
+            for field_name in event.payload.keys():
+                if '.' in field_name:
+                    for behavior_field_name in event.payload[field_name].keys():
+                        indexes.append(behavior_field_name)
+                else:
+                    indexes.append(field_name)
+            await fut.add(obj, indexes)
+    else:
+        await fut.add(obj)
 
 
 @configure.subscriber(for_=(IContainer, IObjectAddedEvent))
@@ -0,0 +1,351 @@
+from guillotina import glogging
+from guillotina.catalog.catalog import DefaultSearchUtility
+from guillotina.catalog.reindex import Reindexer
+from guillotina.catalog.utils import get_index_fields
+from guillotina.component import get_utilities_for
+from guillotina.db import TRASHED_ID
+from guillotina.db.interfaces import IPostgresStorage
+from guillotina.interfaces import IAbsoluteURL
+from guillotina.interfaces import IInteraction
+from guillotina.interfaces import IResourceFactory
+from guillotina.transactions import get_transaction
+from guillotina.utils import get_authenticated_user
+from guillotina.utils import get_content_depth
+from guillotina.utils import get_current_request
+from urllib.parse import parse_qsl
+
+import re
+import ujson
+
+
+logger = glogging.getLogger('guillotina')
+
+DEFAULT_SIZE = 20
+MAX_SIZE = 1000
+
+# index types that are compared as json values instead of text
+JSON_TYPES = ('int', 'long', 'float', 'date', 'boolean')
+FULLTEXT_TYPES = ('text', 'searchabletext')
+# index types we can not query
+SKIPPED_TYPES = ('binary', 'object', 'nested', 'completion')
+
+UPDATE_JSON = """
+UPDATE objects SET json = data.json
+FROM unnest($1::varchar(32)[], $2::jsonb[]) AS data(zoid, json)
+WHERE objects.zoid = data.zoid
+"""
+
+_valid_name = re.compile(r'^\w+$')
+
+
+def get_all_index_fields():
+    '''
+    Indexes of all the registered content types
+    '''
+    fields = {}
+    for type_name, _ in get_utilities_for(IResourceFactory):
+        fields.update(get_index_fields(type_name))
+    return {
+        name: options for name, options in fields.items()
+        if _valid_name.match(name) and options.get('type') not in SKIPPED_TYPES
+    }
+
+
+def get_index_statement(name, options):
+    type_ = options.get('type', 'text')
+    if type_ in FULLTEXT_TYPES:
+        return (f"CREATE INDEX IF NOT EXISTS json_{name} ON objects "
+                f"USING gin (to_tsvector('simple', json->>'{name}'));")
+    if type_ in JSON_TYPES:
+        return f"CREATE INDEX IF NOT EXISTS json_{name} ON objects ((json->'{name}'));"
+    if type_ == 'path':
+        return (f"CREATE INDEX IF NOT EXISTS json_{name} ON objects "
+                f"((json->>'{name}') text_pattern_ops);")
+    # keyword values can be lists so we check them with containment
+    return f"CREATE INDEX IF NOT EXISTS json_{name} ON objects USING gin ((json->'{name}'));"
+
+
+def to_json_value(type_, value):
+    if type_ in ('int', 'long'):
+        value = int(value)
+    elif type_ == 'float':
+        value = float(value)
+    elif type_ == 'boolean' and isinstance(value, str):
+        value = value.lower() in ('true', '1')
+    return ujson.dumps(value)
+
+
+def get_search_principals(request):
+    '''
+    users, groups and global roles of the current user, to check against
+    the indexed access_users and access_roles
+    '''
+    user = get_authenticated_user(request)
+    if user is None:
+        return [], []
+    users = [user.id] + list(getattr(user, 'groups', None) or [])
+    interaction = IInteraction(request)
+    roles = [
+        role for role, allowed in interaction.global_principal_roles(
+            user.id, getattr(user, 'groups', None) or []).items()
+        if allowed]
+    return users, roles
+
+
+class ParsedQuery:
+    '''
+    SQL where clauses and arguments built from a dictionary query.
+
+    Fields can be queried with `field` or `field__<operator>` where the
+    operator is one of eq, not, gt, gte, lt, lte, in or starts. Keys starting
+    with `_` are options: _from, _size, _sort_asc, _sort_des, _metadata
+    and _metadata_not.
+    '''
+
+    def __init__(self, index_fields):
+        self.index_fields = index_fields
+        self.wheres = []
+        self.args = []
+        self.from_ = 0
+        self.size = DEFAULT_SIZE
+        self.sort = None
+        self.metadata = None
+        self.metadata_not = None
+
+    def add_arg(self, value):
+        self.args.append(value)
+        return f'${len(self.args)}'
+
+    def parse(self, query):
+        for key, value in query.items():
+            try:
+                if key.startswith('_'):
+                    self.parse_option(key, value)
+                    continue
+                name, _, operator = key.partition('__')
+                if name == 'type_name':
+                    self.add_type_condition(value, operator or 'eq')
+                elif name in self.index_fields:
+                    self.add_condition(
+                        name, self.index_fields[name].get('type', 'text'), value,
+                        operator or 'eq')
+            except (ValueError, TypeError):
+                logger.warning(f'Invalid catalog query value for {key}: {value}')
+        return self
+
+    def parse_option(self, key, value):
+        if key == '_from':
+            self.from_ = max(int(value), 0)
+        elif key == '_size':
+            self.size = min(max(int(value), 0), MAX_SIZE)
+        elif key in ('_sort_asc', '_sort_des') and value in self.index_fields:
+            self.sort = f"json->'{value}' {'ASC' if key == '_sort_asc' else 'DESC'}"
+        elif key == '_metadata':
+            self.metadata = _as_list(value)
+        elif key == '_metadata_not':
+            self.metadata_not = _as_list(value)
+
+    def add_type_condition(self, value, operator):
+        if operator == 'in':
+            self.wheres.append(f'type = ANY({self.add_arg(_as_list(value))}::text[])')
+        elif operator == 'not':
+            self.wheres.append(f'type != {self.add_arg(value)}')
+        else:
+            self.wheres.append(f'type = {self.add_arg(value)}')
+
+    def add_condition(self, name, type_, value, operator):
+        if operator == 'in':
+            values = _as_list(value)
+            if type_ in JSON_TYPES:
+                arg = self.add_arg([to_json_value(type_, v) for v in values])
+                self.wheres.append(f"json->'{name}' = ANY({arg}::jsonb[])")
+            else:
+                arg = self.add_arg([ujson.dumps(str(v)) for v in values])
+                self.wheres.append(f"json->'{name}' @> ANY({arg}::jsonb[])")
+        elif operator == 'starts':
+            arg = self.add_arg(_escape_like(str(value)) + '%')
+            self.wheres.append(f"json->>'{name}' LIKE {arg}")
+        elif operator in ('gt', 'gte', 'lt', 'lte'):
+            sign = {'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<='}[operator]
+            if type_ in JSON_TYPES:
+                arg = self.add_arg(to_json_value(type_, value))
+                self.wheres.append(f"json->'{name}' {sign} {arg}::jsonb")
+            else:
+                arg = self.add_arg(str(value))
+                self.wheres.append(f"json->>'{name}' {sign} {arg}")
+        elif operator in ('eq', 'not'):
+            if type_ in FULLTEXT_TYPES:
+                arg = self.add_arg(str(value))
+                sql = f"to_tsvector('simple', json->>'{name}') @@ plainto_tsquery('simple', {arg})"
+            elif type_ in JSON_TYPES:
+                arg = self.add_arg(to_json_value(type_, value))
+                sql = f"json->'{name}' = {arg}::jsonb"
+            else:
+                arg = self.add_arg(ujson.dumps(str(value)))
+                sql = f"json->'{name}' @> {arg}::jsonb"
+            if operator == 'not':
+                sql = f'NOT COALESCE({sql}, FALSE)'
+            self.wheres.append(sql)
+
+
+def _as_list(value):
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(',') if v.strip()]
+    return list(value)
+
+
+def _escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+class PGSearchUtility(DefaultSearchUtility):
+    '''
+    Catalog answering queries from the `json` column where postgresql
+    storages keep the `ICatalogDataAdapter` data of every resource.
+
+    Indexing does not need to do anything since the data is written
+    along with the object. Cockroach does not store it.
+    '''
+
+    def __init__(self, settings=None, loop=None):
+        self._index_fields = None
+
+    @property
+    def index_fields(self):
+        if self._index_fields is None:
+            self._index_fields = get_all_index_fields()
+        return self._index_fields
+
+    def get_transaction(self):
+        txn = get_transaction()
+        if txn is None or not IPostgresStorage.providedBy(txn._manager._storage):
+            return None
+        return txn
+
+    async def initialize_catalog(self, container):
+        txn = self.get_transaction()
+        if txn is None:
+            logger.warning('Postgresql catalog needs a postgresql database')
+            return
+        statements = [
+            get_index_statement(name, options)
+            for name, options in self.index_fields.items()]
+        async with txn._lock:
+            for statement in statements:
+                await txn._db_conn.execute(statement)
+
+    async def search(self, container, query):
+        if isinstance(query, str):
+            query = dict(parse_qsl(query))
+        return await self.query(container, query or {})
+
+    async def query(self, container, q, extra_wheres=()):
+        result = {
+            'items_count': 0,
+            'member': []
+        }
+        txn = self.get_transaction()
+        if txn is None:
+            return result
+
+        request = get_current_request()
+        parsed = ParsedQuery(self.index_fields)
+        wheres = [
+            'resource = TRUE',
+            f"parent_id != '{TRASHED_ID}'",
+            f"json->'container_id' @> {parsed.add_arg(ujson.dumps(container.id))}::jsonb"
+        ]
+        users, roles = get_search_principals(request)
+        wheres.append(
+            f"(json->'access_users' ?| {parsed.add_arg(users)}::text[] OR "
+            f"json->'access_roles' ?| {parsed.add_arg(roles)}::text[])")
+        parsed.parse(q)
+        wheres.extend(parsed.wheres)
+        for sql, *values in extra_wheres:
+            wheres.append(sql.format(*[parsed.add_arg(value) for value in values]))
+
+        sql = (f'SELECT zoid, json, count(*) OVER() AS full_count FROM objects '
+               f'WHERE {" AND ".join(wheres)} ')
+        if parsed.sort is not None:
+            sql += f'ORDER BY {parsed.sort} '
+        sql += f'LIMIT {parsed.size} OFFSET {parsed.from_}'
+
+        async with txn._lock:
+            records = await txn._db_conn.fetch(sql, *parsed.args)
+
+        container_url = IAbsoluteURL(container, request)()
+        for record in records:
+            result['items_count'] = record['full_count']
+            result['member'].append(self.get_member(record, container_url, parsed))
+        if len(records) == 0 and parsed.from_ > 0:
+            count_sql = f'SELECT count(*) FROM objects WHERE {" AND ".join(wheres)}'
+            async with txn._lock:
+                result['items_count'] = await txn._db_conn.fetchval(count_sql, *parsed.args)
+        return result
+
+    def get_member(self, record, container_url, parsed):
+        data = ujson.loads(record['json'])
+        member = {
+            '@absolute_url': container_url + data.get('path', ''),
+            '@type': data.get('type_name'),
+            '@uid': record['zoid'],
+            '@name': data.get('id')
+        }
+        for name, value in data.items():
+            if parsed.metadata is not None and name not in parsed.metadata:
+                continue
+            if parsed.metadata_not is not None and name in parsed.metadata_not:
+                continue
+            member[name] = value
+        return member
+
+    async def get_by_uuid(self, container, uuid):
+        return await self.query(container, {'uuid': uuid})
+
+    async def get_object_by_uuid(self, container, uuid):
+        txn = get_transaction()
+        return await txn.get(uuid)
+
+    async def get_by_type(self, container, doc_type, query={}):
+        query = dict(query or {})
+        query['type_name'] = doc_type
+        return await self.search(container, query)
+
+    async def get_by_path(self, container, path, depth=-1, query={}, doc_type=None):
+        if isinstance(query, str):
+            query = dict(parse_qsl(query))
+        query = dict(query or {})
+        if doc_type is not None:
+            query['type_name'] = doc_type
+        extra_wheres = []
+        path = path.rstrip('/')
+        if path:
+            # the object at path and everything below it
+            extra_wheres.append((
+                "(json->>'path' = {} OR json->>'path' LIKE {})",
+                path, _escape_like(path) + '/%'))
+        if depth > -1:
+            # depth 0 is the children of the object at path
+            children_depth = get_content_depth(container) + len(
+                [p for p in path.split('/') if p]) + 1
+            extra_wheres.append(("json->'depth' <= {}::jsonb", str(children_depth + depth)))
+        return await self.query(container, query, extra_wheres)
+
+    async def get_folder_contents(self, container, parent_uid):
+        return await self.query(container, {'parent_uuid': parent_uid})
+
+    async def reindex_all_content(self, container, security=False, checkpoint=None):
+        if self.get_transaction() is None:
+            return
+        reindexer = Reindexer(
+            self, container, security=security, checkpoint=checkpoint,
+            index=self._update_json)
+        return await reindexer()
+
+    async def _update_json(self, container, datas):
+        txn = self.get_transaction()
+        # the uuid of a resource is its oid
+        async with txn._lock:
+            await txn._db_conn.execute(
+                UPDATE_JSON, list(datas.keys()),
+                [ujson.dumps(data) for data in datas.values()])
@@ -0,0 +1,130 @@
+from guillotina import glogging
+from guillotina.interfaces import IContainer
+from guillotina.interfaces import IFolder
+from guillotina.transactions import get_transaction
+from guillotina.utils import get_content_path
+from guillotina.utils import get_current_request
+from guillotina.utils import iter_parents
+from guillotina.utils import navigate_to
+
+import asyncio
+import ujson
+
+
+logger = glogging.getLogger('guillotina')
+
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_CONCURRENCY = 10
+DEFAULT_LOG_EVERY = 5000
+
+
+class Reindexer:
+    '''
+    Walk an object and all the content below it, loading children in pages
+    with keyset pagination, computing the catalog data of every page
+    concurrently and sending it to the catalog in bulk batches.
+
+    Progress is kept as a checkpoint of the folders being walked with the
+    last child handled in each of them. A checkpoint only ever points
+    at content already sent to the catalog, so a failed reindex can be
+    resumed by passing it back in.
+    '''
+
+    def __init__(self, utility, context, request=None, security=False,
+                 batch_size=DEFAULT_BATCH_SIZE, page_size=None,
+                 concurrency=DEFAULT_CONCURRENCY, checkpoint=None,
+                 index=None, log_every=DEFAULT_LOG_EVERY):
+        self.utility = utility
+        self.context = context
+        if request is None:
+            request = get_current_request()
+        # catalog adapters running in the concurrent tasks look it up from here
+        self.request = request
+        self.container = context
+        for parent in iter_parents(context):
+            if IContainer.providedBy(self.container):
+                break
+            self.container = parent
+        self.security = security
+        self.batch_size = batch_size
+        self.page_size = page_size or batch_size
+        self.log_every = log_every
+        if index is None:
+            index = utility.update if security else utility.index
+        self.index = index
+        self.processed = 0
+        self.checkpoint = checkpoint
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._batch = {}
+        self._last_logged = 0
+        # [folder, last child oid handled, (child, data) loaded but not handled]
+        self._stack = []
+
+    async def get_data(self, ob):
+        async with self._semaphore:
+            return await self.utility.get_data(ob)
+
+    async def load_checkpoint(self):
+        if self.checkpoint is None:
+            if self.context is not self.container:
+                # only the content below a container is indexed
+                self._batch[self.context.uuid] = await self.get_data(self.context)
+            self._stack = [[self.context, None, []]]
+            return
+        self.processed = self.checkpoint.get('processed', 0)
+        for path, after in self.checkpoint['folders']:
+            folder = await navigate_to(self.container, path)
+            self._stack.append([folder, after, []])
+
+    def get_checkpoint(self):
+        return {
+            'processed': self.processed,
+            'folders': [
+                [get_content_path(folder), after] for folder, after, _ in self._stack]
+        }
+
+    async def load_page(self, entry):
+        folder, after, _ = entry
+        txn = get_transaction()
+        children = await txn.get_page_of_children(folder, after, self.page_size)
+        datas = await asyncio.gather(*[self.get_data(child) for child in children])
+        entry[2] = list(zip(children, datas))
+
+    async def flush(self):
+        if len(self._batch) > 0:
+            await self.index(self.container, self._batch)
+            self.processed += len(self._batch)
+            self._batch = {}
+        self.checkpoint = self.get_checkpoint()
+        if self.processed - self._last_logged >= self.log_every:
+            self._last_logged = self.processed
+            logger.info(f'Reindexed {self.processed} objects of '
+                        f'{self.container.id}, checkpoint: {ujson.dumps(self.checkpoint)}')
+
+    async def __call__(self):
+        await self.load_checkpoint()
+        try:
+            while len(self._stack) > 0:
+                entry = self._stack[-1]
+                if len(entry[2]) == 0:
+                    await self.load_page(entry)
+                    if len(entry[2]) == 0:
+                        # done with this folder
+                        self._stack.pop()
+                        continue
+                child, data = entry[2].pop(0)
+                self._batch[child.uuid] = data
+                entry[1] = child._p_oid
+                if IFolder.providedBy(child):
+                    # content below the folder comes before its next siblings
+                    self._stack.append([child, None, []])
+                if len(self._batch) >= self.batch_size:
+                    await self.flush()
+            await self.flush()
+        except Exception:
+            logger.error(
+                f'Error reindexing {self.container.id}, resume it with the checkpoint: '
+                f'{ujson.dumps(self.checkpoint)}', exc_info=True)
+            raise
+        logger.info(f'Reindexed {self.processed} objects of {self.container.id}')
+        return self.processed
@@ -1,8 +1,11 @@
+from guillotina._settings import app_settings
+from guillotina.component import query_adapter
 from guillotina.content import get_all_possible_schemas_for_type
 from guillotina.directives import index
 from guillotina.directives import merged_tagged_value_dict
 from guillotina.directives import merged_tagged_value_list
 from guillotina.directives import metadata
+from guillotina.interfaces import ICatalogDataAdapter
 
 
 def get_index_fields(type_name):
@@ -19,3 +22,30 @@ def get_metadata_fields(type_name):
         # create mapping for content type
         fields.extend(merged_tagged_value_list(schema, metadata.key))
     return fields
+
+
+async def get_catalog_data(content, indexes=None):
+    '''
+    Catalog data of the content from its `ICatalogDataAdapter`.
+
+    While a transaction commits, the data of every object is computed once
+    and shared between the writer storing it in the `json` column and the
+    indexer, which gets the part for `indexes` out of it.
+    '''
+    adapter = query_adapter(content, ICatalogDataAdapter)
+    if adapter is None:
+        return None
+    cache = getattr(getattr(content, '_p_jar', None), '_catalog_data', None)
+    if cache is None:
+        return await adapter(indexes)
+    data = cache.get(content._p_oid)
+    if data is None:
+        if indexes is not None and not app_settings.get('store_json', True):
+            # the writer is not going to need all of it
+            return await adapter(indexes)
+        data = cache[content._p_oid] = await adapter()
+    if indexes is None:
+        return data
+    if not hasattr(adapter, 'filter'):
+        return await adapter(indexes)
+    return adapter.filter(data, indexes)
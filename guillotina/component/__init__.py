@@ -12,6 +12,7 @@
 #
 ##############################################################################
 # flake8: noqa
+from guillotina.component._api import freeze_lookups
 from guillotina.component._api import get_adapter
 from guillotina.component._api import get_adapters
 from guillotina.component._api import get_all_utilities_registered_for
@@ -26,6 +27,7 @@ from guillotina.component._api import query_adapter
 from guillotina.component._api import query_multi_adapter
 from guillotina.component._api import query_utility
 from guillotina.component._api import subscribers
+from guillotina.component._api import thaw_lookups
 from guillotina.component._declaration import adaptedBy
 from guillotina.component._declaration import adapter
 from guillotina.component._declaration import adapts
@@ -52,9 +52,43 @@ def get_adapter(object, interface=Interface, name=_BLANK, context=None,
     return adapter_
 
 
+def freeze_lookups():
+    """
+    Cache the factories the global registry finds for adapter lookups
+    without a context. Lookups made with the cache skip the registry hooks,
+    and registering or unregistering components empties it.
+    """
+    globalregistry.base.adapters._lookup_cache = {}
+
+
+def thaw_lookups():
+    globalregistry.base.adapters._lookup_cache = None
+
+
+def _cached_lookup(cache, specs, interface, name):
+    key = (specs, interface, name)
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+    adapters = globalregistry.base.adapters
+    if type(specs) is tuple:
+        factory = adapters.lookup(specs, interface, name)
+    else:
+        factory = adapters.lookup((specs,), interface, name)
+    cache[key] = factory
+    return factory
+
+
 def query_adapter(object, interface=Interface, name=_BLANK, default=None,
                   context=None, args=[], kwargs={}):
     if context is None:
+        cache = globalregistry.base.adapters._lookup_cache
+        if cache is not None:
+            factory = _cached_lookup(cache, providedBy(object), interface, name)
+            if factory is None:
+                return default
+            return factory(object, *args, **kwargs)
         return adapter_hook(interface, object,
                             name=name, default=default,
                             args=args, kwargs=kwargs)
@@ -73,13 +107,18 @@ def get_multi_adapter(objects, interface=Interface, name=_BLANK, context=None,
 
 def query_multi_adapter(objects, interface=Interface, name=_BLANK, default=None,
                         context=None, args=[], kwargs={}):
-    try:
-        registry = get_component_registry(context)
-    except ComponentLookupError:
-        # Oh blast, no site manager. This should *never* happen!
-        return default
+    cache = globalregistry.base.adapters._lookup_cache if context is None else None
+    if cache is not None:
+        factory = _cached_lookup(
+            cache, tuple(map(providedBy, objects)), interface, name)
+    else:
+        try:
+            registry = get_component_registry(context)
+        except ComponentLookupError:
+            # Oh blast, no site manager. This should *never* happen!
+            return default
+        factory = registry.adapters.lookup(map(providedBy, objects), interface, name)
 
-    factory = registry.adapters.lookup(map(providedBy, objects), interface, name)
     if factory is None:
         return default
 
@@ -132,7 +171,18 @@ def adapter_hook(interface, object, name='', default=None, args=[], kwargs={}):
     return factory(object, *args, **kwargs)
 
 
-zope.interface.interface.adapter_hooks.append(adapter_hook)
+def _interface_adapter_hook(interface, object):
+    # adapts objects for `IFoo(ob)`
+    cache = globalregistry.base.adapters._lookup_cache
+    if cache is None:
+        return adapter_hook(interface, object)
+    factory = _cached_lookup(cache, providedBy(object), interface, _BLANK)
+    if factory is None:
+        return None
+    return factory(object)
+
+
+zope.interface.interface.adapter_hooks.append(_interface_adapter_hook)
 #############################################################################
 
 
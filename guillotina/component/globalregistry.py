@@ -33,9 +33,18 @@ class GlobalAdapterRegistry(AdapterRegistry):
         self.__name__ = name
         super(GlobalAdapterRegistry, self).__init__()
 
+    # (provided specifications, interface, name) -> factory once lookups
+    # are frozen, see `guillotina.component.freeze_lookups`
+    _lookup_cache = None
+
     def __reduce__(self):
         return GAR, (self.__parent__, self.__name__)
 
+    def changed(self, originally_changed):
+        super(GlobalAdapterRegistry, self).changed(originally_changed)
+        if self._lookup_cache is not None:
+            self._lookup_cache = {}
+
 
 @implementer(IComponentLookup)
 class GlobalComponents(Components):
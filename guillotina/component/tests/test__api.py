@@ -493,6 +493,47 @@ class Test_query_multi_adapter(unittest.TestCase):
         adapted = self._callFUT((bar, baz), IFoo, '', context=Context())
         self.assertTrue(adapted is None)
 
+    def test_frozen_lookups(self):
+        from zope.interface import Interface
+        from zope.interface import implementer
+        from guillotina.component import freeze_lookups
+        from guillotina.component import get_global_components
+        from guillotina.component import thaw_lookups
+        class IFoo(Interface):
+            pass
+        class IBar(Interface):
+            pass
+        class IBaz(Interface):
+            pass
+        @implementer(IBar)
+        class Bar(object):
+            pass
+        @implementer(IBaz)
+        class Baz(object):
+            pass
+        class FooAdapter(object):
+            def __init__(self, first, second):
+                self.first, self.second = first, second
+        bar = Bar()
+        baz = Baz()
+        freeze_lookups()
+        try:
+            self.assertTrue(self._callFUT((bar, baz), IFoo, '') is None)
+            # registering empties the cache
+            get_global_components().registerAdapter(
+                                        FooAdapter, (IBar, IBaz), IFoo, '')
+            adapted = self._callFUT((bar, baz), IFoo, '')
+            self.assertTrue(adapted.__class__ is FooAdapter)
+            self.assertTrue(self._callFUT((bar, baz), IFoo, '') is not adapted)
+            get_global_components().registerAdapter(
+                                        lambda first: first, (IBar,), IFoo, '')
+            self.assertTrue(IFoo(bar) is bar)
+            get_global_components().unregisterAdapter(
+                                        FooAdapter, (IBar, IBaz), IFoo, '')
+            self.assertTrue(self._callFUT((bar, baz), IFoo, '') is None)
+        finally:
+            thaw_lookups()
+
 
 class Test_get_adapters(unittest.TestCase):
 
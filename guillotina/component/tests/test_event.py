@@ -31,7 +31,51 @@ class Test_dispatch(unittest.TestCase):
         dispatch(event)
         self.assertEqual(_adapted, [event])
 
+
+class Test_async_dispatch(unittest.TestCase):
+
+    def test_dispatch_table(self):
+        import asyncio
+        from zope.interface import Interface
+        from zope.interface import implementer
+        from guillotina.component.globalregistry import get_global_components
+        from guillotina.component.event import async_dispatch
+        from guillotina.component.event import dispatch
+        class IEvent(Interface):
+            pass
+        @implementer(IEvent)
+        class Event(object):
+            pass
+        _adapted = []
+        def _handler(context):
+            _adapted.append(('sync', context))
+        async def _async_handler(context):
+            _adapted.append(('async', context))
+        gsm = get_global_components()
+        event = Event()
+        sync, async_ = gsm.adapters.dispatch_table((event,), None)
+        gsm.registerHandler(_handler, (IEvent,))
+        gsm.registerHandler(_async_handler, (IEvent,))
+        try:
+            # registering handlers empties the table
+            self.assertEqual(gsm.adapters.dispatch_table((event,), None),
+                             (sync + (_handler,), async_ + (_async_handler,)))
+            dispatch(event)
+            # the aiohttp pytest plugin leaves no default loop to use
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(async_dispatch(event))
+            finally:
+                loop.close()
+            self.assertEqual(_adapted, [('sync', event), ('async', event)])
+        finally:
+            gsm.unregisterHandler(_handler, (IEvent,))
+            gsm.unregisterHandler(_async_handler, (IEvent,))
+        self.assertEqual(gsm.adapters.dispatch_table((event,), None), (sync, async_))
+
+
 def test_suite():
     return unittest.TestSuite((
         unittest.makeSuite(Test_dispatch),
+        unittest.makeSuite(Test_async_dispatch),
     ))
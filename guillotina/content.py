@@ -6,6 +6,7 @@ from guillotina._cache import BEHAVIOR_CACHE
 from guillotina._cache import FACTORY_CACHE
 from guillotina._cache import PERMISSIONS_CACHE
 from guillotina._cache import SCHEMA_CACHE
+from guillotina._cache import SCHEMA_PLAN_CACHE
 from guillotina._settings import app_settings
 from guillotina.auth.users import ANONYMOUS_USER_ID
 from guillotina.auth.users import ROOT_USER_ID
@@ -111,6 +112,7 @@ class ResourceFactory(Factory):
 
 
 def load_cached_schema():
+    SCHEMA_PLAN_CACHE.clear()
     for x in get_utilities_for(IResourceFactory):
         factory = x[1]
         if factory.type_name not in SCHEMA_CACHE:
@@ -251,15 +253,27 @@ def get_all_behavior_interfaces(content) -> list:
     return behaviors
 
 
+async def load_behaviors(content, behaviors, create=False):
+    '''
+    Load the data of async behaviors of the content, getting all its
+    annotations at once when there is more than one behavior to load
+    '''
+    # providedBy not working here?
+    behaviors = [behavior for behavior in behaviors
+                 if IAsyncBehavior.implementedBy(behavior.__class__)]
+    if len(behaviors) > 1:
+        await IAnnotations(content).async_load()
+    for behavior in behaviors:
+        await behavior.load(create=create)
+
+
 async def get_all_behaviors(content, create=False, load=True) -> list:
     behaviors = []
     for behavior_schema in get_all_behavior_interfaces(content):
         behavior = behavior_schema(content)
-        if load:
-            if IAsyncBehavior.implementedBy(behavior.__class__):
-                # providedBy not working here?
-                await behavior.load(create=create)
         behaviors.append((behavior_schema, behavior))
+    if load:
+        await load_behaviors(content, [behavior for _, behavior in behaviors], create=create)
     return behaviors
 
 
@@ -497,6 +511,27 @@ class Folder(Resource):
         """
         return await self._get_transaction().keys(self._p_oid)
 
+    async def async_iter_keys(self, page_size: int=1000) -> typing.Iterator[str]:
+        """
+        Asynchronously iterate the sub object keys in this folder, loading
+        them in pages
+        """
+        async for key in self._get_transaction().iterate_keys(self._p_oid, page_size):
+            yield key
+
+    async def async_get_page(self, after: str=None, page_size: int=1000,
+                             suppress_events=False) -> typing.List[IResource]:
+        """
+        Asynchronously get up to page_size sub objects, ordered by oid,
+        following the sub object with oid `after`
+        """
+        children = await self._get_transaction().get_page_of_children(
+            self, after, page_size)
+        if not suppress_events:
+            for child in children:
+                await notify(ObjectLoadedEvent(child))
+        return children
+
     async def async_items(self, suppress_events=False) -> typing.Iterator[typing.Tuple[str, IResource]]:  # noqa
         """
         Asynchronously iterate through contents of folder
@@ -80,5 +80,18 @@ class BaseCache:
                 ]
         return keys
 
+    def get_transaction_cache_keys(self):
+        '''
+        Keys that need to be invalidated for the objects written by
+        the transaction
+        '''
+        keys = []
+        for type_, obs in (('added', self._transaction.added),
+                           ('modified', self._transaction.modified),
+                           ('deleted', self._transaction.deleted)):
+            for ob in obs.values():
+                keys.extend(self.get_cache_keys(ob, type_))
+        return keys
+
     async def close(self, invalidate=True):
         pass
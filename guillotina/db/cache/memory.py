@@ -0,0 +1,295 @@
+from collections import OrderedDict
+from guillotina import configure
+from guillotina._settings import app_settings
+from guillotina.component import query_utility
+from guillotina.db.cache.base import BaseCache
+from guillotina.db.interfaces import ICacheInvalidator
+from guillotina.db.interfaces import IStorageCache
+from guillotina.db.interfaces import ITransaction
+from zope.interface import implementer
+
+import weakref
+
+
+# rough estimate of what a cached row costs us on top of the pickle
+RECORD_OVERHEAD = 256
+DEFAULT_MEMORY_CACHE_SIZE = 1024 * 1024 * 200
+# invalidated keys remembered to reject values read before their invalidation
+INVALIDATIONS_KEPT = 10000
+
+_marker = object()
+
+# storage -> MemoryCacheStore, one per storage in the process
+_stores = weakref.WeakKeyDictionary()
+
+
+def get_size(value):
+    '''
+    Approximate size(in bytes) of a value stored in the cache
+    '''
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(get_size(v) for v in value)
+    try:
+        return len(value['state']) + RECORD_OVERHEAD
+    except (TypeError, KeyError, IndexError):
+        return RECORD_OVERHEAD
+
+
+def _get_oid(value):
+    try:
+        return value['zoid']
+    except (TypeError, KeyError, IndexError):
+        return None
+
+
+class LRU:
+    '''
+    Least recently used mapping bounded by the total size of its values
+    '''
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.size = 0
+        self._data = OrderedDict()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        try:
+            value, _ = self._data[key]
+        except KeyError:
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value, size):
+        '''
+        Store value and return list of (key, value) evicted to make room for it
+        '''
+        self.delete(key)
+        self._data[key] = (value, size)
+        self.size += size
+        evicted = []
+        while self.size > self.max_size and len(self._data) > 0:
+            old_key, (old_value, old_size) = self._data.popitem(last=False)
+            self.size -= old_size
+            evicted.append((old_key, old_value))
+        return evicted
+
+    def delete(self, key):
+        try:
+            value, size = self._data.pop(key)
+        except KeyError:
+            return _marker
+        self.size -= size
+        return value
+
+    def clear(self):
+        self._data.clear()
+        self.size = 0
+
+
+class MemoryCacheStore:
+    '''
+    Process wide cache shared by every transaction of a storage.
+
+    Besides the cache keys, we keep track of which keys hold the row of an
+    object so invalidating an oid also invalidates the values
+    cached by `get_child` and `get_annotation` for it.
+
+    Every invalidation bumps `generation`, values read before the
+    invalidation of their key are not stored.
+    '''
+
+    def __init__(self, max_size=DEFAULT_MEMORY_CACHE_SIZE, name=None):
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._lru = LRU(max_size)
+        self._oid_keys = {}
+        self._invalidator = None
+        # key -> generation it was last invalidated at
+        self._invalidated = LRU(INVALIDATIONS_KEPT)
+        # newest generation no longer in _invalidated
+        self._forgotten = 0
+
+    def __len__(self):
+        return len(self._lru)
+
+    @property
+    def size(self):
+        return self._lru.size
+
+    @property
+    def invalidator(self):
+        if self._invalidator is None:
+            invalidator = query_utility(ICacheInvalidator)
+            if invalidator is not None:
+                invalidator.subscribe(self)
+                self._invalidator = invalidator
+        return self._invalidator
+
+    def get(self, key):
+        value = self._lru.get(key, _marker)
+        if value is _marker:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if isinstance(value, list):
+            # callers are free to mutate lists they get
+            return value[:]
+        return value
+
+    def invalidated_since(self, generation, keys):
+        if generation < self._forgotten:
+            return True
+        for key in keys:
+            if key is not None and self._invalidated.get(key, 0) > generation:
+                return True
+        return False
+
+    def set(self, key, value, generation=None):
+        '''
+        Store value, unless generation is given and the key or the object in
+        value were invalidated after it
+        '''
+        if generation is not None and self.invalidated_since(
+                generation, (key, _get_oid(value))):
+            return
+        size = get_size(value)
+        if size > self._lru.max_size:
+            return
+        if isinstance(value, list):
+            value = value[:]
+        self._unindex(key, self._lru.get(key, _marker))
+        for evicted_key, evicted_value in self._lru.set(key, value, size):
+            self._unindex(evicted_key, evicted_value)
+        oid = _get_oid(value)
+        if oid is not None:
+            self._oid_keys.setdefault(oid, set()).add(key)
+
+    def _unindex(self, key, value):
+        oid = _get_oid(value)
+        if oid is not None and oid in self._oid_keys:
+            self._oid_keys[oid].discard(key)
+            if len(self._oid_keys[oid]) == 0:
+                del self._oid_keys[oid]
+
+    def invalidate(self, keys):
+        self.generation += 1
+        for key in keys:
+            for _, generation in self._invalidated.set(key, self.generation, 1):
+                self._forgotten = max(self._forgotten, generation)
+            self._unindex(key, self._lru.delete(key))
+            for oid_key in self._oid_keys.pop(key, ()):
+                self._lru.delete(oid_key)
+
+    def clear(self):
+        self._lru.clear()
+        self._oid_keys.clear()
+        self.generation += 1
+        self._invalidated.clear()
+        self._forgotten = self.generation
+
+    async def publish(self, keys):
+        invalidator = self.invalidator
+        if invalidator is not None:
+            await invalidator.publish(self, keys)
+
+
+def get_store(storage):
+    try:
+        return _stores[storage]
+    except KeyError:
+        pass
+    store = _stores[storage] = MemoryCacheStore(
+        app_settings.get('cache', {}).get('memory_cache_size', DEFAULT_MEMORY_CACHE_SIZE),
+        name=getattr(storage, '__name__', None))
+    return store
+
+
+@configure.adapter(for_=ITransaction, provides=IStorageCache, name="memory")
+class MemoryCache(BaseCache):
+    '''
+    In memory LRU cache strategy.
+
+    Values are shared between all the transactions of the process and
+    invalidated when a transaction that modified them finishes.
+    '''
+
+    def __init__(self, transaction):
+        super().__init__(transaction)
+        self._store = get_store(self._storage)
+        # make sure we are receiving invalidations before caching anything
+        self._store.invalidator
+        # key -> store generation when we missed it
+        self._reads = {}
+
+    async def get(self, **kwargs):
+        key = self.get_key(**kwargs)
+        value = self._store.get(key)
+        if value is None and key not in self._reads:
+            self._reads[key] = self._store.generation
+        return value
+
+    async def set(self, value, **kwargs):
+        key = self.get_key(**kwargs)
+        generation = self._reads.pop(key, None)
+        if generation is None:
+            # values loaded along with another one, like the children
+            # of the `keys` we missed, are as old as the oldest miss
+            generation = min(self._reads.values(), default=self._store.generation)
+        self._store.set(key, value, generation)
+
+    async def clear(self):
+        self._store.clear()
+
+    async def delete(self, key):
+        self._store.invalidate([key])
+
+    async def delete_all(self, keys):
+        self._store.invalidate(keys)
+
+    async def close(self, invalidate=True):
+        self._reads.clear()
+        if not invalidate:
+            return
+        keys = self.get_transaction_cache_keys()
+        if len(keys) > 0:
+            self._store.invalidate(keys)
+            await self._store.publish(keys)
+
+
+@implementer(ICacheInvalidator)
+class LocalCacheInvalidator:
+    '''
+    Deliver invalidations between cache stores living in the same process.
+
+    This is a stand-in for a network backed implementation(redis, pg notify...)
+    which would forward `publish` to the other workers and call `invalidate`
+    on the subscribed store with the same name when receiving keys.
+    '''
+
+    def __init__(self, settings=None, loop=None):
+        self._stores = weakref.WeakSet()
+
+    async def initialize(self, app=None):
+        pass
+
+    async def finalize(self, app=None):
+        pass
+
+    def subscribe(self, store):
+        self._stores.add(store)
+
+    async def publish(self, store, keys):
+        for subscriber in list(self._stores):
+            if subscriber is not store and subscriber.name == store.name:
+                subscriber.invalidate(keys)
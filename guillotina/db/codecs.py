@@ -0,0 +1,98 @@
+from guillotina import configure
+from guillotina._settings import app_settings
+from guillotina.component import get_utilities_for
+from guillotina.component import query_utility
+from guillotina.db.interfaces import IStateCodec
+from guillotina.db.orm.base import BaseObject
+
+import pickle
+
+
+_write_codec = None
+_codecs_by_tag = {}
+
+
+def has_default_state(obj):
+    '''
+    Objects whose state is all in their `__dict__` and restored as it is
+    '''
+    klass = type(obj)
+    return (isinstance(obj, BaseObject) and
+            klass.__getstate__ is BaseObject.__getstate__ and
+            klass.__setstate__ is BaseObject.__setstate__ and
+            klass.__reduce__ is BaseObject.__reduce__ and
+            not hasattr(obj, '__getnewargs__') and
+            not obj._slotnames())
+
+
+@configure.utility(provides=IStateCodec, name='pickle')
+class PickleCodec:
+    '''
+    Pickle of the object, untagged so states written before codecs existed
+    can be read.
+    '''
+
+    tag = None
+
+    def dumps(self, obj):
+        return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, state):
+        return pickle.loads(state)
+
+
+@configure.utility(provides=IStateCodec, name='state')
+class StateCodec(PickleCodec):
+    '''
+    Pickle of the class and `__dict__` of the object instead of the object.
+
+    It skips `__reduce__` encoding and `__setstate__` decoding, which
+    makes both about twice as fast. Objects with custom state are written
+    as plain pickles.
+    '''
+
+    tag = b'S'
+
+    def dumps(self, obj):
+        if not has_default_state(obj):
+            return super().dumps(obj)
+        return self.tag + pickle.dumps(
+            (type(obj), obj.__getstate__()), protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, state):
+        klass, data = pickle.loads(state[1:])
+        obj = klass.__new__(klass)
+        obj.__dict__.update(data)
+        return obj
+
+
+def get_write_codec():
+    global _write_codec
+    name = app_settings.get('state_codec', 'pickle')
+    if _write_codec is None or _write_codec[0] != name:
+        codec = query_utility(IStateCodec, name=name)
+        if codec is None:
+            raise Exception(f'No state codec registered with the name {name}')
+        _write_codec = (name, codec)
+    return _write_codec[1]
+
+
+def get_codec(state):
+    tag = state[:1]
+    codec = _codecs_by_tag.get(tag)
+    if codec is None:
+        # first time we see the tag or new codecs got registered
+        for _, utility in get_utilities_for(IStateCodec):
+            _codecs_by_tag[utility.tag] = utility
+        # untagged states, pickles start with the PROTO opcode
+        codec = _codecs_by_tag.get(tag, _codecs_by_tag[None])
+        _codecs_by_tag[tag] = codec
+    return codec
+
+
+def dumps(obj):
+    return get_write_codec().dumps(obj)
+
+
+def loads(state):
+    return get_codec(state).loads(state)
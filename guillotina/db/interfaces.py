@@ -9,6 +9,26 @@ class IWriter(Interface):
     """Serializes the object for DB storage"""
 
 
+class IStateCodec(Interface):
+    '''
+    Named utility encoding objects to the state stored in the database.
+
+    Encoded states start with the `tag` of the codec so the codec used to
+    write a row can be found reading it. A codec without tag is used for
+    untagged states, as written before there were codecs.
+    '''
+
+    def dumps(obj):
+        '''
+        encode object to bytes
+        '''
+
+    def loads(state):
+        '''
+        decode object from bytes
+        '''
+
+
 class ITransaction(Interface):
     pass
 
@@ -43,6 +63,11 @@ class IStorage(Interface):
         store oid with obj
         '''
 
+    async def store_many(txn, objects):
+        '''
+        store list of (oid, old_serial, writer, obj)
+        '''
+
     async def delete(txn, oid):
         '''
         delete ob by oid
@@ -63,9 +88,9 @@ class IStorage(Interface):
         Get current tid
         '''
 
-    async def get_conflicts(txn, full=False):
+    async def get_conflicts(txn, full=False, oids=None):
         '''
-        get conflicted ob writes
+        get conflicted ob writes, only of the objects in oids if provided
         '''
 
     async def commit(txn):
@@ -88,6 +113,11 @@ class IStorage(Interface):
         get child of parent oid
         '''
 
+    async def get_path(txn, parent_oid, path):
+        '''
+        get rows of objects found walking down path of ids from parent oid
+        '''
+
     async def has_key(txn, parent_oid, id):
         '''
         check if key exists
@@ -103,11 +133,28 @@ class IStorage(Interface):
         get items in a folder
         '''
 
+    async def get_page_of_keys(txn, oid, after=None, page_size=1000):
+        '''
+        get up to page_size zoid and id records of the children of oid,
+        ordered by zoid, after the zoid `after`
+        '''
+
+    async def get_page_of_children(txn, oid, after=None, page_size=1000):
+        '''
+        get up to page_size children of oid, ordered by zoid, after the
+        zoid `after`
+        '''
+
     async def get_annotation(txn, oid, id):
         '''
         get annotation
         '''
 
+    async def get_annotations(txn, oid):
+        '''
+        get all the annotations of oid
+        '''
+
     async def get_annotation_keys(txn, oid):
         '''
         get annotation keys
@@ -191,3 +238,20 @@ class IStorageCache(Interface):
         '''
         close the cache
         '''
+
+
+class ICacheInvalidator(Interface):
+    '''
+    Utility to push cache invalidations to other processes sharing
+    the same database
+    '''
+
+    def subscribe(store):
+        '''
+        register a local cache store to receive invalidations
+        '''
+
+    async def publish(store, keys):
+        '''
+        send list of invalidated keys for store to other subscribers
+        '''
@@ -1,8 +1,101 @@
-import pickle
+from guillotina._settings import app_settings
+from guillotina.db.cache.memory import LRU
+from guillotina.db.cache.memory import RECORD_OVERHEAD
+from guillotina.db.codecs import has_default_state
+from guillotina.db.codecs import loads
+from zope.interface.declarations import ProvidesClass
+
+import copy
+import datetime
+import decimal
+
+
+# values every copy of a decoded object can share since they can not be
+# changed in place. Interfaces provided are replaced, not changed, by
+# `alsoProvides` and `noLongerProvides`
+_IMMUTABLE_TYPES = {
+    str, bytes, int, float, complex, bool, type(None), decimal.Decimal,
+    datetime.datetime, datetime.date, datetime.time, datetime.timedelta, frozenset,
+    ProvidesClass
+}
+
+_decoded_cache = None
+
+
+def _copy_value(value, memo):
+    type_ = type(value)
+    if type_ in _IMMUTABLE_TYPES:
+        return value
+    if type_ is list:
+        return [_copy_value(v, memo) for v in value]
+    if type_ is tuple:
+        return tuple(_copy_value(v, memo) for v in value)
+    if type_ is dict:
+        return {k: _copy_value(v, memo) for k, v in value.items()}
+    return copy.deepcopy(value, memo)
+
+
+def _copy_object(obj):
+    new = type(obj).__new__(type(obj))
+    memo = {}
+    new.__dict__.update({
+        key: value if type(value) in _IMMUTABLE_TYPES else _copy_value(value, memo)
+        for key, value in obj.__dict__.items()})
+    return new
+
+
+class DecodedCache:
+    '''
+    Objects decoded from database rows, keyed by (zoid, tid).
+
+    Readers get copies of the decoded object sharing its immutable values
+    and with their own copy of the rest, which is cheaper than decoding
+    the row again.
+    '''
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lru = LRU(max_size)
+
+    def __len__(self):
+        return len(self._lru)
+
+    def get(self, result):
+        key = (result['zoid'], result['tid'])
+        state = result['state']
+        cached = self._lru.get(key)
+        # transactionless strategies reuse tids so we check the state is the same
+        if cached is not None and cached[0] == state:
+            self.hits += 1
+            return _copy_object(cached[1])
+        self.misses += 1
+        obj = loads(state)
+        if has_default_state(obj):
+            self._lru.set(key, (state, _copy_object(obj)), len(state) + RECORD_OVERHEAD)
+        return obj
+
+    def clear(self):
+        self._lru.clear()
+
+
+def get_decoded_cache():
+    global _decoded_cache
+    size = app_settings['cache'].get('decoded_cache_size', 0)
+    if not size:
+        return None
+    if _decoded_cache is None or _decoded_cache.max_size != size:
+        _decoded_cache = DecodedCache(size)
+    return _decoded_cache
 
 
 def reader(result):
-    obj = pickle.loads(result['state'])
+    cache = get_decoded_cache()
+    if cache is None:
+        obj = loads(result['state'])
+    else:
+        obj = cache.get(result)
     obj._p_oid = result['zoid']
     obj._p_serial = result['tid']
     obj.__name__ = result['id']
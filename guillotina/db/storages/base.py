@@ -5,6 +5,11 @@ class BaseStorage(object):
     _cache_strategy = 'dummy'
     _read_only = False
     _transaction_strategy = 'resolve'
+    _batch_store = False
+    _lazy_read_connections = False
+    # conflicts found voting transactions
+    resolved_conflicts = 0
+    rejected_conflicts = 0
 
     def __init__(self, read_only=False, transaction_strategy='resolve',
                  cache_strategy='dummy'):
@@ -14,3 +19,14 @@ class BaseStorage(object):
 
     def read_only(self):
         return self._read_only
+
+    async def store_many(self, txn, objects):
+        for oid, old_serial, writer, obj in objects:
+            await self.store(oid, old_serial, writer, obj, txn)
+
+    async def get_path(self, txn, parent_oid, path):
+        '''
+        Rows of the objects found walking down path from parent_oid.
+        Storages that can not do it with one query do not return any
+        '''
+        return []
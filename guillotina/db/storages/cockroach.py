@@ -1,7 +1,10 @@
 from guillotina import glogging
+from guillotina.db.interfaces import IStorage
 from guillotina.db.storages import pg
+from guillotina.db.storages.base import BaseStorage
 from guillotina.exceptions import ConflictError
 from guillotina.exceptions import TIDConflictError
+from zope.interface import implementer_only
 
 import asyncpg
 
@@ -68,10 +71,9 @@ WHERE parent_id = $1::varchar(32);'''
 GET_OIDS_BY_PARENT = '''SELECT zoid FROM objects
 WHERE parent_id = $1::varchar(32);'''
 BATCHED_GET_CHILDREN_OIDS = """SELECT zoid FROM objects
-WHERE parent_id = $1::varchar(32)
+WHERE parent_id = $1::varchar(32) AND zoid > $2::varchar(32)
 ORDER BY zoid
-LIMIT $2::int
-OFFSET $3::int"""
+LIMIT $3::int"""
 
 DELETE_FROM_OBJECTS = """
     DELETE FROM objects WHERE zoid = $1::varchar(32);
@@ -80,13 +82,11 @@ DELETE_FROM_OBJECTS = """
 
 async def iterate_children(conn, parent_oid, page_size=1000):
     smt = await conn.prepare(BATCHED_GET_CHILDREN_OIDS)
-    page = 1
-    results = await smt.fetch(parent_oid, page_size, (page - 1) * page_size)
+    results = await smt.fetch(parent_oid, '', page_size)
     while len(results) > 0:
         for record in results:
             yield record['zoid']
-        page += 1
-        results = await smt.fetch(parent_oid, page_size, (page - 1) * page_size)
+        results = await smt.fetch(parent_oid, results[-1]['zoid'], page_size)
 
 
 class CockroachVacuum(pg.PGVacuum):
@@ -157,6 +157,7 @@ BEGIN ISOLATION LEVEL {self._storage._isolation_level.upper()},
         self._status = 'rolledback'
 
 
+@implementer_only(IStorage)
 class CockroachStorage(pg.PostgresqlStorage):
     '''
     Differences that we use from postgresql:
@@ -194,6 +195,7 @@ class CockroachStorage(pg.PostgresqlStorage):
         'CREATE INDEX IF NOT EXISTS object_of ON objects (of);',
         'CREATE INDEX IF NOT EXISTS object_part ON objects (part);',
         'CREATE INDEX IF NOT EXISTS object_parent ON objects (parent_id);',
+        'CREATE INDEX IF NOT EXISTS object_parent_zoid ON objects (parent_id, zoid);',
         'CREATE INDEX IF NOT EXISTS object_id ON objects (id);',
         'CREATE INDEX IF NOT EXISTS blob_bid ON blobs (bid);',
         'CREATE INDEX IF NOT EXISTS blob_zoid ON blobs (zoid);',
@@ -201,10 +203,15 @@ class CockroachStorage(pg.PostgresqlStorage):
     ]
 
     _db_transaction_factory = CockroachDBTransaction
+    _next_tid_sql = NEXT_TID
+    _max_tid_sql = MAX_TID
     _vacuum = _vacuum_task = None
     _isolation_level = 'snapshot'
     _vacuum_class = CockroachVacuum
 
+    # no recursive queries support
+    get_path = BaseStorage.get_path
+
     def __init__(self, *args, **kwargs):
         transaction_strategy = kwargs.get('transaction_strategy', 'novote')
         self._isolation_level = kwargs.get('isolation_level', 'snapshot').lower()
@@ -215,11 +222,26 @@ class CockroachStorage(pg.PostgresqlStorage):
                            f'({transaction_strategy}). Forcing to `novote` strategy')
             transaction_strategy = 'novote'
         kwargs['transaction_strategy'] = transaction_strategy
+        # no json column here so we can not use the batched statements
+        kwargs['batch_store'] = False
         super().__init__(*args, **kwargs)
 
-    async def initialize_tid_statements(self):
-        self._stmt_next_tid = await self._read_conn.prepare(NEXT_TID)
-        self._stmt_max_tid = await self._read_conn.prepare(MAX_TID)
+    async def get_current_tid(self, txn):
+        # snapshot transactions do not see newer commits, use the shared
+        # connection that is not in a transaction
+        async with self._lock:
+            smt = await self.prepare_statement(self._read_conn, self._max_tid_sql)
+            return await smt.fetchval()
+
+    async def get_conflicts(self, txn, full=False, oids=None):
+        async with self._lock:
+            if oids is not None:
+                return await self._read_conn.fetch(
+                    pg.TXN_CONFLICTS_ON_OIDS, txn._tid, list(oids))
+            if full:
+                return await self._read_conn.fetch(pg.TXN_CONFLICTS_FULL, txn._tid)
+            else:
+                return await self._read_conn.fetch(pg.TXN_CONFLICTS, txn._tid)
 
     async def open(self):
         conn = await super().open()
@@ -254,7 +276,7 @@ class CockroachStorage(pg.PostgresqlStorage):
             update = True
 
         async with txn._lock:
-            smt = await txn._db_conn.prepare(statement_sql)
+            smt = await self.prepare_statement(txn._db_conn, statement_sql)
             try:
                 result = await smt.fetch(
                     oid,                 # The OID of the object
@@ -156,10 +156,23 @@ class DummyStorage(BaseStorage):
             obj = await self.load(txn, record)
             yield obj
 
+    async def get_page_of_keys(self, txn, oid, after=None, page_size=1000):
+        return [{
+            'zoid': record['zoid'],
+            'id': record['id']
+        } for record in await self.get_page_of_children(txn, oid, after, page_size)]
+
+    async def get_page_of_children(self, txn, oid, after=None, page_size=1000):
+        oids = sorted(o for o in self.PARENT_ID.get(oid, []) if after is None or o > after)
+        return [await self.load(txn, o) for o in oids[:page_size]]
+
     async def get_annotation(self, txn, oid, id):
         oid = self.OF_ID[(oid, id)]
         return await self.load(txn, oid)
 
+    async def get_annotations(self, txn, oid):
+        return [await self.load(txn, record) for record in self.OF.get(oid, [])]
+
     async def get_annotations_keys(self, txn, oid):
         keys = []
         for record in self.OF[oid]:
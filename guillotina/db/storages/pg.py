@@ -1,6 +1,6 @@
 from asyncio import shield
 from guillotina.db import TRASHED_ID
-from guillotina.db.interfaces import IStorage
+from guillotina.db.interfaces import IPostgresStorage
 from guillotina.db.storages.base import BaseStorage
 from guillotina.db.storages.utils import get_table_definition
 from guillotina.exceptions import ConflictError
@@ -45,6 +45,24 @@ GET_CHILD = """
     WHERE parent_id = $1::varchar(32) AND id = $2::text
     """
 
+# walk down a path of ids from a parent in one query, rows are returned
+# in path order and stop at the first id that is not found
+GET_PATH = """
+    WITH RECURSIVE path_objects AS (
+        SELECT zoid, tid, state_size, resource, type, state, id, 1 AS depth
+        FROM objects
+        WHERE parent_id = $1::varchar(32) AND id = ($2::text[])[1]
+      UNION ALL
+        SELECT o.zoid, o.tid, o.state_size, o.resource, o.type, o.state, o.id, p.depth + 1
+        FROM objects o
+        JOIN path_objects p ON o.parent_id = p.zoid
+        WHERE p.depth < array_length($2::text[], 1) AND o.id = ($2::text[])[p.depth + 1]
+    )
+    SELECT zoid, tid, state_size, resource, type, state, id
+    FROM path_objects
+    ORDER BY depth
+    """
+
 EXIST_CHILD = """
     SELECT zoid
     FROM objects
@@ -68,6 +86,13 @@ GET_ANNOTATION = f"""
         (parent_id IS NULL OR parent_id != '{TRASHED_ID}')
     """
 
+GET_ANNOTATIONS = f"""
+    SELECT zoid, tid, state_size, resource, type, state, id
+    FROM objects
+    WHERE of = $1::varchar(32) AND (parent_id IS NULL OR parent_id != '{TRASHED_ID}')
+    """
+
+
 def _wrap_return_count(txt):
     return """WITH rows AS (
 {}
@@ -122,6 +147,55 @@ UPDATE = _wrap_return_count(NAIVE_UPDATE + """ AND tid = $7::int""")
 NAIVE_UPDATE = _wrap_return_count(NAIVE_UPDATE)
 
 
+# batched versions of the statements above, rows are passed in as arrays
+_BATCHED_ROWS = """
+    unnest($2::varchar(32)[], $3::int[], $4::int[], $5::boolean[], $6::varchar(32)[],
+           $7::int[], $8::varchar(32)[], $9::text[], $10::text[], $11::json[], $12::bytea[])
+    AS data(zoid, state_size, part, resource, of, otid, parent_id, id, type, json, state)"""
+
+
+BATCHED_NAIVE_UPSERT = f"""
+INSERT INTO objects
+(zoid, tid, state_size, part, resource, of, otid, parent_id, id, type, json, state)
+SELECT zoid, $1::int, state_size, part, resource, of, otid, parent_id, id, type, json, state
+FROM {_BATCHED_ROWS}
+ON CONFLICT (zoid)
+DO UPDATE SET
+    tid = EXCLUDED.tid,
+    state_size = EXCLUDED.state_size,
+    part = EXCLUDED.part,
+    resource = EXCLUDED.resource,
+    of = EXCLUDED.of,
+    otid = EXCLUDED.otid,
+    parent_id = EXCLUDED.parent_id,
+    id = EXCLUDED.id,
+    type = EXCLUDED.type,
+    json = EXCLUDED.json,
+    state = EXCLUDED.state
+RETURNING objects.zoid"""
+
+
+# only rows still matching the tid they were read with get updated
+BATCHED_UPDATE = f"""
+UPDATE objects
+SET
+    tid = $1::int,
+    state_size = data.state_size,
+    part = data.part,
+    resource = data.resource,
+    of = data.of,
+    otid = data.otid,
+    parent_id = data.parent_id,
+    id = data.id,
+    type = data.type,
+    json = data.json,
+    state = data.state
+FROM {_BATCHED_ROWS}
+WHERE
+    objects.zoid = data.zoid AND objects.tid = data.otid
+RETURNING objects.zoid"""
+
+
 NEXT_TID = "SELECT nextval('tid_sequence');"
 MAX_TID = "SELECT last_value FROM tid_sequence;"
 
@@ -136,13 +210,13 @@ NUM_RESOURCES = "SELECT count(*) FROM objects WHERE resource is TRUE"
 
 NUM_RESOURCES_BY_TYPE = "SELECT count(*) FROM objects WHERE type=$1::TEXT"
 
+# keyset pagination, $2 is the last zoid of the previous page
 RESOURCES_BY_TYPE = """
     SELECT zoid, tid, state_size, resource, type, state, id
     FROM objects
-    WHERE type=$1::TEXT
+    WHERE type=$1::TEXT AND zoid > $2::VARCHAR(32)
     ORDER BY zoid
-    LIMIT $2::int
-    OFFSET $3::int
+    LIMIT $3::int
     """
 
 
@@ -153,6 +227,16 @@ GET_CHILDREN = """
     """
 
 
+# keyset pagination over the children of an object
+GET_PAGE_OF_CHILDREN = """
+    SELECT zoid, tid, state_size, resource, type, state, id
+    FROM objects
+    WHERE parent_id = $1::VARCHAR(32) AND zoid > $2::VARCHAR(32)
+    ORDER BY zoid
+    LIMIT $3::int
+    """
+
+
 TRASH_PARENT_ID = f"""
 UPDATE objects
 SET
@@ -194,19 +278,27 @@ TXN_CONFLICTS = """
     """
 
 
+# only the objects written by a transaction, found by primary key
+TXN_CONFLICTS_ON_OIDS = """
+    SELECT zoid, tid, state_size, resource, type, id
+    FROM objects
+    WHERE zoid = ANY($2::varchar(32)[]) AND tid > $1
+    """
+
+
 TXN_CONFLICTS_FULL = """
     SELECT zoid, tid, state_size, resource, type, state, id
     FROM objects
     WHERE tid > $1
     """
 
+# keyset pagination, $2 is the last zoid of the previous page
 BATCHED_GET_CHILDREN_KEYS = """
-    SELECT id
+    SELECT zoid, id
     FROM objects
-    WHERE parent_id = $1::varchar(32)
+    WHERE parent_id = $1::varchar(32) AND zoid > $2::varchar(32)
     ORDER BY zoid
-    LIMIT $2::int
-    OFFSET $3::int
+    LIMIT $3::int
     """
 
 DELETE_OBJECT = f"""
@@ -322,7 +414,7 @@ class PGVacuum:
             await asyncio.sleep(0.1)
 
 
-@implementer(IStorage)
+@implementer(IPostgresStorage)
 class PostgresqlStorage(BaseStorage):
     """Storage to a relational database, based on invalidation polling"""
 
@@ -332,6 +424,9 @@ class PostgresqlStorage(BaseStorage):
     _pool = None
     _large_record_size = 1 << 24
     _vacuum_class = PGVacuum
+    _batch_store_size = 500
+    _next_tid_sql = NEXT_TID
+    _max_tid_sql = MAX_TID
 
     _object_schema = {
         'zoid': 'VARCHAR(32) NOT NULL PRIMARY KEY',
@@ -360,8 +455,10 @@ class PostgresqlStorage(BaseStorage):
         'CREATE INDEX IF NOT EXISTS object_of ON objects (of);',
         'CREATE INDEX IF NOT EXISTS object_part ON objects (part);',
         'CREATE INDEX IF NOT EXISTS object_parent ON objects (parent_id);',
+        'CREATE INDEX IF NOT EXISTS object_parent_zoid ON objects (parent_id, zoid);',
         'CREATE INDEX IF NOT EXISTS object_id ON objects (id);',
         'CREATE INDEX IF NOT EXISTS object_type ON objects (type);',
+        'CREATE INDEX IF NOT EXISTS object_type_zoid ON objects (type, zoid);',
         'CREATE INDEX IF NOT EXISTS blob_bid ON blobs (bid);',
         'CREATE INDEX IF NOT EXISTS blob_zoid ON blobs (zoid);',
         'CREATE INDEX IF NOT EXISTS blob_chunk ON blobs (chunk_index);',
@@ -370,7 +467,8 @@ class PostgresqlStorage(BaseStorage):
 
     def __init__(self, dsn=None, partition=None, read_only=False, name=None,
                  pool_size=13, transaction_strategy='resolve',
-                 conn_acquire_timeout=20, cache_strategy='dummy', **options):
+                 conn_acquire_timeout=20, cache_strategy='dummy', batch_store=True,
+                 lazy_read_connections=False, **options):
         super(PostgresqlStorage, self).__init__(
             read_only, transaction_strategy=transaction_strategy,
             cache_strategy=cache_strategy)
@@ -382,6 +480,11 @@ class PostgresqlStorage(BaseStorage):
         self._read_conn = None
         self._lock = asyncio.Lock()
         self._conn_acquire_timeout = conn_acquire_timeout
+        self._batch_store = batch_store
+        self._lazy_read_connections = lazy_read_connections
+        # id(connection) -> (connection, {sql: prepared statement}), asyncpg
+        # connections can not be weak referenced
+        self._statements = {}
         self._options = options
         self._connection_options = {}
         self._connection_initialized_on = time.time()
@@ -391,6 +494,7 @@ class PostgresqlStorage(BaseStorage):
         self._vacuum_task.cancel()
         await shield(self._pool.release(self._read_conn))
         await self._pool.close()
+        self._statements.clear()
 
     async def create(self):
         # Check DB
@@ -413,7 +517,7 @@ class PostgresqlStorage(BaseStorage):
         # migrate old transaction table scheme over
         try:
             old_tid = await self._read_conn.fetchval('SELECT max(tid) from transaction')
-            current_tid = await self.get_current_tid(None)
+            current_tid = await self._read_conn.fetchval(self._max_tid_sql)
             if old_tid > current_tid:
                 await self._read_conn.execute(
                     'ALTER SEQUENCE tid_sequence RESTART WITH ' + str(old_tid + 1))
@@ -425,6 +529,8 @@ class PostgresqlStorage(BaseStorage):
         log.error('Connection potentially lost to pg, restarting')
         await self._pool.close()
         self._pool.terminate()
+        # prepared statements belong to the connections we just closed
+        self._statements = {}
         # re-bind, throw conflict error so the request is restarted...
         self._pool = await asyncpg.create_pool(
             dsn=self._dsn,
@@ -474,8 +580,8 @@ class PostgresqlStorage(BaseStorage):
         self._connection_initialized_on = time.time()
 
     async def initialize_tid_statements(self):
-        self._stmt_next_tid = await self._read_conn.prepare(NEXT_TID)
-        self._stmt_max_tid = await self._read_conn.prepare(MAX_TID)
+        await self.prepare_statement(self._read_conn, self._next_tid_sql)
+        await self.prepare_statement(self._read_conn, self._max_tid_sql)
 
     async def remove(self):
         """Reset the tables"""
@@ -489,18 +595,51 @@ class PostgresqlStorage(BaseStorage):
         except asyncpg.exceptions.InterfaceError as ex:
             async with self._lock:
                 await self._check_bad_connection(ex)
+        self._get_connection_statements(conn)
         return conn
 
+    def _get_connection_statements(self, conn):
+        # pool gives us a proxy, statements live as long as the real connection
+        conn = getattr(conn, '_con', conn)
+        try:
+            owner, statements = self._statements[id(conn)]
+            if owner is conn:
+                return statements
+        except KeyError:
+            pass
+        statements = {}
+        self._statements[id(conn)] = (conn, statements)
+        return statements
+
+    def _forget_closed_connections(self):
+        for key, (conn, _) in list(self._statements.items()):
+            if conn.is_closed():
+                del self._statements[key]
+
+    async def prepare_statement(self, conn, sql):
+        """
+        Prepare sql once for every connection instead of paying
+        an extra round trip for every query
+        """
+        statements = self._get_connection_statements(conn)
+        try:
+            return statements[sql]
+        except KeyError:
+            smt = statements[sql] = await conn.prepare(sql)
+            return smt
+
     async def close(self, con):
         try:
             await shield(self._pool.release(con))
         except (asyncio.CancelledError, asyncpg.exceptions.ConnectionDoesNotExistError,
                 RuntimeError):
             pass
+        # the pool drops broken connections when they are released
+        self._forget_closed_connections()
 
     async def load(self, txn, oid):
         async with txn._lock:
-            smt = await txn._db_conn.prepare(GET_OID)
+            smt = await self.prepare_statement(txn._db_conn, GET_OID)
             objects = await self.get_one_row(smt, oid)
         if objects is None:
             raise KeyError(oid)
@@ -534,7 +673,7 @@ Parent ID: {writer.id}'''
             update = True
 
         async with txn._lock:
-            smt = await txn._db_conn.prepare(statement_sql)
+            smt = await self.prepare_statement(txn._db_conn, statement_sql)
             try:
                 result = await smt.fetch(
                     oid,                 # The OID of the object
@@ -579,6 +718,84 @@ Parent ID: {writer.id}'''
                     log.error('Incorrect response count from database update. '
                               'This should not happen. tid: {}'.format(txn._tid))
 
+    @profilable
+    async def store_many(self, txn, objects):
+        """
+        Store list of (oid, old_serial, writer, obj) with one statement
+        for the new objects and one for the updated ones
+        """
+        inserts = []
+        updates = []
+        for oid, old_serial, writer, obj in objects:
+            assert oid is not None
+
+            p = writer.serialize()  # This calls __getstate__ of obj
+            if len(p) >= self._large_record_size:
+                log.warning(f"Large object {obj.__class__}: {len(p)}")
+            json_dict = await writer.get_json()
+            json = ujson.dumps(json_dict)
+            part = writer.part
+            if part is None:
+                part = 0
+
+            row = (oid, len(p), part, writer.resource, writer.of, old_serial,
+                   writer.parent_id, writer.id, writer.type, json, p)
+            if not obj.__new_marker__ and obj._p_serial is not None:
+                updates.append((row, writer, obj))
+            else:
+                inserts.append((row, writer, obj))
+
+        for idx in range(0, len(inserts), self._batch_store_size):
+            await self._store_batch(
+                txn, BATCHED_NAIVE_UPSERT, inserts[idx:idx + self._batch_store_size])
+        for idx in range(0, len(updates), self._batch_store_size):
+            await self._store_batch(
+                txn, BATCHED_UPDATE, updates[idx:idx + self._batch_store_size], update=True)
+
+    async def _store_batch(self, txn, statement_sql, batch, update=False):
+        # one array per column
+        columns = [list(column) for column in zip(*[row for row, _, _ in batch])]
+
+        def batch_summary():
+            return '\n'.join(self.get_conflict_summary(row[0], txn, row[5], writer)
+                             for row, writer, _ in batch)
+
+        async with txn._lock:
+            smt = await self.prepare_statement(txn._db_conn, statement_sql)
+            try:
+                result = await smt.fetch(txn._tid, *columns)
+            except asyncpg.exceptions.ForeignKeyViolationError:
+                for _, _, obj in batch:
+                    txn.deleted[obj._p_oid] = obj
+                raise TIDConflictError(
+                    f'Bad value inserting into database that could be caused '
+                    f'by a bad cache value. This should resolve on request retry.\n'
+                    f'{batch_summary()}')
+            except asyncpg.exceptions._base.InterfaceError as ex:
+                if 'another operation is in progress' in ex.args[0]:
+                    raise ConflictError(
+                        f'asyncpg error, another operation in progress.\n'
+                        f'{batch_summary()}')
+                raise
+            except asyncpg.exceptions.DeadlockDetectedError:
+                raise ConflictError(f'Deadlock detected.\n{batch_summary()}')
+
+        stored = set(record['zoid'] for record in result)
+        for row, writer, _ in batch:
+            if row[0] in stored:
+                continue
+            if update:
+                # raise tid conflict error
+                conflict_summary = self.get_conflict_summary(row[0], txn, row[5], writer)
+                raise TIDConflictError(
+                    f'Mismatch of tid of object being updated. This is likely '
+                    f'caused by a cache invalidation race condition and should '
+                    f'be an edge case. This should resolve on request retry.\n'
+                    f'{conflict_summary}')
+            else:
+                log.error('Incorrect response count from database update. '
+                          'This should not happen. tid: {}'.format(txn._tid))
+
     async def _txn_oid_commit_hook(self, status, oid):
         await self._vacuum.add_to_queue(oid)
 
@@ -596,19 +813,21 @@ Parent ID: {writer.id}'''
                 return await self.restart_connection()
 
     async def get_next_tid(self, txn):
-        async with self._lock:
-            # we do not use transaction lock here but a storage lock because
-            # a storage object has a shard conn for reads
-            try:
-                return await self._stmt_next_tid.fetchval()
-            except asyncpg.exceptions.InterfaceError as ex:
+        # sequences are not transactional so every transaction can ask its
+        # own connection instead of queueing on a shared one
+        try:
+            async with txn._lock:
+                smt = await self.prepare_statement(txn._db_conn, self._next_tid_sql)
+                return await smt.fetchval()
+        except asyncpg.exceptions.InterfaceError as ex:
+            async with self._lock:
                 await self._check_bad_connection(ex)
-                raise
+            raise
 
     async def get_current_tid(self, txn):
-        async with self._lock:
-            # again, use storage lock here instead of trns lock
-            return await self._stmt_max_tid.fetchval()
+        async with txn._lock:
+            smt = await self.prepare_statement(txn._db_conn, self._max_tid_sql)
+            return await smt.fetchval()
 
     async def get_one_row(self, smt, *args):
         # Helper function to provide easy adaptation to cockroach
@@ -652,13 +871,16 @@ Parent ID: {writer.id}'''
                 txn._db_conn = await self.open()
                 return await self.start_transaction(txn, retries + 1)
 
-    async def get_conflicts(self, txn, full=False):
-        async with self._lock:
-            # use storage lock instead of transaction lock
-            if full:
-                return await self._read_conn.fetch(TXN_CONFLICTS_FULL, txn._tid)
-            else:
-                return await self._read_conn.fetch(TXN_CONFLICTS, txn._tid)
+    async def get_conflicts(self, txn, full=False, oids=None):
+        # transactions are read committed so they see what was committed
+        # after they started
+        async with txn._lock:
+            if oids is not None:
+                smt = await self.prepare_statement(txn._db_conn, TXN_CONFLICTS_ON_OIDS)
+                return await smt.fetch(txn._tid, list(oids))
+            smt = await self.prepare_statement(
+                txn._db_conn, TXN_CONFLICTS_FULL if full else TXN_CONFLICTS)
+            return await smt.fetch(txn._tid)
 
     async def commit(self, transaction):
         if transaction._db_txn is not None:
@@ -681,29 +903,32 @@ Parent ID: {writer.id}'''
         #     log.warning('Do not have db transaction to rollback')
 
     # Introspection
-    async def get_page_of_keys(self, txn, oid, page=1, page_size=1000):
-        conn = txn._db_conn
-        smt = await conn.prepare(BATCHED_GET_CHILDREN_KEYS)
-        keys = []
-        for record in await smt.fetch(oid, page_size, (page - 1) * page_size):
-            keys.append(record['id'])
-        return keys
+    async def get_page_of_keys(self, txn, oid, after=None, page_size=1000):
+        async with txn._lock:
+            smt = await self.prepare_statement(txn._db_conn, BATCHED_GET_CHILDREN_KEYS)
+            return await smt.fetch(oid, after or '', page_size)
 
     async def keys(self, txn, oid):
         async with txn._lock:
-            smt = await txn._db_conn.prepare(GET_CHILDREN_KEYS)
+            smt = await self.prepare_statement(txn._db_conn, GET_CHILDREN_KEYS)
             result = await smt.fetch(oid)
         return result
 
     async def get_child(self, txn, parent_oid, id):
         async with txn._lock:
-            smt = await txn._db_conn.prepare(GET_CHILD)
+            smt = await self.prepare_statement(txn._db_conn, GET_CHILD)
             result = await self.get_one_row(smt, parent_oid, id)
         return result
 
+    async def get_path(self, txn, parent_oid, path):
+        async with txn._lock:
+            smt = await self.prepare_statement(txn._db_conn, GET_PATH)
+            result = await smt.fetch(parent_oid, list(path))
+        return result
+
     async def has_key(self, txn, parent_oid, id):
         async with txn._lock:
-            smt = await txn._db_conn.prepare(EXIST_CHILD)
+            smt = await self.prepare_statement(txn._db_conn, EXIST_CHILD)
             result = await self.get_one_row(smt, parent_oid, id)
         if result is None:
             return False
@@ -712,33 +937,48 @@ Parent ID: {writer.id}'''
 
     async def len(self, txn, oid):
         async with txn._lock:
-            smt = await txn._db_conn.prepare(NUM_CHILDREN)
+            smt = await self.prepare_statement(txn._db_conn, NUM_CHILDREN)
             result = await smt.fetchval(oid)
         return result
 
     async def items(self, txn, oid):
+        # in pages instead of a cursor, which needs a db transaction and
+        # the connection kept while it is consumed. Lazy connections have
+        # neither
+        after = None
+        while True:
+            page = await self.get_page_of_children(txn, oid, after)
+            if len(page) == 0:
+                break
+            for record in page:
+                yield record
+            after = page[-1]['zoid']
+
+    async def get_page_of_children(self, txn, oid, after=None, page_size=1000):
         async with txn._lock:
-            smt = await txn._db_conn.prepare(GET_CHILDREN)
-        async for record in smt.cursor(oid):
-            # locks are dangerous in cursors since comsuming code might do
-            # sub-queries and they you end up with a deadlock
-            yield record
+            smt = await self.prepare_statement(txn._db_conn, GET_PAGE_OF_CHILDREN)
+            return await smt.fetch(oid, after or '', page_size)
 
     async def get_annotation(self, txn, oid, id):
         async with txn._lock:
-            smt = await txn._db_conn.prepare(GET_ANNOTATION)
+            smt = await self.prepare_statement(txn._db_conn, GET_ANNOTATION)
             result = await self.get_one_row(smt, oid, id)
         return result
 
+    async def get_annotations(self, txn, oid):
+        async with txn._lock:
+            smt = await self.prepare_statement(txn._db_conn, GET_ANNOTATIONS)
+            return await smt.fetch(oid)
+
     async def get_annotation_keys(self, txn, oid):
         async with txn._lock:
-            smt = await txn._db_conn.prepare(GET_ANNOTATIONS_KEYS)
+            smt = await self.prepare_statement(txn._db_conn, GET_ANNOTATIONS_KEYS)
             result = await smt.fetch(oid)
         return result
 
     async def write_blob_chunk(self, txn, bid, oid, chunk_index, data):
         async with txn._lock:
-            smt = await txn._db_conn.prepare(HAS_OBJECT)
+            smt = await self.prepare_statement(txn._db_conn, HAS_OBJECT)
             result = await self.get_one_row(smt, oid)
         if result is None:
             # check if we have a referenced ob, could be new and not in db yet.
@@ -753,12 +993,21 @@ Parent ID: {writer.id}'''
 
     async def read_blob_chunk(self, txn, bid, chunk=0):
         async with txn._lock:
-            smt = await txn._db_conn.prepare(READ_BLOB_CHUNK)
+            smt = await self.prepare_statement(txn._db_conn, READ_BLOB_CHUNK)
             return await self.get_one_row(smt, bid, chunk)
 
     async def read_blob_chunks(self, txn, bid):
+        if txn._lazy_connection:
+            # there is no connection kept to run a cursor on
+            chunk_index = 0
+            record = await self.read_blob_chunk(txn, bid, chunk_index)
+            while record is not None:
+                yield record
+                chunk_index += 1
+                record = await self.read_blob_chunk(txn, bid, chunk_index)
+            return
         async with txn._lock:
-            smt = await txn._db_conn.prepare(READ_BLOB_CHUNKS)
+            smt = await self.prepare_statement(txn._db_conn, READ_BLOB_CHUNKS)
         async for record in smt.cursor(bid):
             # locks are dangerous in cursors since comsuming code might do
             # sub-queries and they you end up with a deadlock
@@ -770,28 +1019,24 @@ Parent ID: {writer.id}'''
 
     async def get_total_number_of_objects(self, txn):
         async with txn._lock:
-            smt = await txn._db_conn.prepare(NUM_ROWS)
+            smt = await self.prepare_statement(txn._db_conn, NUM_ROWS)
             result = await smt.fetchval()
         return result
 
     async def get_total_number_of_resources(self, txn):
         async with txn._lock:
-            smt = await txn._db_conn.prepare(NUM_RESOURCES)
+            smt = await self.prepare_statement(txn._db_conn, NUM_RESOURCES)
             result = await smt.fetchval()
         return result
 
     async def get_total_resources_of_type(self, txn, type_):
         async with txn._lock:
-            smt = await txn._db_conn.prepare(NUM_RESOURCES_BY_TYPE)
+            smt = await self.prepare_statement(txn._db_conn, NUM_RESOURCES_BY_TYPE)
             result = await smt.fetchval(type_)
         return result
 
     # Massive treatment without security
-    async def _get_page_resources_of_type(self, txn, type_, page, page_size):
-        conn = txn._db_conn
+    async def _get_page_resources_of_type(self, txn, type_, after=None, page_size=1000):
         async with txn._lock:
-            smt = await conn.prepare(RESOURCES_BY_TYPE)
-        keys = []
-        for record in await smt.fetch(type_, page_size, (page - 1) * page_size):  # noqa
-            keys.append(record)
-        return keys
+            smt = await self.prepare_statement(txn._db_conn, RESOURCES_BY_TYPE)
+            return await smt.fetch(type_, after or '', page_size)
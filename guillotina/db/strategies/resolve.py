@@ -20,22 +20,24 @@ class ResolveStrategy(SimpleStrategy):
             return True
         current_tid = await self._storage.get_current_tid(self._transaction)
         if current_tid > self._transaction._tid:
-            # potential conflict error, get changes
-            # Check if there is any commit bigger than the one we already have
-            conflicts = await self._storage.get_conflicts(self._transaction)
-            for conflict in conflicts:
-                # both writing to same object...
-                if conflict['zoid'] in self._transaction.modified:
-                    modified_keys = [k for k in self._transaction.modified.keys()]
-                    logger.warn(
-                        f'Could not resolve conflicts in TID: {self._transaction._tid}\n'
-                        f'Conflicted TID: {current_tid}\n',
-                        f'IDs: {modified_keys}'
-                    )
-                    return False
+            # potential conflict error, only look for commits bigger than ours
+            # writing to the objects we are writing
+            modified = self._transaction.modified
+            conflicts = []
+            if len(modified) > 0:
+                conflicts = await self._storage.get_conflicts(
+                    self._transaction, oids=list(modified.keys()))
             if len(conflicts) > 0:
-                logger.info('Resolved conflict between transaction ids: {}, {}'.format(
-                    self._transaction._tid, current_tid
-                ))
+                self._storage.rejected_conflicts += 1
+                logger.warn(
+                    f'Could not resolve conflicts in TID: {self._transaction._tid}\n'
+                    f'Conflicted TID: {current_tid}\n'
+                    f'IDs: {[conflict["zoid"] for conflict in conflicts]}'
+                )
+                return False
+            self._storage.resolved_conflicts += 1
+            logger.info('Resolved conflict between transaction ids: {}, {}'.format(
+                self._transaction._tid, current_tid
+            ))
 
         return True
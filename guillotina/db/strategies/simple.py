@@ -16,7 +16,8 @@ class SimpleStrategy(BaseStrategy):
     '''
 
     async def tpc_begin(self):
-        await self._storage.start_transaction(self._transaction)
+        if not self._transaction._lazy_connection:
+            await self._storage.start_transaction(self._transaction)
         if self.writable_transaction:
             tid = await self._storage.get_next_tid(self._transaction)
             if tid is not None:
@@ -28,6 +28,41 @@ _EMPTY = '__<EMPTY VALUE>__'
 logger = logging.getLogger(__name__)
 
 
+class ConnectionLock:
+    '''
+    Lock held while running queries on the connection of a transaction.
+
+    Lazy transactions do not have a connection of their own: one is taken
+    from the storage pool when the lock is acquired and given back as soon
+    as it is released.
+    '''
+
+    def __init__(self, txn, loop=None):
+        self._txn = txn
+        self._lock = asyncio.Lock(loop=loop)
+
+    def locked(self):
+        return self._lock.locked()
+
+    async def __aenter__(self):
+        await self._lock.acquire()
+        if self._txn._lazy_connection and self._txn._db_conn is None:
+            try:
+                self._txn._db_conn = await self._txn._manager._storage.open()
+            except Exception:
+                self._lock.release()
+                raise
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            if self._txn._lazy_connection and self._txn._db_conn is not None:
+                conn = self._txn._db_conn
+                self._txn._db_conn = None
+                await self._txn._manager._storage.close(conn)
+        finally:
+            self._lock.release()
+
+
 class Status:
     # ACTIVE is the initial state.
     ACTIVE = "Active"
@@ -57,6 +92,15 @@ class Transaction(object):
         # OIDS to invalidate
         self._objects_to_invalidate = []
 
+        # (parent oid, id) -> row loaded ahead by `prefetch_path`
+        self._prefetched = {}
+
+        # oid -> {id: row} of all the annotations loaded by `prefetch_annotations`
+        self._prefetched_annotations = {}
+
+        # oid -> catalog data computed while committing, see `get_catalog_data`
+        self._catalog_data = None
+
         # List of (hook, args, kws) tuples added by addBeforeCommitHook().
         self._before_commit = []
 
@@ -67,13 +111,15 @@ class Transaction(object):
 
         # Connection to DB
         self._db_conn = None
+        # Only get a connection while running queries, see `ConnectionLock`
+        self._lazy_connection = False
         # Transaction on DB
         self._db_txn = None
         # Lock on the transaction
         # some databases need to lock during queries
         # this provides a lock for each transaction
         # which would correspond with one connection
-        self._lock = asyncio.Lock(loop=loop)
+        self._lock = ConnectionLock(self, loop=loop)
 
         # we *not* follow naming standards of using "_request" here so
         # get_current_request can magically find us here...
@@ -138,13 +184,15 @@ class Transaction(object):
         self._before_commit = []
 
     # BEGIN TXN
-    async def tpc_begin(self, conn):
+    async def tpc_begin(self, conn, lazy=False):
         """Begin commit of a transaction
 
-        conn is a real db that will be got by db.open()
+        conn is a real db that will be got by db.open(), lazy transactions
+        do not get one until they run a query
         """
         self._txn_time = time.time()
         self._db_conn = conn
+        self._lazy_connection = lazy
         await self._strategy.tpc_begin()
 
     def check_read_only(self):
@@ -239,6 +287,7 @@ class Transaction(object):
 
     @profilable
     async def commit(self):
+        self._catalog_data = {}
         await self._call_before_commit_hooks()
         self.status = Status.COMMITTING
         try:
@@ -270,8 +319,7 @@ class Transaction(object):
             await hook(*args, **kws)
         self._before_commit = []
 
-    @profilable
-    async def _store_object(self, obj, oid, added=False):
+    def _get_store_args(self, obj, oid, added=False):
         # Modified objects
         if obj._p_jar is not self and obj._p_jar is not None:
             raise Exception('Invalid reference to txn')
@@ -282,21 +330,42 @@ class Transaction(object):
         else:
             serial = getattr(obj, "_p_serial", 0)
 
-        writer = IWriter(obj)
-        await self._manager._storage.store(oid, serial, writer, obj, self)
+        return oid, serial, IWriter(obj), obj
+
+    def _object_stored(self, obj, oid):
         obj._p_serial = self._tid
         obj._p_oid = oid
         if obj._p_jar is None:
             obj._p_jar = self
         self._objects_to_invalidate.append(obj)
 
+    @profilable
+    async def _store_object(self, obj, oid, added=False):
+        await self._manager._storage.store(
+            *self._get_store_args(obj, oid, added), self)
+        self._object_stored(obj, oid)
+
+    @profilable
+    async def _store_objects(self, objects):
+        """
+        Store list of (obj, oid, added) with as few round trips as the
+        storage supports
+        """
+        await self._manager._storage.store_many(
+            self, [self._get_store_args(obj, oid, added) for obj, oid, added in objects])
+        for obj, oid, added in objects:
+            self._object_stored(obj, oid)
+
     @profilable
     async def real_commit(self):
         """Commit changes to an object"""
-        for oid, obj in self.added.items():
-            await self._store_object(obj, oid, True)
-        for oid, obj in self.modified.items():
-            await self._store_object(obj, oid)
+        objects = [(obj, oid, True) for oid, obj in self.added.items()]
+        objects.extend([(obj, oid, False) for oid, obj in self.modified.items()])
+        if len(objects) > 1 and getattr(self._manager._storage, '_batch_store', False):
+            await self._store_objects(objects)
+        else:
+            for obj, oid, added in objects:
+                await self._store_object(obj, oid, added)
         for oid, obj in self.deleted.items():
             if obj._p_jar is not self and obj._p_jar is not None:
                 raise Exception('Invalid reference to txn')
@@ -325,6 +394,9 @@ class Transaction(object):
         self.modified = {}
         self.deleted = {}
         self._objects_to_invalidate = []
+        self._prefetched = {}
+        self._prefetched_annotations = {}
+        self._catalog_data = None
         self._db_txn = None
 
     # Inspection
@@ -343,7 +415,9 @@ class Transaction(object):
     async def get_child(self, container, key):
         result = await self._cache.get(container=container, id=key)
         if result is None:
-            result = await self._manager._storage.get_child(self, container._p_oid, key)
+            result = self._prefetched.pop((container._p_oid, key), None)
+            if result is None:
+                result = await self._manager._storage.get_child(self, container._p_oid, key)
             if result is None:
                 return None
             if self._cache.max_cache_record_size > len(result['state']):
@@ -354,6 +428,29 @@ class Transaction(object):
         obj._p_jar = self
         return obj
 
+    @profilable
+    async def prefetch_path(self, container, path):
+        '''
+        Load the rows of the objects found walking down path from container
+        with one query so following `get_child` calls do not hit the storage
+        '''
+        parent_oid = container._p_oid
+        path = list(path)
+        while len(path) > 0:
+            result = await self._cache.get(oid=parent_oid, id=path[0])
+            if result is None:
+                break
+            parent_oid = result['zoid']
+            path.pop(0)
+
+        if len(path) < 2:
+            # nothing to win over a plain get_child
+            return
+
+        for result in await self._manager._storage.get_path(self, parent_oid, path):
+            self._prefetched[(parent_oid, result['id'])] = result
+            parent_oid = result['zoid']
+
     async def contains(self, oid, key):
         return await self._manager._storage.has_key(self, oid, key)  # noqa
 
@@ -365,14 +462,69 @@ class Transaction(object):
         return result
 
     async def items(self, container):
-        # XXX not using cursor because we can't cache with cursor results...
-        keys = await self.keys(container._p_oid)
-        for key in keys:
-            yield key, await self.get_child(container, key)
+        '''
+        Children of container, from the cache when all of them are there or
+        else loaded in pages of rows that are added to the cache
+        '''
+        results = None
+        keys = await self._cache.get(oid=container._p_oid, variant='keys')
+        if keys is not None:
+            results = []
+            for key in keys:
+                result = await self._cache.get(container=container, id=key)
+                if result is None:
+                    results = None
+                    break
+                results.append(result)
+        if results is not None:
+            for result in results:
+                obj = reader(result)
+                obj.__parent__ = container
+                obj._p_jar = self
+                yield result['id'], obj
+            return
+
+        keys = []
+        after = None
+        while True:
+            page = await self._manager._storage.get_page_of_children(
+                self, container._p_oid, after)
+            if len(page) == 0:
+                break
+            for result in page:
+                keys.append(result['id'])
+                if self._cache.max_cache_record_size > len(result['state']):
+                    await self._cache.set(result, container=container, id=result['id'])
+                obj = reader(result)
+                obj.__parent__ = container
+                obj._p_jar = self
+                yield result['id'], obj
+            after = page[-1]['zoid']
+        await self._cache.set(keys, oid=container._p_oid, variant='keys')
+
+    async def get_page_of_children(self, container, after=None, page_size=1000):
+        '''
+        Children of container following the child with oid `after`, not cached
+        so scanning large folders does not push everything out of the cache
+        '''
+        children = []
+        for result in await self._manager._storage.get_page_of_children(
+                self, container._p_oid, after, page_size):
+            obj = reader(result)
+            obj.__parent__ = container
+            obj._p_jar = self
+            children.append(obj)
+        return children
 
     @profilable
     async def get_annotation(self, base_obj, id):
-        result = await self._cache.get(container=base_obj, id=id, variant='annotation')
+        prefetched = self._prefetched_annotations.get(base_obj._p_oid)
+        if prefetched is not None:
+            result = prefetched.get(id)
+            if result is None:
+                raise KeyError(id)
+        else:
+            result = await self._cache.get(container=base_obj, id=id, variant='annotation')
         if result == _EMPTY:
             raise KeyError(id)
         if result is None:
@@ -387,14 +539,41 @@ class Transaction(object):
         obj._p_jar = self
         return obj
 
+    @profilable
+    async def prefetch_annotations(self, base_obj):
+        '''
+        Load all the annotations of an object in one query, `get_annotation`
+        gets them from here for the rest of the transaction
+        '''
+        oid = base_obj._p_oid
+        if oid in self._prefetched_annotations:
+            return
+        results = None
+        keys = await self._cache.get(oid=oid, variant='annotation-keys')
+        if keys is not None:
+            results = []
+            for key in keys:
+                result = await self._cache.get(container=base_obj, id=key, variant='annotation')
+                if result is None or result == _EMPTY:
+                    results = None
+                    break
+                results.append(result)
+        if results is None:
+            results = await self._manager._storage.get_annotations(self, oid)
+            await self._cache.set([r['id'] for r in results], oid=oid, variant='annotation-keys')
+            for result in results:
+                if self._cache.max_cache_record_size > len(result['state']):
+                    await self._cache.set(
+                        result, container=base_obj, id=result['id'], variant='annotation')
+        self._prefetched_annotations[oid] = {result['id']: result for result in results}
+
     @profilable
     async def get_annotation_keys(self, oid):
         result = await self._cache.get(oid=oid, variant='annotation-keys')
         if result is None:
             result = [r['id'] for r in await self._manager._storage.get_annotation_keys(self, oid)]
             await self._cache.set(result, oid=oid, variant='annotation-keys')
-            return result
-        return []
+        return result
 
     async def del_blob(self, bid):
         return await self._manager._storage.del_blob(self, bid)
@@ -419,23 +598,22 @@ class Transaction(object):
             self, type_)
 
     async def _get_resources_of_type(self, type_, page_size=1000):
-        page = 1
-        keys = await self._manager._storage._get_page_resources_of_type(
-            self, type_, page=page, page_size=page_size)
-        while len(keys) > 0:
-            for key in keys:
-                yield key
-            page += 1
-            keys = await self._manager._storage._get_page_resources_of_type(
-                self, type_, page=page, page_size=page_size)
+        records = await self._manager._storage._get_page_resources_of_type(
+            self, type_, page_size=page_size)
+        while len(records) > 0:
+            for record in records:
+                yield record
+            records = await self._manager._storage._get_page_resources_of_type(
+                self, type_, after=records[-1]['zoid'], page_size=page_size)
+
+    async def get_page_of_keys(self, oid, after=None, page_size=1000):
+        return await self._manager._storage.get_page_of_keys(
+            self, oid, after=after, page_size=page_size)
 
     async def iterate_keys(self, oid, page_size=1000):
-        page = 1
-        keys = await self._manager._storage.get_page_of_keys(
-            self, oid, page=page, page_size=page_size)
-        while len(keys) > 0:
-            for key in keys:
-                yield key
-            page += 1
-            keys = await self._manager._storage.get_page_of_keys(
-                self, oid, page=page, page_size=page_size)
+        records = await self.get_page_of_keys(oid, page_size=page_size)
+        while len(records) > 0:
+            for record in records:
+                yield record['id']
+            records = await self.get_page_of_keys(
+                oid, after=records[-1]['zoid'], page_size=page_size)
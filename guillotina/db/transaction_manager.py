@@ -40,14 +40,20 @@ class TransactionManager(object):
         """Starts a new transaction.
         """
 
-        db_conn = self._last_db_conn = await self._storage.open()
-
         if request is None:
             try:
                 request = get_current_request()
             except RequestNotFound:
                 pass
 
+        # read only requests only take a connection from the pool while querying
+        lazy = (self._storage._lazy_read_connections and
+                not getattr(request, '_db_write_enabled', True))
+        if lazy:
+            db_conn = self._last_db_conn = None
+        else:
+            db_conn = self._last_db_conn = await self._storage.open()
+
         user = None
 
         txn = None
@@ -77,7 +83,7 @@ class TransactionManager(object):
         if user is not None:
             txn.user = user
 
-        await txn.tpc_begin(db_conn)
+        await txn.tpc_begin(db_conn, lazy=lazy)
 
         return txn
 
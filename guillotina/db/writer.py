@@ -1,14 +1,12 @@
 from guillotina import configure
 from guillotina._settings import app_settings
-from guillotina.component import query_adapter
+from guillotina.catalog.utils import get_catalog_data
+from guillotina.db import codecs
 from guillotina.db.interfaces import IWriter
 from guillotina.db.orm.interfaces import IBaseObject
-from guillotina.interfaces import ICatalogDataAdapter
 from guillotina.interfaces import IResource
 from guillotina.utils import get_dotted_name
 
-import pickle
-
 
 @configure.adapter(
     for_=(IBaseObject),
@@ -40,7 +38,7 @@ class Writer(object):
         return getattr(self._obj, '__partition_id__', 0)
 
     def serialize(self):
-        return pickle.dumps(self._obj, protocol=pickle.HIGHEST_PROTOCOL)
+        return codecs.dumps(self._obj)
 
     @property
     def parent_id(self):
@@ -70,6 +68,4 @@ class ResourceWriter(Writer):
     async def get_json(self):
         if not app_settings.get('store_json', True):
             return {}
-        adapter = query_adapter(self._obj, ICatalogDataAdapter)
-        if adapter is not None:
-            return await adapter()
+        return await get_catalog_data(self._obj)
@@ -5,6 +5,7 @@ from guillotina import glogging
 from guillotina import languages
 from guillotina._settings import app_settings
 from guillotina.async import IAsyncUtility
+from guillotina.component import freeze_lookups
 from guillotina.component import get_all_utilities_registered_for
 from guillotina.component import get_utility
 from guillotina.component import provide_utility
@@ -17,6 +18,7 @@ from guillotina.contentnegotiation import ContentNegotiatorUtility
 from guillotina.exceptions import ConflictError
 from guillotina.exceptions import TIDConflictError
 from guillotina.factory.content import ApplicationRoot
+from guillotina.files.utils import close_request_data
 from guillotina.interfaces import IApplication
 from guillotina.interfaces import IDatabase
 from guillotina.interfaces import IDatabaseConfigurationFactory
@@ -97,6 +99,9 @@ class GuillotinaAIOHTTPApplication(web.Application):
                     getattr(getattr(request, '_txn', None), '_tid', 'not issued')
                 ))
             return aiohttp.web_exceptions.HTTPConflict()
+        finally:
+            if retries == 0:
+                close_request_data(request)
 
     def _make_request(self, message, payload, protocol, writer, task,
                       _cls=Request):
@@ -173,6 +178,7 @@ def make_app(config_file=None, settings=None, loop=None, server_app=None):
 
     import guillotina
     import guillotina.db.factory
+    import guillotina.db.codecs
     import guillotina.db.writer
     import guillotina.db.db
     configure.scan('guillotina.translation')
@@ -212,6 +218,9 @@ def make_app(config_file=None, settings=None, loop=None, server_app=None):
     # we don't need things registered in both components AND here.
     configure.clear()
 
+    # the configuration is committed, adapter lookups can be cached
+    freeze_lookups()
+
     # update *after* plugins loaded
     update_app_settings(settings)
 
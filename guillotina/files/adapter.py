@@ -1,13 +1,18 @@
 from .const import CHUNK_SIZE
 from .dbfile import DBFile
+from aiohttp import hdrs
 from aiohttp.web import StreamResponse
 from aiohttp.web_exceptions import HTTPNotFound
+from aiohttp.web_exceptions import HTTPNotModified
+from aiohttp.web_exceptions import HTTPRequestRangeNotSatisfiable
 from datetime import datetime
 from datetime import timedelta
 from dateutil.tz import tzlocal
 from guillotina import configure
 from guillotina._settings import app_settings
 from guillotina.browser import Response
+from guillotina.files.utils import etag_matches
+from guillotina.files.utils import parse_range_header
 from guillotina.files.utils import read_request_data
 from guillotina.interfaces import IAbsoluteURL
 from guillotina.interfaces import IDBFileField
@@ -16,6 +21,7 @@ from guillotina.interfaces import IRequest
 from guillotina.interfaces import IResource
 
 import base64
+import email.utils
 import uuid
 
 
@@ -205,17 +211,96 @@ class DBFileManagerAdapter:
         cors_renderer = app_settings['cors_renderer'](self.request)
         headers = await cors_renderer.get_headers()
         headers.update({
-            'CONTENT-DISPOSITION': f'{disposition}; filename="%s"' % file.filename
+            'CONTENT-DISPOSITION': f'{disposition}; filename="%s"' % file.filename,
+            'ETag': file.etag,
+            'Accept-Ranges': 'bytes'
         })
-
-        download_resp = StreamResponse(headers=headers)
-        download_resp.content_type = file.guess_content_type()
-        if file.size:
-            download_resp.content_length = file.size
-
+        if file.modified is not None:
+            headers['Last-Modified'] = email.utils.format_datetime(
+                file.modified, usegmt=True)
+
+        if self.not_modified(file):
+            # prepared so the renderer keeps its status
+            resp = HTTPNotModified(headers=headers)
+            await resp.prepare(self.request)
+            return resp
+
+        ranges = None
+        size = file.get_actual_size()
+        if hdrs.RANGE in self.request.headers and self.range_applies(file):
+            ranges = parse_range_header(self.request.headers[hdrs.RANGE], size)
+        if ranges is not None and len(ranges) == 0:
+            headers['Content-Range'] = f'bytes */{size}'
+            resp = HTTPRequestRangeNotSatisfiable(headers=headers)
+            await resp.prepare(self.request)
+            return resp
+
+        content_type = file.guess_content_type()
+        if ranges is None:
+            download_resp = StreamResponse(headers=headers)
+            download_resp.content_type = content_type
+            if file.size:
+                download_resp.content_length = file.size
+            await download_resp.prepare(self.request)
+            return await file.download(self.context, download_resp)
+
+        download_resp = StreamResponse(status=206, headers=headers)
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            download_resp.headers['Content-Range'] = f'bytes {start}-{end - 1}/{size}'
+            download_resp.content_type = content_type
+            download_resp.content_length = end - start
+            await download_resp.prepare(self.request)
+            return await file.download(self.context, download_resp, start, end)
+
+        # multipart/byteranges, every range goes in its own part
+        boundary = uuid.uuid4().hex
+        parts = []
+        for start, end in ranges:
+            parts.append((
+                (f'--{boundary}\r\n'
+                 f'Content-Type: {content_type}\r\n'
+                 f'Content-Range: bytes {start}-{end - 1}/{size}\r\n\r\n').encode('utf-8'),
+                start, end))
+        closing = f'--{boundary}--\r\n'.encode('utf-8')
+        download_resp.headers[hdrs.CONTENT_TYPE] = f'multipart/byteranges; boundary={boundary}'
+        download_resp.content_length = len(closing) + sum(
+            len(part_headers) + end - start + 2 for part_headers, start, end in parts)
         await download_resp.prepare(self.request)
-        resp = await file.download(self.context, download_resp)
-        return resp
+        for part_headers, start, end in parts:
+            download_resp.write(part_headers)
+            await file.download(self.context, download_resp, start, end)
+            download_resp.write(b'\r\n')
+        download_resp.write(closing)
+        await download_resp.drain()
+        return download_resp
+
+    def not_modified(self, file):
+        if hdrs.IF_NONE_MATCH in self.request.headers:
+            return etag_matches(self.request.headers[hdrs.IF_NONE_MATCH], file.etag)
+        if_modified_since = self.request.if_modified_since
+        if if_modified_since is not None and file.modified is not None:
+            return file.modified.replace(microsecond=0) <= if_modified_since
+        return False
+
+    def range_applies(self, file):
+        '''
+        Range is ignored when the file changed since the client got If-Range
+        '''
+        if_range = self.request.headers.get(hdrs.IF_RANGE)
+        if if_range is None:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith(('"', 'W/')):
+            return not if_range.startswith('W/') and if_range == file.etag
+        if file.modified is None:
+            return False
+        try:
+            return file.modified.replace(microsecond=0) <= email.utils.parsedate_to_datetime(
+                if_range)
+        except (TypeError, ValueError):
+            # not a valid date or one without timezone
+            return False
 
     async def iter_data(self):
         file = self.field.get(self.field.context or self.context)
@@ -1,4 +1,6 @@
 from .field import BaseCloudFile
+from datetime import datetime
+from datetime import timezone
 from guillotina.blob import Blob
 from guillotina.interfaces import IDBFile
 from zope.interface import implementer
@@ -9,11 +11,23 @@ class DBFile(BaseCloudFile):
     """File stored in a DB using blob storage"""
 
     _blob = None
+    _modified = None
 
     @property
     def valid(self):
         return self._blob is not None
 
+    @property
+    def etag(self):
+        # md5 is provided by the client so we can not trust it to change
+        # along with the data
+        if self._blob is not None:
+            return '"{}-{}"'.format(self._blob.bid, self._blob.size)
+
+    @property
+    def modified(self):
+        return self._modified
+
     async def init_upload(self, context):
         context._p_register()
         self._current_upload = 0
@@ -22,6 +36,7 @@ class DBFile(BaseCloudFile):
             await bfile.async_del()
         blob = Blob(context)
         self._blob = blob
+        self._modified = datetime.now(timezone.utc)
 
     async def append_data(self, context, data):
         context._p_register()
@@ -31,6 +46,7 @@ class DBFile(BaseCloudFile):
         bfile = self._blob.open(mode)
         await bfile.async_write_chunk(data)
         self._current_upload = self._blob.size
+        self._modified = datetime.now(timezone.utc)
 
     def get_actual_size(self):
         return self._blob.size
@@ -38,17 +54,29 @@ class DBFile(BaseCloudFile):
     async def finish_upload(self, context):
         pass
 
-    async def download(self, context, resp):
+    async def download(self, context, resp, start=None, end=None):
         bfile = self._blob.open()
-        async for chunk in bfile.iter_async_read():
-            resp.write(chunk)
-            await resp.drain()
+        if start is None:
+            chunks = bfile.iter_async_read_ahead()
+        else:
+            chunks = bfile.iter_async_read_range(start, end)
+        try:
+            async for chunk in chunks:
+                resp.write(chunk)
+                await resp.drain()
+        finally:
+            # stop reading ahead when the client went away
+            await chunks.aclose()
         return resp
 
     async def iter_data(self, context):
         bfile = self._blob.open()
-        async for chunk in bfile.iter_async_read():
-            yield chunk
+        chunks = bfile.iter_async_read_ahead()
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await chunks.aclose()
 
     async def copy_cloud_file(self, context, new_uri=None):
         if self._blob is None:
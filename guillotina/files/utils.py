@@ -3,48 +3,110 @@ from guillotina.exceptions import UnRetryableRequestError
 
 import asyncio
 import base64
+import io
 import mimetypes
 import os
+import tempfile
 
 
 async def read_request_data(request, chunk_size):
     '''
-    cachable request data reader to help with conflict error requests
+    cachable request data reader to help with conflict error requests.
+
+    Data read is kept in a temporary file, in memory until it grows over
+    MAX_REQUEST_CACHE_SIZE, so retried requests can read it again
     '''
     if getattr(request, '_retry_attempt', 0) > 0:
         # we are on a retry request, see if we have read cached data yet...
         if request._retry_attempt > getattr(request, '_last_cache_data_retry_count', 0):
             if getattr(request, '_cache_data', None) is None:
-                # request payload was too large to fit into request cache.
-                # so retrying this request is not supported and we need to throw
-                # another error
+                # request payload was not cached so retrying this request is
+                # not supported and we need to throw another error
                 raise UnRetryableRequestError()
-            data = request._cache_data[request._last_read_pos:request._last_read_pos + chunk_size]
+            request._cache_data.seek(request._last_read_pos)
+            data = request._cache_data.read(chunk_size)
             request._last_read_pos += len(data)
-            if request._last_read_pos >= len(request._cache_data):
+            if request._cache_data.read(1) == b'':
                 # done reading cache data
                 request._last_cache_data_retry_count = request._retry_attempt
-            return data
+            if data:
+                return data
 
-    if not hasattr(request, '_cache_data'):
-        request._cache_data = b''
+    if getattr(request, '_cache_data', None) is None:
+        request._cache_data = tempfile.SpooledTemporaryFile(
+            max_size=MAX_REQUEST_CACHE_SIZE)
 
     try:
         data = await request.content.readexactly(chunk_size)
     except asyncio.IncompleteReadError as e:
         data = e.partial
 
-    if request._cache_data is not None:
-        if len(request._cache_data) + len(data) > MAX_REQUEST_CACHE_SIZE:
-            # we only allow caching up to chunk size, otherwise, no cache data..
-            request._cache_data = None
-        else:
-            request._cache_data += data
+    request._cache_data.seek(0, io.SEEK_END)
+    request._cache_data.write(data)
 
     request._last_read_pos += len(data)
     return data
 
 
+def close_request_data(request):
+    '''
+    drop the data kept by `read_request_data` once the request will not be
+    retried anymore
+    '''
+    cache_data = getattr(request, '_cache_data', None)
+    if cache_data is not None:
+        cache_data.close()
+        request._cache_data = None
+
+
+def parse_range_header(value, size):
+    '''
+    Parse the value of a Range header for a file of size bytes.
+
+    Returns the list of (start, end) byte positions(end not included) to
+    send, an empty list if none of them can be satisfied or None if the
+    header is not valid and needs to be ignored.
+    '''
+    unit, _, ranges = value.partition('=')
+    if unit.strip().lower() != 'bytes' or not ranges.strip():
+        return None
+    result = []
+    for spec in ranges.split(','):
+        start, sep, end = spec.strip().partition('-')
+        if not sep:
+            return None
+        try:
+            if start == '':
+                # suffix range, last bytes of the file
+                length = int(end)
+                if length > 0 and size > 0:
+                    result.append((max(size - length, 0), size))
+            else:
+                start = int(start)
+                end = int(end) + 1 if end else None
+                if start < 0 or (end is not None and end <= start):
+                    return None
+                if start < size:
+                    result.append((start, min(end or size, size)))
+        except ValueError:
+            return None
+    return result
+
+
+def etag_matches(value, etag):
+    '''
+    If the list of entity tags of an If-None-Match/If-Range header matches
+    etag, using weak comparison
+    '''
+    if value.strip() == '*':
+        return True
+    etag = etag.replace('W/', '', 1)
+    for tag in value.split(','):
+        if tag.strip().replace('W/', '', 1) == etag:
+            return True
+    return False
+
+
 def get_contenttype(
         file=None,
         filename=None,
@@ -53,6 +53,7 @@ from .files import IFile  # noqa
 from .files import IFileField  # noqa
 from .files import IFileManager  # noqa
 from .json import IFactorySerializeToJson  # noqa
+from .json import IJSONEncoder  # noqa
 from .json import IJSONToValue  # noqa
 from .json import IResourceDeserializeFromJson  # noqa
 from .json import IResourceSerializeToJson  # noqa
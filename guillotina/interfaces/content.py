@@ -189,6 +189,17 @@ class IFolder(IResource, IAsyncContainer, ITraversable):
     '''
     '''
 
+    async def async_iter_keys(page_size=1000):  # noqa: N805
+        """
+        asynchronously iterate keys for sub objects, loading them in pages
+        """
+
+    async def async_get_page(after=None, page_size=1000, suppress_events=False):  # noqa: N805
+        """
+        asynchronously get up to page_size sub objects following the
+        sub object with oid `after`
+        """
+
 
 class IContainer(IResource, IAsyncContainer, ITraversable, IComponentSite):
     '''
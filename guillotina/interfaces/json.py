@@ -80,3 +80,13 @@ class IValueToJson(Interface):
 
     def __init__(value):
         """Adapt value, return json compat"""
+
+
+class IJSONEncoder(Interface):
+    """Named utility encoding the JSON of responses.
+
+    The one used is chosen with the `json_encoder` setting.
+    """
+
+    def dumps(value):
+        """Return the JSON text of value"""
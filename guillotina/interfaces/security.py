@@ -332,6 +332,15 @@ class IInteraction(Interface):
         object -- The object being accessed according to the permission
         """
 
+    def check_permissions(permission, objects):  # noqa: N805
+        """Return a list of whether security context allows permission on
+        each of the objects.
+
+        Arguments:
+        permission -- A permission name
+        objects -- The objects being accessed according to the permission
+        """
+
 
 class IPermission(Interface):
     """A permission object."""
@@ -6,7 +6,6 @@ from guillotina.component import get_adapter
 from guillotina.component import query_utility
 from guillotina.content import get_all_behaviors
 from guillotina.content import get_cached_factory
-from guillotina.directives import merged_tagged_value_dict
 from guillotina.directives import write_permission
 from guillotina.exceptions import NoInteraction
 from guillotina.interfaces import IAsyncBehavior
@@ -17,7 +16,7 @@ from guillotina.interfaces import IResource
 from guillotina.interfaces import IResourceDeserializeFromJson
 from guillotina.json.exceptions import DeserializationError
 from guillotina.json.exceptions import ValueDeserializationError
-from guillotina.schema import getFields
+from guillotina.json.utils import get_schema_plan
 from guillotina.schema.exceptions import ValidationError
 from guillotina.utils import apply_coroutine
 from zope.interface import Interface
@@ -71,9 +70,7 @@ class DeserializeFromJson(object):
     async def set_schema(
             self, schema, obj, data, errors,
             validate_all=False, behavior=False):
-        write_permissions = merged_tagged_value_dict(schema, write_permission.key)
-
-        for name, field in getFields(schema).items():
+        for name, _, field, permission in get_schema_plan(schema, write_permission.key):
 
             if field.readonly:
                 continue
@@ -91,7 +88,7 @@ class DeserializeFromJson(object):
             f = schema.get(name)
             if found:
 
-                if not self.check_permission(write_permissions.get(name)):
+                if not self.check_permission(permission):
                     continue
 
                 try:
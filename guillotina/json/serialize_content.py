@@ -5,10 +5,9 @@ from guillotina.component import get_multi_adapter
 from guillotina.component import query_utility
 from guillotina.content import get_all_behaviors
 from guillotina.content import get_cached_factory
-from guillotina.directives import merged_tagged_value_dict
+from guillotina.content import load_behaviors
 from guillotina.directives import read_permission
 from guillotina.interfaces import IAbsoluteURL
-from guillotina.interfaces import IAsyncBehavior
 from guillotina.interfaces import IFolder
 from guillotina.interfaces import IInteraction
 from guillotina.interfaces import IPermission
@@ -16,8 +15,8 @@ from guillotina.interfaces import IResource
 from guillotina.interfaces import IResourceSerializeToJson
 from guillotina.interfaces import IResourceSerializeToJsonSummary
 from guillotina.json.serialize_value import json_compatible
+from guillotina.json.utils import get_schema_plan
 from guillotina.profile import profilable
-from guillotina.schema import getFields
 from guillotina.utils import apply_coroutine
 from zope.interface import Interface
 
@@ -77,39 +76,40 @@ class SerializeToJson(object):
         included_ifaces = [name for name in self.include if '.' in name]
         included_ifaces.extend([name.rsplit('.', 1)[0] for name in self.include
                                 if '.' in name])
+        behaviors = []
         for behavior_schema, behavior in await get_all_behaviors(self.context, load=False):
             dotted_name = behavior_schema.__identifier__
             if (dotted_name in self.omit or
                     (len(included_ifaces) > 0 and dotted_name not in included_ifaces)):
                 # make sure the schema isn't filtered
                 continue
-            if IAsyncBehavior.implementedBy(behavior.__class__):
-                # providedBy not working here?
-                await behavior.load(create=False)
+            behaviors.append((behavior_schema, behavior))
+        await load_behaviors(self.context, [behavior for _, behavior in behaviors])
+        for behavior_schema, behavior in behaviors:
             await self.get_schema(behavior_schema, behavior, result, True)
 
         return result
 
     @profilable
     async def get_schema(self, schema, context, result, behavior):
-        read_permissions = merged_tagged_value_dict(schema, read_permission.key)
+        filtered = len(self.include) > 0 or len(self.omit) > 0
         schema_serial = {}
-        for name, field in getFields(schema).items():
+        for name, dotted_name, field, permission in get_schema_plan(
+                schema, read_permission.key):
 
-            if not self.check_permission(read_permissions.get(name)):
+            if not self.check_permission(permission):
                 continue
 
-            if behavior:
-                # omit/include for behaviors need full name
-                dotted_name = schema.__identifier__ + '.' + name
-            else:
-                dotted_name = name
-            if (dotted_name in self.omit or (
-                    len(self.include) > 0 and (
-                        dotted_name not in self.include and
-                        schema.__identifier__ not in self.include))):
-                # make sure the fields aren't filtered
-                continue
+            if filtered:
+                if not behavior:
+                    # omit/include for behaviors need full name
+                    dotted_name = name
+                if (dotted_name in self.omit or (
+                        len(self.include) > 0 and (
+                            dotted_name not in self.include and
+                            schema.__identifier__ not in self.include))):
+                    # make sure the fields aren't filtered
+                    continue
 
             value = await self.serialize_field(context, field)
             if not behavior:
@@ -161,10 +161,11 @@ class SerializeFolderToJson(SerializeToJson):
             result['items'] = []
         else:
             result['items'] = []
-            async for ident, member in self.context.async_items(suppress_events=True):
-                if not ident.startswith('_') and bool(
-                        security.check_permission(
-                        'guillotina.AccessContent', member)):
+            members = [member async for ident, member in self.context.async_items(
+                suppress_events=True) if not ident.startswith('_')]
+            allowed = security.check_permissions('guillotina.AccessContent', members)
+            for member, member_allowed in zip(members, allowed):
+                if member_allowed:
                     result['items'].append(
                         await get_multi_adapter(
                             (member, self.request),
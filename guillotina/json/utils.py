@@ -1,4 +1,7 @@
 from guillotina import schema
+from guillotina._cache import SCHEMA_PLAN_CACHE
+from guillotina.directives import merged_tagged_value_dict
+from guillotina.schema import getFields
 from guillotina.utils import get_dotted_name
 
 import logging
@@ -27,6 +30,25 @@ _prop_mappings = {
 }
 
 
+def get_schema_plan(schema, permission_key):
+    """
+    (name, dotted name, field, permission) of every field of the schema,
+    permission being the one the `permission_key` directive sets for it.
+
+    Plans are computed once, until `load_cached_schema` runs again.
+    """
+    key = (schema, permission_key)
+    try:
+        return SCHEMA_PLAN_CACHE[key]
+    except KeyError:
+        pass
+    permissions = merged_tagged_value_dict(schema, permission_key)
+    plan = SCHEMA_PLAN_CACHE[key] = tuple(
+        (name, schema.__identifier__ + '.' + name, field, permissions.get(name))
+        for name, field in getFields(schema).items())
+    return plan
+
+
 def convert_field_to_schema(field):
     field_type = type(field)
 
@@ -9,28 +9,59 @@ import asyncio
 BaseAdapterRegistry._delegated = (
     'lookup', 'queryMultiAdapter', 'lookup1', 'queryAdapter',
     'adapter_hook', 'lookupAll', 'names',
-    'subscriptions', 'subscribers', 'asubscribers')
+    'subscriptions', 'subscribers', 'asubscribers', 'dispatch_table')
+
+
+_changed = AdapterLookupBase.changed
+
+
+def changed(self, ignored=None):
+    _changed(self, ignored)
+    self._dispatch_table = None
+
+
+def dispatch_table(self, objects, provided):
+    '''
+    The sync and async subscriptions of objects, computed once for the
+    interfaces they provide
+    '''
+    key = (tuple(map(providedBy, objects)), provided)
+    table = self._dispatch_table
+    if table is None:
+        table = self._dispatch_table = {}
+    try:
+        return table[key]
+    except KeyError:
+        pass
+    sync = []
+    async_ = []
+    for subscription in self.subscriptions(key[0], provided):
+        if asyncio.iscoroutinefunction(subscription):
+            async_.append(subscription)
+        else:
+            sync.append(subscription)
+    result = table[key] = (tuple(sync), tuple(async_))
+    return result
 
 
 @profilable
 async def asubscribers(self, objects, provided):
-    subscriptions = self.subscriptions(map(providedBy, objects), provided)
     results = []
-    for subscription in subscriptions:
-        if asyncio.iscoroutinefunction(subscription):
-            results.append(await subscription(*objects))
+    for subscription in self.dispatch_table(objects, provided)[1]:
+        results.append(await subscription(*objects))
     return results
 
 
 @profilable
 def subscribers(self, objects, provided):
-    subscriptions = self.subscriptions(map(providedBy, objects), provided)
     result = []
-    for subscription in subscriptions:
-        if not asyncio.iscoroutinefunction(subscription):
-            result.append(subscription(*objects))
+    for subscription in self.dispatch_table(objects, provided)[0]:
+        result.append(subscription(*objects))
     return result
 
 
+AdapterLookupBase._dispatch_table = None
+AdapterLookupBase.changed = changed
+AdapterLookupBase.dispatch_table = dispatch_table
 AdapterLookupBase.asubscribers = asubscribers
 AdapterLookupBase.subscribers = subscribers
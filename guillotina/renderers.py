@@ -1,10 +1,15 @@
 from aiohttp.helpers import sentinel
 from aiohttp.web import Response as aioResponse
+from aiohttp.web import StreamResponse
 from datetime import datetime
+from functools import partial
 from guillotina import configure
+from guillotina._settings import app_settings
 from guillotina.browser import Response
 from guillotina.component import query_adapter
+from guillotina.component import query_utility
 from guillotina.interfaces import IFrameFormatsJson
+from guillotina.interfaces import IJSONEncoder
 from guillotina.interfaces import IRendered
 from guillotina.interfaces import IRendererFormatHtml
 from guillotina.interfaces import IRendererFormatJson
@@ -14,6 +19,7 @@ from guillotina.interfaces import IRenderFormats
 from guillotina.interfaces import IRequest
 from guillotina.interfaces import IView
 from guillotina.interfaces.security import PermissionSetting
+from guillotina.json.serialize_value import json_compatible
 from guillotina.profile import profilable
 from guillotina.utils import apply_coroutine
 from zope.interface.interface import InterfaceClass
@@ -50,17 +56,216 @@ class GuillotinaJSONEncoder(json.JSONEncoder):
 # b/w compat import
 PServerJSONEncoder = GuillotinaJSONEncoder
 
+_json_encoder = None
+_default_encoder = GuillotinaJSONEncoder()
+# bool is an int
+_PLAIN_TYPES = (str, int, float)
+
+
+def _encodable_key(key):
+    if isinstance(key, str):
+        return key
+    if isinstance(key, (int, float)) or key is None:
+        # as the json module does
+        return json.dumps(key)
+    raise TypeError(
+        f'keys must be str, int, float, bool or None, not {type(key).__name__}')
+
+
+def _encodable_default(value):
+    try:
+        return json_compatible(value)
+    except TypeError:
+        return _default_encoder.default(value)
+
+
+def json_encodable(value):
+    """
+    Copy of value with only the types every JSON encoder knows, the others
+    are converted with `json_compatible` or `GuillotinaJSONEncoder`
+    """
+    type_ = type(value)
+    if type_ in _PLAIN_TYPES or value is None:
+        return value
+    if type_ is dict:
+        return {_encodable_key(key): json_encodable(item)
+                for key, item in value.items()}
+    if type_ is list or type_ is tuple:
+        return [json_encodable(item) for item in value]
+    if isinstance(value, _PLAIN_TYPES):
+        # subclasses, like i18n messages
+        return value
+    return json_encodable(_encodable_default(value))
+
+
+try:
+    ujson.dumps(None, default=str)
+except TypeError:
+    # ujson < 2 has no hook for the types it does not know, they need to be
+    # converted before
+    _ujson_has_default = False
+else:
+    _ujson_has_default = True
+
+
+@configure.utility(provides=IJSONEncoder, name='json')
+class StdlibJSONEncoder:
+    """
+    `json` module, with `GuillotinaJSONEncoder` for the types it does not know
+    """
+
+    def dumps(self, value):
+        return json.dumps(value, cls=GuillotinaJSONEncoder)
+
+
+@configure.utility(provides=IJSONEncoder, name='ujson')
+class UltraJSONEncoder:
+    """
+    `ujson`, with `json_compatible` and `GuillotinaJSONEncoder` for the types
+    it does not know
+    """
+
+    def dumps(self, value):
+        if _ujson_has_default:
+            return ujson.dumps(
+                value, ensure_ascii=False, escape_forward_slashes=False,
+                default=_encodable_default)
+        return ujson.dumps(
+            json_encodable(value), ensure_ascii=False, escape_forward_slashes=False)
+
+
+def get_json_encoder():
+    global _json_encoder
+    name = app_settings.get('json_encoder', 'json')
+    if _json_encoder is None or _json_encoder[0] != name:
+        encoder = query_utility(IJSONEncoder, name=name)
+        if encoder is None:
+            raise Exception(f'No JSON encoder registered with the name {name}')
+        _json_encoder = (name, encoder)
+    return _json_encoder[1]
+
+
+def _get_dumps(dumps):
+    if dumps is None:
+        return get_json_encoder().dumps
+    return partial(dumps, cls=GuillotinaJSONEncoder)
+
+
+# bytes of encoded JSON buffered before writing them to a streamed response
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _is_async_iterable(value):
+    return hasattr(value, '__aiter__')
+
+
+def is_streamed(value):
+    """
+    If value has async iterables to render as they are iterated, either
+    being one or as values of a dict
+    """
+    if _is_async_iterable(value):
+        return True
+    if isinstance(value, dict):
+        for item in value.values():
+            if _is_async_iterable(item):
+                return True
+    return False
+
+
+async def _iter_json_array(iterable, dumps):
+    yield '['
+    first = True
+    async for item in iterable:
+        if first:
+            first = False
+            yield dumps(item)
+        else:
+            yield ',' + dumps(item)
+    yield ']'
+
+
+async def iter_json(value, dumps=None):
+    """
+    JSON of a streamed value in chunks, its async iterables are encoded as
+    arrays one item at a time
+    """
+    dumps = _get_dumps(dumps)
+    if _is_async_iterable(value):
+        async for chunk in _iter_json_array(value, dumps):
+            yield chunk
+        return
+
+    yield '{'
+    first = True
+    for key, item in value.items():
+        key = dumps(str(key))
+        if first:
+            first = False
+            yield key + ':'
+        else:
+            yield ',' + key + ':'
+        if _is_async_iterable(item):
+            async for chunk in _iter_json_array(item, dumps):
+                yield chunk
+        else:
+            yield dumps(item)
+    yield '}'
+
+
+async def collect_streamed(value):
+    """
+    Copy of a streamed value with its async iterables read into lists, for
+    the consumers that can not write it as it is produced
+    """
+    if _is_async_iterable(value):
+        return [item async for item in value]
+    if isinstance(value, dict) and is_streamed(value):
+        value = value.copy()
+        for key, item in value.items():
+            if _is_async_iterable(item):
+                value[key] = [i async for i in item]
+    return value
+
+
+async def stream_json_response(request, data, *, status=200, headers=None,
+                               content_type='application/json', dumps=None):
+    """
+    Write the JSON of data as it is produced, see `iter_json`
+    """
+    resp = StreamResponse(status=status, headers=headers)
+    resp.content_type = content_type
+    await resp.prepare(request)
+    chunks = []
+    size = 0
+    async for chunk in iter_json(data, dumps):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= STREAM_CHUNK_SIZE:
+            resp.write(''.join(chunks).encode('utf-8'))
+            await resp.drain()
+            chunks = []
+            size = 0
+    if chunks:
+        resp.write(''.join(chunks).encode('utf-8'))
+    await resp.drain()
+    return resp
+
 
 def json_response(data=sentinel, *, text=None, body=None, status=200,
                   reason=None, headers=None, content_type='application/json',
-                  dumps=json.dumps):
+                  dumps=None):
+    """
+    Response with the JSON of data, encoded with the `json_encoder` utility
+    unless a `json.dumps` like function is given
+    """
     if data is not sentinel:
         if text or body:
             raise ValueError(
                 "only one of data, text, or body should be specified"
             )
         else:
-            text = dumps(data, cls=GuillotinaJSONEncoder)
+            text = _get_dumps(dumps)(data)
     return aioResponse(
         text=text, body=body, status=status, reason=reason,
         headers=headers, content_type=content_type)
@@ -133,6 +338,9 @@ class RendererJson(Renderer):
         if frame:
             framer = query_adapter(self.request, IFrameFormatsJson, frame)
             json_value = await apply_coroutine(framer, json_value)
+        if is_streamed(json_value):
+            return await stream_json_response(
+                self.request, json_value, status=status, headers=headers)
         resp = json_response(json_value)
         resp.headers.update(headers)
         resp.headers.update(
@@ -149,10 +357,10 @@ class StringRenderer(Renderer):
     @profilable
     async def __call__(self, value):
         if _is_guillotina_response(value):
-            body = value.response
+            body = await collect_streamed(value.response)
             if not isinstance(body, bytes):
                 if not isinstance(body, str):
-                    body = ujson.dumps(value.response)
+                    body = get_json_encoder().dumps(body)
                 body = body.encode('utf8')
 
             value = aioResponse(
@@ -188,7 +396,7 @@ class RendererRaw(Renderer):
     def guess_response(self, value):
         resp = value.response
         if type(resp) in (dict, list, int, float, bool):
-            resp = aioResponse(body=bytes(json.dumps(resp, cls=GuillotinaJSONEncoder), 'utf-8'))
+            resp = aioResponse(body=get_json_encoder().dumps(resp).encode('utf-8'))
             resp.headers['Content-Type'] = 'application/json'
         elif isinstance(resp, str):
             original_resp = resp
@@ -211,5 +419,6 @@ class RendererRaw(Renderer):
     async def __call__(self, value):
         resp = value
         if isinstance(value, Response):
+            value.response = await collect_streamed(value.response)
             resp = self.guess_response(value)
         return resp
@@ -14,11 +14,15 @@
 """Define Zope's default security policy
 """
 from guillotina import configure
+from guillotina._settings import app_settings
 from guillotina.auth.users import SystemUser
+from guillotina.component import get_component_registry
 from guillotina.component import get_utility
+from guillotina.db.cache.memory import LRU
 from guillotina.interfaces import Allow
 from guillotina.interfaces import AllowSingle
 from guillotina.interfaces import Deny
+from guillotina.interfaces import IDatabase
 from guillotina.interfaces import IGroups
 from guillotina.interfaces import IInteraction
 from guillotina.interfaces import IPrincipalPermissionMap
@@ -33,8 +37,13 @@ from guillotina.profile import profilable
 from guillotina.security.security_code import principal_permission_manager
 from guillotina.security.security_code import principal_role_manager
 from guillotina.security.security_code import role_permission_manager
+from guillotina.security.security_local import GuillotinaPrincipalPermissionManager
+from guillotina.security.security_local import GuillotinaPrincipalRoleManager
+from guillotina.security.security_local import GuillotinaRolePermissionManager
 from guillotina.utils import get_current_request
 
+from zope.interface import providedBy
+
 import zope.interface
 
 
@@ -58,10 +67,100 @@ def level_setting_as_boolean(level, value):
     return let == level if type(let) is str else let
 
 
+_marker = object()
+
+_security_cache = None
+
+
 class CacheEntry:
     pass
 
 
+class SecurityCache:
+    '''
+    Local settings inherited by the children of objects, shared by the
+    requests of the process.
+
+    Keyed by the (zoid, tid) of the objects with an `__acl__` in the chain
+    of parents, so changing any of them gives new keys.
+    '''
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lru = LRU(max_size)
+
+    def __len__(self):
+        return len(self._lru)
+
+    def get(self, key, default=None):
+        value = self._lru.get(key, _marker)
+        if value is _marker:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self._lru.set(key, value, 1)
+
+    def clear(self):
+        self._lru.clear()
+
+
+def get_security_cache():
+    global _security_cache
+    size = app_settings['cache'].get('security_cache_size', 0)
+    if not size:
+        return None
+    if _security_cache is None or _security_cache.max_size != size:
+        _security_cache = SecurityCache(size)
+    return _security_cache
+
+
+# provided interfaces -> whether the local settings are the `__acl__` maps
+_acl_map_specs = {}
+
+
+def uses_acl_maps(obj):
+    spec = providedBy(obj)
+    try:
+        return _acl_map_specs[spec]
+    except KeyError:
+        pass
+    adapters = get_component_registry().adapters
+    result = _acl_map_specs[spec] = (
+        adapters.lookup((spec,), IPrincipalPermissionMap) in (
+            None, GuillotinaPrincipalPermissionManager) and
+        adapters.lookup((spec,), IPrincipalRoleMap) in (
+            None, GuillotinaPrincipalRoleManager) and
+        adapters.lookup((spec,), IRolePermissionMap) in (
+            None, GuillotinaRolePermissionManager))
+    return result
+
+
+def has_local_settings(obj, principal, groups, permission):
+    # If the `__acl__` of the object has anything to say for the principal
+    # and permission
+    acl = getattr(obj, '__acl__', None)
+    if not acl:
+        return False
+    roleperm = acl.get('roleperm')
+    if roleperm is not None and roleperm._byrow.get(permission):
+        return True
+    principals = (principal,) + tuple(groups)
+    prinperm = acl.get('prinperm')
+    if prinperm is not None:
+        row = prinperm._byrow.get(permission)
+        if row and any(p in row for p in principals):
+            return True
+    prinrole = acl.get('prinrole')
+    if prinrole is not None and any(prinrole._bycol.get(p) for p in principals):
+        return True
+    return False
+
+
 @configure.adapter(
     for_=IRequest,
     provides=IInteraction)
@@ -110,6 +209,47 @@ class Interaction(object):
     def invalidate_cache(self):
         self._cache = {}
 
+    def acl_key(self, obj):
+        # Key of the local settings of obj and its parents in the security
+        # cache, None when they are not all committed ones
+        if obj is None:
+            return ()
+        cache = self.cache(obj)
+        try:
+            return cache.acl_key
+        except AttributeError:
+            pass
+        key = self.acl_key(getattr(obj, '__parent__', None))
+        if key is not None:
+            if IDatabase.providedBy(obj):
+                # code grants the same permissions on every database root
+                key = key + (obj.__db_id__,)
+            elif not uses_acl_maps(obj):
+                key = None
+            elif getattr(obj, '__acl__', None):
+                txn = obj._p_jar
+                if (obj._p_oid is None or obj._p_serial is None or txn is None or
+                        getattr(obj, '_v_acl_changed', False) or
+                        # transactionless strategies reuse tids
+                        txn._manager._storage._transaction_strategy == 'none'):
+                    key = None
+                else:
+                    key = key + ((obj._p_oid, obj._p_serial),)
+        cache.acl_key = key
+        return key
+
+    def shared_key(self, parent, level, *args):
+        # Key in the security cache of a value computed for the children
+        # of parent, None if it can not be shared
+        if level != 'p':
+            return None
+        if get_security_cache() is None:
+            return None
+        key = self.acl_key(parent)
+        if key is None:
+            return None
+        return key + args
+
     @profilable
     def check_permission(self, permission, obj):
         # Always allow public attributes
@@ -151,6 +291,48 @@ class Interaction(object):
 
         return False
 
+    @profilable
+    def check_permissions(self, permission, objs):
+        """
+        `check_permission` for many objects. Objects without local settings
+        for the principal and permission share the decision inherited from
+        their parent, which is computed once for all siblings.
+        """
+        if permission is Public:
+            return [True] * len(objs)
+
+        principals = []
+        seen = {}
+        for participation in self.participations:
+            principal = getattr(participation, 'principal', None)
+            if principal is None:
+                continue
+            if principal is SystemUser:
+                return [True] * len(objs)
+            if principal.id in seen:
+                continue
+            principals.append(principal)
+            seen[principal.id] = 1
+
+        results = []
+        for obj in objs:
+            if IView.providedBy(obj):
+                obj = obj.__parent__
+            parent = getattr(obj, '__parent__', None)
+            inherits = parent is not None and uses_acl_maps(obj)
+            allowed = False
+            for principal in principals:
+                self.principal = principal
+                groups = self._groups_for(principal)
+                if inherits and not has_local_settings(obj, principal.id, groups, permission):
+                    allowed = self.inherited_decision(parent, principal.id, groups, permission)
+                else:
+                    allowed = self.cached_decision(obj, principal.id, groups, permission)
+                if allowed:
+                    break
+            results.append(allowed)
+        return results
+
     def cache(self, parent):
         cache = self._cache.get(id(parent))
         if cache:
@@ -205,6 +387,37 @@ class Interaction(object):
         cache_decision_prin[permission] = decision = False
         return decision
 
+    @profilable
+    def inherited_decision(self, parent, principal, groups, permission):
+        # The decision `cached_decision` gives for the children of parent
+        # without local settings
+        cache = self.cache(parent)
+        try:
+            cache_inherited = cache.inherited
+        except AttributeError:
+            cache_inherited = cache.inherited = {}
+
+        try:
+            return cache_inherited[(principal, permission)]
+        except KeyError:
+            pass
+
+        decision = self.cached_principal_permission(
+            parent, principal, groups, permission, 'p')
+        if decision is None:
+            decision = False
+            roles = self.cached_roles(parent, permission, 'p')
+            if roles:
+                prin_roles = self.cached_principal_roles(
+                    parent, principal, groups, 'p')
+                for role, setting in prin_roles.items():
+                    if setting and (role in roles):
+                        decision = True
+                        break
+
+        cache_inherited[(principal, permission)] = decision
+        return decision
+
     @profilable
     def cached_principal_permission(
             self, parent, principal, groups, permission, level):
@@ -247,8 +460,42 @@ class Interaction(object):
             cache_prin_per[permission] = prinper
             return prinper
 
-        # Get the local map of the permissions
         # As we want to quit as soon as possible we check first locally
+        prinper = self.cached_local_principal_permission(
+            parent, principal, groups, permission, level)
+        if prinper is None:
+            # We check the global configuration
+            prinper = self.cached_principal_permission(
+                None, principal, groups, permission, 'p')
+        cache_prin_per[permission] = prinper
+        return prinper
+
+    def cached_local_principal_permission(
+            self, parent, principal, groups, permission, level):
+        # The permission, if any, set to the principal by the local settings
+        # of parent and its parents
+        if parent is None:
+            return None
+
+        cache = self.cache(parent)
+        try:
+            cache_local_prin = cache.local_prin
+        except AttributeError:
+            cache_local_prin = cache.local_prin = {}
+        try:
+            return cache_local_prin[(principal, permission, level)]
+        except KeyError:
+            pass
+
+        key = self.shared_key(parent, level, 'prin', principal, tuple(groups), permission)
+        if key is not None:
+            prinper = get_security_cache().get(key, _marker)
+            if prinper is not _marker:
+                cache_local_prin[(principal, permission, level)] = prinper
+                return prinper
+
+        # Get the local map of the permissions
+        prinper = None
         prinper_map = IPrincipalPermissionMap(parent, None)
         if prinper_map is not None:
             prinper = level_setting_as_boolean(
@@ -260,15 +507,15 @@ class Interaction(object):
                         prinper_map.get_setting(permission, group, None))
                     if prinper is not None:
                         continue
-            if prinper is not None:
-                cache_prin_per[permission] = prinper
-                return prinper
 
-        # Find the permission recursivelly set to a user
-        parent = getattr(parent, '__parent__', None)
-        prinper = self.cached_principal_permission(
-            parent, principal, groups, permission, 'p')
-        cache_prin_per[permission] = prinper
+        if prinper is None:
+            # Find the permission recursivelly set to a user
+            prinper = self.cached_local_principal_permission(
+                getattr(parent, '__parent__', None), principal, groups, permission, 'p')
+
+        cache_local_prin[(principal, permission, level)] = prinper
+        if key is not None:
+            get_security_cache().set(key, prinper)
         return prinper
 
     def global_principal_roles(self, principal, groups):
@@ -305,7 +552,40 @@ class Interaction(object):
             cache_principal_roles[principal] = roles
             return roles
 
-        roles = self.cached_principal_roles(
+        roles = self.cached_principal_roles(None, principal, groups, 'p')
+        local_roles = self.cached_local_principal_roles(
+            parent, principal, groups, level)
+        if local_roles:
+            roles = roles.copy()
+            roles.update(local_roles)
+
+        cache_principal_roles[principal] = roles
+        return roles
+
+    def cached_local_principal_roles(self, parent, principal, groups, level):
+        # The roles set to the principal by the local settings of parent
+        # and its parents
+        if parent is None:
+            return {}
+
+        cache = self.cache(parent)
+        try:
+            cache_local_roles = cache.local_principal_roles
+        except AttributeError:
+            cache_local_roles = cache.local_principal_roles = {}
+        try:
+            return cache_local_roles[(principal, level)]
+        except KeyError:
+            pass
+
+        key = self.shared_key(parent, level, 'principal_roles', principal, tuple(groups))
+        if key is not None:
+            roles = get_security_cache().get(key)
+            if roles is not None:
+                cache_local_roles[(principal, level)] = roles
+                return roles
+
+        roles = self.cached_local_principal_roles(
             getattr(parent, '__parent__', None),
             principal,
             groups,
@@ -324,7 +604,9 @@ class Interaction(object):
                         group):
                     roles[role] = level_setting_as_boolean(level, setting)
 
-        cache_principal_roles[principal] = roles
+        cache_local_roles[(principal, level)] = roles
+        if key is not None:
+            get_security_cache().set(key, roles)
         return roles
 
     def _groups_for(self, principal):
@@ -354,6 +636,13 @@ class Interaction(object):
             cache_roles[permission] = roles
             return roles
 
+        key = self.shared_key(parent, level, 'roles', permission)
+        if key is not None:
+            roles = get_security_cache().get(key)
+            if roles is not None:
+                cache_roles[permission] = roles
+                return roles
+
         roles = self.cached_roles(
             getattr(parent, '__parent__', None),
             permission, 'p')
@@ -371,6 +660,8 @@ class Interaction(object):
         if level != 'o':
             # Only cache on non 1rst level queries needs new way
             cache_roles[permission] = roles
+        if key is not None:
+            get_security_cache().set(key, roles)
         return roles
 
     def cached_principals(self, parent, roles, permission, level):
@@ -396,6 +687,13 @@ class Interaction(object):
             cache_principals[permission] = principals
             return principals
 
+        key = self.shared_key(parent, level, 'principals', permission, tuple(sorted(roles)))
+        if key is not None:
+            principals = get_security_cache().get(key)
+            if principals is not None:
+                cache_principals[permission] = principals
+                return principals
+
         principals = self.cached_principals(
             getattr(parent, '__parent__', None),
             roles,
@@ -413,6 +711,7 @@ class Interaction(object):
 
         prinrole = IPrincipalRoleMap(parent, None)
         if prinrole:
+            principals = principals.copy()
             for role in roles:
                 for principal, setting in prinrole.get_principals_for_role(role):
                     if setting is Allow:
@@ -425,6 +724,8 @@ class Interaction(object):
         if level != 'o':
             # Only cache on non 1rst level queries needs new way
             cache_principals[permission] = principals
+        if key is not None:
+            get_security_cache().set(key, principals)
         return principals
 
     def _global_roles_for(self, principal):
@@ -126,6 +126,8 @@ class GuillotinaSecurityMap(SecurityMap):
             map._byrow = self._byrow
             map._bycol = self._bycol
             self.context.__acl__[self.key] = map
+        # keeps the security cache from sharing what is computed with it
+        self.context._v_acl_changed = True
         self.context._p_register()
 
     def add_cell(self, rowentry, colentry, value):
@@ -1,11 +1,11 @@
 from datetime import datetime
 from dateutil.tz import tzlocal
 from guillotina import configure
-from guillotina.component._api import subscribers as component_subscribers
 from guillotina.component._api import get_component_registry
 from guillotina.component.interfaces import ComponentLookupError
 from guillotina.component.interfaces import IObjectEvent
 from guillotina.interfaces import IObjectModifiedEvent
+from guillotina.interfaces import IObjectMovedEvent
 from guillotina.interfaces import IResource
 
 
@@ -19,6 +19,14 @@ def modified_object(obj, event):
     obj.modification_date = now
 
 
+@configure.subscriber(for_=(IResource, IObjectMovedEvent))
+def forget_locations(obj, event):
+    """Forget the locations memoized for the request, see `memoize_location`."""
+    request = getattr(obj._p_jar, 'request', None)
+    if getattr(request, '_cache_locations', None) is not None:
+        request._cache_locations.clear()
+
+
 @configure.subscriber(for_=IObjectEvent)
 async def object_event_notify(event):
     """Dispatch ObjectEvents to interested adapters."""
@@ -28,6 +36,11 @@ async def object_event_notify(event):
         # Oh blast, no site manager. This should *never* happen!
         return []
 
-    # sync subscribers
-    component_subscribers((event.object, event), None)
-    return await sitemanager.adapters.asubscribers((event.object, event), None)
+    objects = (event.object, event)
+    sync, async_ = sitemanager.adapters.dispatch_table(objects, None)
+    for subscriber in sync:
+        subscriber(*objects)
+    results = []
+    for subscriber in async_:
+        results.append(await subscriber(*objects))
+    return results
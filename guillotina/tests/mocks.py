@@ -55,6 +55,9 @@ class MockStorage:
     _transaction_strategy = 'resolve'
     _cache_strategy = 'dummy'
     _options = {}
+    _lazy_read_connections = False
+    resolved_conflicts = 0
+    rejected_conflicts = 0
 
     def __init__(self, transaction_strategy='resolve', cache_strategy='dummy'):
         self._transaction_strategy = transaction_strategy
@@ -62,6 +65,16 @@ class MockStorage:
         self._transaction = None
         self._objects = {}
         self._parent_objs = {}
+        self._open_connections = 0
+        self._current_tid = 1
+        self._conflicted = []
+
+    async def open(self):
+        self._open_connections += 1
+        return object()
+
+    async def close(self, conn):
+        self._open_connections -= 1
 
     async def get_annotation(self, trns, oid, id):
         return None
@@ -73,6 +86,12 @@ class MockStorage:
     async def get_next_tid(self, trns):
         return 1
 
+    async def get_current_tid(self, trns):
+        return self._current_tid
+
+    async def get_conflicts(self, trns, full=False, oids=None):
+        return [{'zoid': oid} for oid in oids if oid in self._conflicted]
+
     async def abort(self, txn):
         pass
 
@@ -496,6 +496,24 @@ async def test_duplicate_content(container_requester):
         assert 'foobar' in response
 
 
+async def test_ids_not_json(container_requester):
+    async with container_requester as requester:
+        await requester('POST', '/db/guillotina/', data=json.dumps({
+            '@type': 'Item',
+            'id': 'foobar'
+        }))
+        for accept in ('text/html', 'text/plain'):
+            response, status = await requester(
+                'GET', '/db/guillotina/@ids', accept=accept)
+            assert status == 200
+            assert json.loads(response) == ['foobar']
+        # raw renderer
+        response, status = await requester(
+            'GET', '/db/guillotina/@ids', accept='*/*')
+        assert status == 200
+        assert response == ['foobar']
+
+
 async def test_create_content_fields(container_requester):
     async with container_requester as requester:
         response, status = await requester('POST', '/db/guillotina', data=json.dumps({
@@ -516,3 +534,31 @@ async def test_create_content_fields(container_requester):
         assert len(response['categories']) == 1
         assert response['textline_field'] == 'foobar'
         assert response['text_field'] == 'foobar'
+
+
+async def test_get_items_pages(container_requester):
+    async with container_requester as requester:
+        for idx in range(5):
+            await requester('POST', '/db/guillotina', data=json.dumps({
+                '@type': 'Item',
+                'id': f'item{idx}'
+            }))
+        ids = []
+        cursor = None
+        while True:
+            params = {'page_size': '2'}
+            if cursor is not None:
+                params['cursor'] = cursor
+            response, status = await requester(
+                'GET', '/db/guillotina/@items', params=params)
+            assert status == 200
+            assert len(response['items']) <= 2
+            ids.extend(item['@name'] for item in response['items'])
+            cursor = response['cursor']
+            if cursor is None:
+                break
+        assert sorted(ids) == [f'item{idx}' for idx in range(5)]
+
+        response, status = await requester(
+            'GET', '/db/guillotina/@items', params={'page_size': 'foobar'})
+        assert status == 412
@@ -1,4 +1,10 @@
+from aiohttp.streams import StreamReader
 from guillotina.behaviors.attachment import IAttachment
+from guillotina.files import CHUNK_SIZE
+from guillotina.files import MAX_REQUEST_CACHE_SIZE
+from guillotina.files.utils import close_request_data
+from guillotina.files.utils import parse_range_header
+from guillotina.files.utils import read_request_data
 from guillotina.tests import utils
 from guillotina.transactions import managed_transaction
 
@@ -162,3 +168,122 @@ async def test_copy_file_ob(container_requester):
             existing_bid = attachment.file._blob.bid
             await attachment.file.copy_cloud_file(obj)
             assert existing_bid != attachment.file._blob.bid
+
+
+def test_parse_range_header():
+    assert parse_range_header('bytes=0-9', 100) == [(0, 10)]
+    assert parse_range_header('bytes=90-', 100) == [(90, 100)]
+    assert parse_range_header('bytes=-10', 100) == [(90, 100)]
+    assert parse_range_header('bytes=95-200', 100) == [(95, 100)]
+    assert parse_range_header('bytes=0-0, 10-19', 100) == [(0, 1), (10, 20)]
+    assert parse_range_header('bytes=100-', 100) == []
+    assert parse_range_header('bytes=10-5', 100) is None
+    assert parse_range_header('items=0-9', 100) is None
+    assert parse_range_header('bytes=foo', 100) is None
+
+
+async def test_download_ranges(container_requester):
+    async with container_requester as requester:
+        response, status = await requester(
+            'POST',
+            '/db/guillotina/',
+            data=json.dumps({
+                '@type': 'Item',
+                '@behaviors': ['guillotina.behaviors.attachment.IAttachment'],
+                'id': 'foobar'
+            })
+        )
+        assert status == 201
+
+        data = bytes(range(256)) * 4096 * 8  # 8mb, 2 chunks
+        response, status = await requester(
+            'PATCH',
+            '/db/guillotina/foobar/@upload/file',
+            data=data,
+            headers={
+                'x-upload-size': str(len(data))
+            }
+        )
+        assert status == 200
+
+        response, status, headers = await requester.make_request(
+            'GET',
+            '/db/guillotina/foobar/@download/file'
+        )
+        assert status == 200
+        assert headers['Accept-Ranges'] == 'bytes'
+        etag = headers['ETag']
+
+        response, status, headers = await requester.make_request(
+            'GET',
+            '/db/guillotina/foobar/@download/file',
+            headers={'If-None-Match': etag}
+        )
+        assert status == 304
+
+        # range crossing both chunks
+        start = 1024 * 1024 * 5 - 10
+        response, status, headers = await requester.make_request(
+            'GET',
+            '/db/guillotina/foobar/@download/file',
+            headers={'Range': f'bytes={start}-{start + 19}'}
+        )
+        assert status == 206
+        assert response == data[start:start + 20]
+        assert headers['Content-Range'] == f'bytes {start}-{start + 19}/{len(data)}'
+
+        response, status, headers = await requester.make_request(
+            'GET',
+            '/db/guillotina/foobar/@download/file',
+            headers={'Range': 'bytes=0-9,-10'}
+        )
+        assert status == 206
+        assert headers['Content-Type'].startswith('multipart/byteranges')
+        assert data[:10] in response
+        assert data[-10:] in response
+
+        response, status, headers = await requester.make_request(
+            'GET',
+            '/db/guillotina/foobar/@download/file',
+            headers={'Range': f'bytes={len(data)}-'}
+        )
+        assert status == 416
+
+        # range is ignored if the file changed
+        response, status, headers = await requester.make_request(
+            'GET',
+            '/db/guillotina/foobar/@download/file',
+            headers={'Range': 'bytes=0-9', 'If-Range': '"foobar"'}
+        )
+        assert status == 200
+        assert len(response) == len(data)
+
+
+async def test_read_request_data_for_retries(loop):
+    payload = StreamReader(loop=loop)
+    payload.feed_data(b'X' * (MAX_REQUEST_CACHE_SIZE + 10))
+    payload.feed_eof()
+    request = utils.make_mocked_request('PATCH', '/', payload=payload)
+
+    request._last_read_pos = 0
+    data = await read_request_data(request, CHUNK_SIZE)
+    assert len(data) == CHUNK_SIZE
+    data = await read_request_data(request, CHUNK_SIZE)
+    assert len(data) == MAX_REQUEST_CACHE_SIZE + 10 - CHUNK_SIZE
+    # data was too large to stay in memory
+    assert request._cache_data._rolled
+
+    # retried request gets the same data again
+    request._retry_attempt = 1
+    request._last_read_pos = 0
+    read = b''
+    data = await read_request_data(request, CHUNK_SIZE)
+    while data:
+        read += data
+        data = await read_request_data(request, CHUNK_SIZE)
+    assert read == b'X' * (MAX_REQUEST_CACHE_SIZE + 10)
+
+    cache_data = request._cache_data
+    close_request_data(request)
+    assert cache_data.closed
+    assert request._cache_data is None
@@ -4,8 +4,11 @@ from guillotina.content import create_content_in_container
 from guillotina.interfaces import IApplication
 from guillotina.tests.utils import get_mocked_request
 from guillotina.tests.utils import login
+from guillotina.tests.utils import create_content
 from guillotina.transactions import managed_transaction
 
+import asyncio
+
 
 async def test_create_blob(postgres, guillotina_main):
     root = get_utility(IApplication, name='root')
@@ -80,3 +83,61 @@ async def test_write_large_blob_data(postgres, guillotina_main):
         assert container.blob.chunks == 6
 
         await db.async_del('container')
+
+
+async def test_read_ahead_blob_data(postgres, guillotina_main):
+    root = get_utility(IApplication, name='root')
+    db = root['db']
+    request = get_mocked_request(db)
+    login(request)
+
+    async with managed_transaction(request=request):
+        container = await create_content_in_container(
+            db, 'Container', 'container', request=request,
+            title='Container')
+
+        blob = Blob(container)
+        container.blob = blob
+
+        blobfi = blob.open('w')
+        await blobfi.async_write(b'foobar' * 10, chunk_size=6)
+
+    async with managed_transaction(request=request):
+        container = await db.async_get('container')
+        blobfi = container.blob.open()
+        chunks = []
+        async for chunk in blobfi.iter_async_read_ahead(max_size=12):
+            chunks.append(chunk)
+        assert chunks == [b'foobar'] * 10
+
+        data = b''
+        async for chunk in blobfi.iter_async_read_range(8, 20):
+            data += chunk
+        assert data == (b'foobar' * 10)[8:20]
+
+        await db.async_del('container')
+
+
+class SlowBlobTransaction:
+
+    def __init__(self):
+        self.reads = []
+
+    async def read_blob_chunk(self, bid, chunk=0):
+        self.reads.append(chunk)
+        if chunk > 0:
+            # a slow query
+            await asyncio.sleep(10)
+        return {'data': b'foobar'}
+
+
+async def test_read_ahead_stops_when_closed(loop):
+    txn = SlowBlobTransaction()
+    blob = Blob(create_content())
+    blob.chunks = 3
+    blob.size = 18
+    chunks = blob.open(transaction=txn).iter_async_read_ahead()
+    assert await chunks.__anext__() == b'foobar'
+    # like a client going away, the background read is cancelled
+    await asyncio.wait_for(chunks.aclose(), 1)
+    assert txn.reads == [0, 1]
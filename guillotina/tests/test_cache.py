@@ -1,3 +1,4 @@
+from guillotina.db.cache import memory
 from guillotina.db.cache.base import BaseCache
 from guillotina.db.transaction import Transaction
 from guillotina.tests import mocks
@@ -98,3 +99,101 @@ async def test_do_not_cache_large_object(dummy_guillotina):
     assert id(loaded) != id(ob)
     assert loaded._p_oid == ob._p_oid
     assert len(cache._actions) == 0
+
+
+def test_lru_evicts_by_size():
+    lru = memory.LRU(10)
+    lru.set('a', 'a', 4)
+    lru.set('b', 'b', 4)
+    lru.get('a')
+    evicted = lru.set('c', 'c', 4)
+    assert evicted == [('b', 'b')]
+    assert 'a' in lru
+    assert 'c' in lru
+    assert lru.size == 8
+
+
+async def test_memory_cache_shared_between_transactions(dummy_guillotina):
+    tm = mocks.MockTransactionManager(mocks.MockStorage(cache_strategy='memory'))
+    storage = tm._storage
+    ob = create_content()
+    storage.store(ob)
+
+    txn = Transaction(tm)
+    assert isinstance(txn._cache, memory.MemoryCache)
+    await txn.get(ob._p_oid)
+
+    # loaded from the process cache
+    del storage._objects[ob._p_oid]
+    txn = Transaction(tm)
+    loaded = await txn.get(ob._p_oid)
+    assert loaded._p_oid == ob._p_oid
+    assert txn._cache._store.hits == 1
+
+
+async def test_memory_cache_invalidates_modified_objects(dummy_guillotina):
+    tm = mocks.MockTransactionManager(mocks.MockStorage(cache_strategy='memory'))
+    storage = tm._storage
+    parent = create_content()
+    ob = create_content()
+    ob.__parent__ = parent
+    storage.store(parent)
+    storage.store(ob)
+
+    txn = Transaction(tm)
+    await txn.get_child(parent, ob.id)
+    await txn.get(ob._p_oid)
+    store = txn._cache._store
+    assert len(store) == 2
+
+    # object loaded without parent still invalidates child lookup
+    loaded = await txn.get(ob._p_oid)
+    loaded.__parent__ = None
+    txn.modified[loaded._p_oid] = loaded
+    await txn._cache.close()
+    assert len(store) == 0
+
+
+async def test_local_invalidator_between_stores(dummy_guillotina):
+    invalidator = memory.LocalCacheInvalidator()
+    store1 = memory.MemoryCacheStore(name='db')
+    store2 = memory.MemoryCacheStore(name='db')
+    other = memory.MemoryCacheStore(name='other')
+    for store in (store1, store2, other):
+        invalidator.subscribe(store)
+        store.set('foobar', {'zoid': 'foobar', 'state': b'foobar'})
+
+    await invalidator.publish(store1, ['foobar'])
+    assert store1.get('foobar') is not None
+    assert store2.get('foobar') is None
+    assert other.get('foobar') is not None
+
+
+async def test_memory_cache_skips_values_read_before_invalidation(dummy_guillotina):
+    tm = mocks.MockTransactionManager(mocks.MockStorage(cache_strategy='memory'))
+    parent = create_content()
+    ob = create_content()
+    ob.__parent__ = parent
+    row = {'zoid': ob._p_oid, 'tid': 1, 'id': ob.id, 'state': b'foobar'}
+
+    txn = Transaction(tm)
+    store = txn._cache._store
+    assert await txn._cache.get(oid=ob._p_oid) is None
+    assert await txn._cache.get(oid=parent._p_oid, variant='keys') is None
+
+    # another transaction commits a change while we load the rows
+    other = Transaction(tm)
+    other.modified[ob._p_oid] = ob
+    other.added[ob._p_oid] = ob
+    await other._cache.close()
+
+    await txn._cache.set(row, oid=ob._p_oid)
+    await txn._cache.set(row, container=parent, id=ob.id)
+    await txn._cache.set([ob.id], oid=parent._p_oid, variant='keys')
+    assert len(store) == 0
+
+    # rows read after the invalidation are cached
+    await txn._cache.close(invalidate=False)
+    assert await txn._cache.get(oid=ob._p_oid) is None
+    await txn._cache.set(row, oid=ob._p_oid)
+    assert len(store) == 1
@@ -1,11 +1,26 @@
+from guillotina.catalog.catalog import DefaultCatalogDataAdapter
+from guillotina.catalog.pg import get_all_index_fields
+from guillotina.catalog.pg import ParsedQuery
+from guillotina.catalog.pg import PGSearchUtility
+from guillotina.catalog.reindex import Reindexer
 from guillotina.catalog.utils import get_index_fields
 from guillotina.component import get_adapter
+from guillotina.component import get_utility
 from guillotina.component import query_utility
 from guillotina.content import create_content
+from guillotina.content import create_content_in_container
+from guillotina.event import notify
+from guillotina.events import ObjectAddedEvent
+from guillotina.events import ObjectModifiedEvent
+from guillotina.interfaces import IApplication
 from guillotina.interfaces import ICatalogDataAdapter
 from guillotina.interfaces import ICatalogUtility
 from guillotina.interfaces import ISecurityInfo
 from guillotina.tests import utils as test_utils
+from guillotina.transactions import managed_transaction
+
+import json
+import pytest
 
 
 def test_indexed_fields(dummy_guillotina, loop):
@@ -95,3 +110,207 @@ async def test_create_catalog(container_requester):
         assert status == 200
         response, status = await requester('DELETE', '/db/guillotina/@catalog')
         assert status == 200
+
+
+def test_pg_catalog_parse_query(dummy_guillotina):
+    parsed = ParsedQuery(get_all_index_fields()).parse({
+        'type_name': 'Item',
+        'depth__gte': '2',
+        'title': 'foo',
+        'path__starts': '/foo_bar',
+        'not_an_index': 'foobar',
+        '_size': '5',
+        '_sort_des': 'modification_date'
+    })
+    assert parsed.size == 5
+    assert parsed.sort == "json->'modification_date' DESC"
+    assert parsed.args == ['Item', '2', 'foo', '/foo\\_bar%']
+    assert parsed.wheres == [
+        'type = $1',
+        "json->'depth' >= $2::jsonb",
+        "to_tsvector('simple', json->>'title') @@ plainto_tsquery('simple', $3)",
+        "json->>'path' LIKE $4"
+    ]
+
+
+async def test_pg_catalog_search(container_requester):
+    async with container_requester as requester:
+        for idx in range(3):
+            response, status = await requester(
+                'POST',
+                '/db/guillotina/',
+                data=json.dumps({
+                    '@type': 'Folder',
+                    'title': f'Folder {idx}',
+                    'id': f'folder{idx}'
+                })
+            )
+            assert status == 201
+        response, status = await requester(
+            'POST',
+            '/db/guillotina/folder1',
+            data=json.dumps({
+                '@type': 'Item',
+                'title': 'Item',
+                'id': 'item'
+            })
+        )
+        assert status == 201
+
+        request = test_utils.get_mocked_request(requester.db)
+        test_utils.login(request)
+        root = await test_utils.get_root(request)
+        async with managed_transaction(request=request, abort_when_done=True):
+            container = await root.async_get('guillotina')
+            util = PGSearchUtility()
+            await util.initialize_catalog(container)
+
+            result = await util.get_by_type(container, 'Folder')
+            assert result['items_count'] == 3
+
+            result = await util.query(container, {'title': 'folder', '_sort_asc': 'id'})
+            assert [m['@name'] for m in result['member']] == ['folder0', 'folder1', 'folder2']
+
+            result = await util.get_by_path(container, '/folder1')
+            assert sorted(m['@name'] for m in result['member']) == ['folder1', 'item']
+            result = await util.get_by_path(container, '/', depth=0)
+            assert result['items_count'] == 3
+            result = await util.get_by_path(container, '/', depth=1)
+            assert result['items_count'] == 4
+            result = await util.get_by_path(container, '/folder1', depth=0)
+            assert sorted(m['@name'] for m in result['member']) == ['folder1', 'item']
+
+            folder = await container.async_get('folder1')
+            result = await util.get_folder_contents(container, folder.uuid)
+            assert result['member'][0]['@name'] == 'item'
+
+            # without a user nothing can be seen
+            request.security.participations = []
+            result = await util.get_by_type(container, 'Folder')
+            assert result['items_count'] == 0
+
+
+async def test_bulk_reindex_with_checkpoint(dummy_guillotina):
+    root = get_utility(IApplication, name='root')
+    db = root['db']
+    request = test_utils.get_mocked_request(db)
+    test_utils.login(request)
+
+    async with managed_transaction(request=request):
+        container = await create_content_in_container(
+            db, 'Container', 'reindex-container', request=request, title='Container')
+        for idx in range(3):
+            folder = await create_content_in_container(
+                container, 'Folder', f'folder{idx}', request=request)
+            for idx2 in range(4):
+                await create_content_in_container(
+                    folder, 'Item', f'item{idx2}', request=request)
+
+    indexed = []
+    failed = []
+
+    async def index(container, datas):
+        if len(indexed) == 6 and not failed:
+            failed.append(True)
+            raise Exception('Failed indexing')
+        indexed.extend(datas.values())
+
+    utility = query_utility(ICatalogUtility)
+    async with managed_transaction(request=request, abort_when_done=True):
+        container = await db.async_get('reindex-container')
+        reindexer = Reindexer(utility, container, request=request, batch_size=3, page_size=2,
+                              index=index)
+        with pytest.raises(Exception):
+            await reindexer()
+        checkpoint = reindexer.checkpoint
+        assert checkpoint['processed'] == 6
+
+        reindexer = Reindexer(utility, container, request=request, batch_size=3, page_size=2,
+                              checkpoint=checkpoint, index=index)
+        assert await reindexer() == 15
+
+    paths = [data['path'] for data in indexed]
+    assert len(paths) == 15
+    assert len(set(paths)) == 15
+    # children are indexed right after their folder
+    idx = paths.index('/folder1')
+    assert all(p.startswith('/folder1/') for p in paths[idx + 1:idx + 5])
+
+    # reindexing a folder also updates its own data
+    indexed.clear()
+    async with managed_transaction(request=request):
+        container = await db.async_get('reindex-container')
+        folder = await container.async_get('folder1')
+        folder.title = 'Folder 1'
+        folder._p_register()
+    async with managed_transaction(request=request, abort_when_done=True):
+        container = await db.async_get('reindex-container')
+        folder = await container.async_get('folder1')
+        reindexer = Reindexer(utility, folder, request=request, index=index)
+        assert await reindexer() == 5
+    assert indexed[0]['path'] == '/folder1'
+    assert indexed[0]['title'] == 'Folder 1'
+    assert all(data['path'].startswith('/folder1/') for data in indexed[1:])
+
+
+async def test_catalog_data_computed_once_on_commit(dummy_guillotina, monkeypatch):
+    root = get_utility(IApplication, name='root')
+    db = root['db']
+    request = test_utils.get_mocked_request(db)
+    test_utils.login(request)
+
+    calls = []
+    original = DefaultCatalogDataAdapter.__call__
+
+    async def counted(self, indexes=None):
+        calls.append(indexes)
+        return await original(self, indexes)
+    monkeypatch.setattr(DefaultCatalogDataAdapter, '__call__', counted)
+
+    async with managed_transaction(request=request):
+        container = await create_content_in_container(
+            db, 'Container', 'catalog-data-container', request=request, title='Container')
+        request.container = container
+        item = await create_content_in_container(
+            container, 'Item', 'item', request=request, title='Item')
+        await notify(ObjectAddedEvent(item, container, 'item'))
+        item2 = await create_content_in_container(
+            container, 'Item', 'item2', request=request, title='Item')
+        await notify(ObjectModifiedEvent(item2, payload={'title': 'Item 2'}))
+        item2.title = 'Item 2'
+        calls.clear()
+
+    # only once for every resource written, shared with the indexer
+    assert calls == [None, None, None]
+    fut = request.get_future('indexer')
+    assert fut.index[item.uuid]['title'] == 'Item'
+    data = fut.update[item2.uuid]
+    assert data['title'] == 'Item 2'
+    assert 'path' not in data
+    assert data['type_name'] == 'Item'
+
+
+async def test_catalog_data_of_every_transaction_of_request(dummy_guillotina):
+    root = get_utility(IApplication, name='root')
+    db = root['db']
+    request = test_utils.get_mocked_request(db)
+    test_utils.login(request)
+
+    async with managed_transaction(request=request):
+        container = await create_content_in_container(
+            db, 'Container', 'catalog-txns-container', request=request, title='Container')
+        request.container = container
+        item = await create_content_in_container(
+            container, 'Item', 'item', request=request, title='Item')
+        await notify(ObjectAddedEvent(item, container, 'item'))
+
+    # the transaction object of the request is reused
+    async with managed_transaction(request=request):
+        container = await db.async_get('catalog-txns-container')
+        item2 = await create_content_in_container(
+            container, 'Item', 'item2', request=request, title='Item 2')
+        await notify(ObjectAddedEvent(item2, container, 'item2'))
+
+    fut = request.get_future('indexer')
+    assert fut.index[item.uuid]['title'] == 'Item'
+    assert fut.index[item2.uuid]['title'] == 'Item 2'
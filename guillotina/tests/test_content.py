@@ -10,6 +10,7 @@ from guillotina.exceptions import NotAllowedContentType
 from guillotina.interfaces import IApplication
 from guillotina.interfaces.types import IConstrainTypes
 from guillotina.tests import utils
+from guillotina.transactions import managed_transaction
 
 import pytest
 
@@ -110,3 +111,54 @@ class TestContent:
         behavior = IDublinCore(obj)
         assert behavior.creators == ('root',)
         assert behavior.contributors == ('root',)
+
+
+async def test_folder_pages(dummy_guillotina):
+    root = get_utility(IApplication, name='root')
+    db = root['db']
+    request = utils.get_mocked_request(db)
+    utils.login(request)
+
+    async with managed_transaction(request=request):
+        container = await create_content_in_container(
+            db, 'Container', 'pages-container', request=request, title='Container')
+        for idx in range(5):
+            await create_content_in_container(container, 'Item', f'item{idx}')
+
+    async with managed_transaction(request=request, abort_when_done=True):
+        container = await db.async_get('pages-container')
+        keys = [key async for key in container.async_iter_keys(page_size=2)]
+        assert sorted(keys) == [f'item{idx}' for idx in range(5)]
+
+        children = await container.async_get_page(page_size=3)
+        assert len(children) == 3
+        children.extend(await container.async_get_page(children[-1]._p_oid, page_size=3))
+        assert sorted(c.id for c in children) == sorted(keys)
+        assert all(c.__parent__ is container for c in children)
+
+
+async def test_folder_items_in_pages(dummy_guillotina):
+    root = get_utility(IApplication, name='root')
+    db = root['db']
+    request = utils.get_mocked_request(db)
+    utils.login(request)
+
+    async with managed_transaction(request=request):
+        container = await create_content_in_container(
+            db, 'Container', 'items-container', request=request, title='Container')
+        for idx in range(5):
+            await create_content_in_container(container, 'Item', f'item{idx}')
+
+    async with managed_transaction(request=request, abort_when_done=True) as txn:
+        container = await db.async_get('items-container')
+        storage = txn._manager._storage
+
+        async def get_child(*args):
+            raise Exception('Children are not loaded one by one')
+        storage.get_child = get_child
+        try:
+            items = [(key, child) async for key, child in container.async_items()]
+        finally:
+            del storage.get_child
+        assert sorted(key for key, _ in items) == [f'item{idx}' for idx in range(5)]
+        assert all(child.id == key and child.__parent__ is container for key, child in items)
@@ -1,11 +1,22 @@
+from guillotina._settings import app_settings
+from guillotina.annotations import AnnotationData
 from guillotina.behaviors.dublincore import IDublinCore
+from guillotina.component import get_utility
+from guillotina.content import create_content_in_container
 from guillotina.content import Item
 from guillotina.db.orm.base import BaseObject
+from guillotina.db.reader import get_decoded_cache
+from guillotina.db.reader import reader
 from guillotina.db.transaction import Transaction
+from guillotina.db.writer import ResourceWriter
 from guillotina.interfaces import IAnnotations
+from guillotina.interfaces import IApplication
 from guillotina.interfaces import IResource
+from guillotina.tests import utils as test_utils
+from guillotina.transactions import managed_transaction
 from zope.interface import implementer
 
+import pickle
 import pytest
 
 
@@ -68,3 +79,92 @@ async def test_use_behavior_annotation(dummy_txn_root):
         await dublin.load()
         dublin.publisher = 'foobar'
         assert dublin.publisher == 'foobar'
+
+
+def test_decoded_cache_gives_copies(dummy_guillotina):
+    ob = Item()
+    ob.title = 'foobar'
+    ob.tags = ['foo']
+    ob.__acl__ = {'foo': {'bar': ['foobar']}}
+    result = {'zoid': 'foobar', 'tid': 1, 'id': 'foobar', 'state': pickle.dumps(ob)}
+
+    app_settings['cache']['decoded_cache_size'] = 1024 * 1024
+    try:
+        ob1 = reader(result)
+        ob2 = reader(result)
+        cache = get_decoded_cache()
+        assert cache.hits == 1
+        assert ob1 is not ob2
+        assert ob2.title == 'foobar'
+        assert ob2._p_oid == 'foobar'
+
+        ob1.tags.append('bar')
+        ob1.__acl__['foo']['bar'].append('bar')
+        ob3 = reader(result)
+        assert ob3.tags == ['foo']
+        assert ob3.__acl__ == {'foo': {'bar': ['foobar']}}
+
+        # same tid with a different state is decoded again
+        ob.title = 'changed'
+        ob4 = reader(dict(result, state=pickle.dumps(ob)))
+        assert ob4.title == 'changed'
+        assert cache.misses == 2
+    finally:
+        app_settings['cache']['decoded_cache_size'] = 0
+
+
+def test_state_codec_reads_pickles(dummy_guillotina):
+    ob = Item()
+    ob.title = 'foobar'
+    ob.tags = ['foo']
+    ob.__behaviors__ = frozenset([IDublinCore.__identifier__])
+    legacy = pickle.dumps(ob, protocol=pickle.HIGHEST_PROTOCOL)
+
+    app_settings['state_codec'] = 'state'
+    try:
+        state = ResourceWriter(ob).serialize()
+        assert state[:1] == b'S'
+        assert len(state) <= len(legacy)
+        for data in (state, legacy):
+            ob2 = reader({'zoid': 'foobar', 'tid': 1, 'id': 'foobar', 'state': data})
+            assert type(ob2) is Item
+            assert ob2.title == 'foobar'
+            assert ob2.tags == ['foo']
+            assert ob2.__behaviors__ == ob.__behaviors__
+            assert ob2._p_oid == 'foobar'
+    finally:
+        app_settings['state_codec'] = 'pickle'
+
+
+async def test_prefetch_annotations(dummy_guillotina):
+    root = get_utility(IApplication, name='root')
+    db = root['db']
+    request = test_utils.get_mocked_request(db)
+    test_utils.login(request)
+
+    async with managed_transaction(request=request):
+        container = await create_content_in_container(
+            db, 'Container', 'annotations-container', request=request, title='Container')
+        item = await create_content_in_container(container, 'Item', 'item', request=request)
+        annotations = IAnnotations(item)
+        for key in ('foo', 'bar'):
+            data = AnnotationData()
+            data['value'] = key
+            await annotations.async_set(key, data)
+
+    async with managed_transaction(request=request, abort_when_done=True) as txn:
+        container = await db.async_get('annotations-container')
+        item = await container.async_get('item')
+        storage = txn._manager._storage
+
+        async def get_annotation(*args):
+            raise Exception('Annotation not prefetched')
+        storage.get_annotation = get_annotation
+        try:
+            annotations = IAnnotations(item)
+            await annotations.async_load()
+            assert (await annotations.async_get('foo'))['value'] == 'foo'
+            assert (await annotations.async_get('bar'))['value'] == 'bar'
+            assert await annotations.async_get('missing') is None
+        finally:
+            del storage.get_annotation
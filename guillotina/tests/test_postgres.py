@@ -1,5 +1,6 @@
 from guillotina.content import Folder
 from guillotina.db.storages.cockroach import CockroachStorage
+from guillotina.db.storages.pg import GET_OID
 from guillotina.db.storages.pg import PostgresqlStorage
 from guillotina.db.transaction_manager import TransactionManager
 from guillotina.exceptions import ConflictError
@@ -277,6 +278,8 @@ async def test_should_resolve_conflict_error(postgres, dummy_request):
     await tm.commit(txn=txn2)
     # should not raise conflict error
     await tm.commit(txn=txn1)
+    assert aps.resolved_conflicts == 1
+    assert aps.rejected_conflicts == 0
 
     await aps.remove()
     await cleanup(aps)
@@ -529,6 +532,169 @@ async def test_mismatched_tid_causes_conflict_error(postgres, dummy_request):
     await cleanup(aps)
 
 
+async def test_batched_store_of_multiple_objects(postgres, dummy_request):
+    request = dummy_request  # noqa so magically get_current_request can find
+
+    aps = await get_aps()
+    tm = TransactionManager(aps)
+    txn = await tm.begin()
+
+    folder = create_content(Folder, 'Folder')
+    txn.register(folder)
+    items = []
+    for _ in range(10):
+        item = create_content()
+        await folder.async_set(item.id, item)
+        items.append(item)
+    await tm.commit(txn=txn)
+
+    txn = await tm.begin()
+    folder = await txn.get(folder._p_oid)
+    assert await folder.async_len() == 10
+    for item in items:
+        ob = await txn.get(item._p_oid)
+        ob.title = 'foobar'
+        txn.register(ob)
+    await tm.commit(txn=txn)
+
+    txn = await tm.begin()
+    for item in items:
+        ob = await txn.get(item._p_oid)
+        assert ob.title == 'foobar'
+    await tm.abort(txn=txn)
+
+    await aps.remove()
+    await cleanup(aps)
+
+
+async def test_batched_store_mismatched_tid_causes_conflict_error(postgres, dummy_request):
+    request = dummy_request  # noqa so magically get_current_request can find
+
+    aps = await get_aps()
+    tm = TransactionManager(aps)
+    txn = await tm.begin()
+
+    ob1 = create_content()
+    ob2 = create_content()
+    txn.register(ob1)
+    txn.register(ob2)
+    await tm.commit(txn=txn)
+
+    txn = await tm.begin()
+    ob1 = await txn.get(ob1._p_oid)
+    ob2 = await txn.get(ob2._p_oid)
+    # only one of the objects is out of date
+    ob2._p_serial = 3242432
+    txn.register(ob1)
+    txn.register(ob2)
+
+    with pytest.raises(ConflictError):
+        await tm.commit(txn=txn)
+    await aps.remove()
+    await cleanup(aps)
+
+
+async def test_prepared_statements_are_reused(postgres, dummy_request):
+    request = dummy_request  # noqa so magically get_current_request can find
+
+    aps = await get_aps()
+    tm = TransactionManager(aps)
+    txn = await tm.begin()
+    ob = create_content()
+    txn.register(ob)
+    await tm.commit(txn=txn)
+
+    txn = await tm.begin()
+    await txn.get(ob._p_oid)
+    smt = await aps.prepare_statement(txn._db_conn, GET_OID)
+    await txn.get(ob._p_oid)
+    assert smt is await aps.prepare_statement(txn._db_conn, GET_OID)
+    await tm.abort(txn=txn)
+
+    with pytest.raises(ConflictError):
+        await aps.restart_connection()
+    for _, statements in aps._statements.values():
+        assert GET_OID not in statements
+
+    await aps.remove()
+    await cleanup(aps)
+
+
+class SlottedConnection:
+    # asyncpg connections can not be weak referenced
+    __slots__ = ('closed',)
+
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+
+async def test_statements_by_connection(loop):
+    aps = PostgresqlStorage()
+    conn1 = SlottedConnection()
+    conn2 = SlottedConnection()
+    statements = aps._get_connection_statements(conn1)
+    statements['foo'] = 'bar'
+    assert aps._get_connection_statements(conn1) is statements
+    assert aps._get_connection_statements(conn2) == {}
+
+    conn1.closed = True
+    aps._forget_closed_connections()
+    assert list(aps._statements) == [id(conn2)]
+
+
+async def test_tids_on_transaction_connections(postgres, dummy_request):
+    request = dummy_request  # noqa so magically get_current_request can find
+
+    aps = await get_aps()
+    tm = TransactionManager(aps)
+    txns = await asyncio.gather(*[tm.begin() for _ in range(5)])
+    tids = [txn._tid for txn in txns]
+    assert len(set(tids)) == 5
+    # a transaction sees the tids issued after its own
+    assert await aps.get_current_tid(txns[0]) == max(tids)
+    for txn in txns:
+        await tm.abort(txn=txn)
+
+    await aps.remove()
+    await cleanup(aps)
+
+
+async def test_get_path_in_one_query(postgres, dummy_request):
+    request = dummy_request  # noqa so magically get_current_request can find
+
+    aps = await get_aps()
+    tm = TransactionManager(aps)
+    txn = await tm.begin()
+
+    folder = create_content(Folder, 'Folder')
+    txn.register(folder)
+    sub_folder = create_content(Folder, 'Folder')
+    await folder.async_set(sub_folder.id, sub_folder)
+    item = create_content()
+    await sub_folder.async_set(item.id, item)
+    await tm.commit(txn=txn)
+
+    txn = await tm.begin()
+    rows = await aps.get_path(txn, folder._p_oid, [sub_folder.id, item.id, 'missing'])
+    if USE_COCKROACH:
+        assert len(rows) == 0
+    else:
+        assert [row['zoid'] for row in rows] == [sub_folder._p_oid, item._p_oid]
+
+    folder = await txn.get(folder._p_oid)
+    await txn.prefetch_path(folder, [sub_folder.id, item.id])
+    sub_folder = await folder.async_get(sub_folder.id)
+    assert (await sub_folder.async_get(item.id))._p_oid == item._p_oid
+    assert len(txn._prefetched) == 0
+    await tm.abort(txn=txn)
+
+    await aps.remove()
+    await cleanup(aps)
+
+
 async def test_iterate_keys(postgres, dummy_request):
     request = dummy_request  # noqa so magically get_current_request can find
 
@@ -0,0 +1,141 @@
+from aiohttp import web
+from guillotina import configure
+from guillotina._settings import app_settings
+from guillotina.api.service import Service
+from guillotina.browser import Response
+from guillotina.component import get_utility
+from guillotina.interfaces import IContainer
+from guillotina.interfaces import IJSONEncoder
+from guillotina.renderers import collect_streamed
+from guillotina.renderers import get_json_encoder
+from guillotina.renderers import is_streamed
+from guillotina.renderers import iter_json
+from guillotina.renderers import json_encodable
+from guillotina.renderers import json_response
+from guillotina.renderers import RendererHtml
+from guillotina.renderers import RendererPlain
+from guillotina.renderers import stream_json_response
+
+import datetime
+import json
+import pytest
+
+
+async def _items(count):
+    for idx in range(count):
+        yield {'id': f'item{idx}', 'date': datetime.datetime(2018, 1, 1)}
+
+
+async def test_iter_json(dummy_guillotina):
+    assert not is_streamed({'items': []})
+    assert is_streamed(_items(0))
+    assert is_streamed({'items': _items(0)})
+
+    chunks = [chunk async for chunk in iter_json({'items': _items(2), 'length': 2})]
+    assert json.loads(''.join(chunks)) == {
+        'items': [{'id': 'item0', 'date': '2018-01-01T00:00:00'},
+                  {'id': 'item1', 'date': '2018-01-01T00:00:00'}],
+        'length': 2
+    }
+    chunks = [chunk async for chunk in iter_json(_items(0))]
+    assert json.loads(''.join(chunks)) == []
+
+
+async def test_collect_streamed():
+    assert await collect_streamed(_items(1)) == [
+        {'id': 'item0', 'date': datetime.datetime(2018, 1, 1)}]
+    value = {'items': _items(2), 'length': 2}
+    collected = await collect_streamed(value)
+    assert [item['id'] for item in collected['items']] == ['item0', 'item1']
+    assert collected['length'] == 2
+    assert not is_streamed(collected)
+    assert await collect_streamed({'items': []}) == {'items': []}
+
+
+async def test_stream_json_response(dummy_guillotina, test_client):
+    async def handler(request):
+        return await stream_json_response(
+            request, {'items': _items(5000)}, headers={'X-Foo': 'bar'})
+    app = web.Application()
+    app.router.add_get('/', handler)
+    client = await test_client(app)
+    resp = await client.get('/')
+    assert resp.status == 200
+    assert resp.headers['X-Foo'] == 'bar'
+    assert resp.headers['Content-Type'] == 'application/json'
+    data = await resp.json()
+    assert len(data['items']) == 5000
+    assert data['items'][-1]['id'] == 'item4999'
+
+
+def test_json_encoders(dummy_guillotina):
+    value = {
+        'date': datetime.datetime(2018, 1, 1, 10, 30),
+        'tags': {'foo'},
+        'numbers': (1, 2.5, True, None),
+        'text': 'caf\u00e9 </a>',
+        1: [frozenset(), {'nested': {'bar'}}]
+    }
+    stdlib = get_utility(IJSONEncoder, name='json')
+    fast = get_utility(IJSONEncoder, name='ujson')
+    # what the ujson encoder dumps when ujson has no `default` hook
+    assert json_encodable(value) == json.loads(fast.dumps(value)) == json.loads(
+        stdlib.dumps(value)) == {
+        'date': '2018-01-01T10:30:00',
+        'tags': ['foo'],
+        'numbers': [1, 2.5, True, None],
+        'text': 'caf\u00e9 </a>',
+        '1': [[], {'nested': ['bar']}]
+    }
+    with pytest.raises(TypeError):
+        fast.dumps({'foo': object()})
+    with pytest.raises(TypeError):
+        json_encodable({'foo': object()})
+
+    app_settings['json_encoder'] = 'ujson'
+    try:
+        assert get_json_encoder() is fast
+        resp = json_response({'date': datetime.datetime(2018, 1, 1)})
+        assert json.loads(resp.text) == {'date': '2018-01-01T00:00:00'}
+    finally:
+        app_settings['json_encoder'] = 'json'
+    assert get_json_encoder() is stdlib
+
+
+async def test_string_renderers_json_encoder(dummy_guillotina):
+    value = {'date': datetime.datetime(2018, 1, 1), 'text': 'caf\u00e9'}
+    for name in ('json', 'ujson'):
+        app_settings['json_encoder'] = name
+        try:
+            for renderer in (RendererHtml, RendererPlain):
+                resp = await renderer(None, None, None)(Response(value))
+                assert resp.body == get_json_encoder().dumps(value).encode('utf8')
+        finally:
+            app_settings['json_encoder'] = 'json'
+
+
+async def test_streamed_value_of_writable_request(container_requester):
+    class StreamedService(Service):
+        async def __call__(self):
+            return {'ids': self.context.async_iter_keys()}
+    configure.register_configuration(StreamedService, dict(
+        context=IContainer,
+        method='POST',
+        name="@streamed-ids",
+        permission='guillotina.ViewContent'
+    ), 'service')
+
+    async with container_requester as requester:
+        config = requester.root.app.config
+        configure.load_configuration(
+            config, 'guillotina.tests', 'service')
+        config.execute_actions()
+
+        await requester('POST', '/db/guillotina/', data=json.dumps({
+            '@type': 'Item',
+            'id': 'foobar'
+        }))
+        response, status = await requester(
+            'POST', '/db/guillotina/@streamed-ids')
+        assert status == 200
+        assert response == {'ids': ['foobar']}
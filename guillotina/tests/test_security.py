@@ -1,3 +1,13 @@
+from guillotina.auth.users import GuillotinaUser
+from guillotina.component import get_utility
+from guillotina.content import create_content
+from guillotina.content import create_content_in_container
+from guillotina.interfaces import IApplication
+from guillotina.interfaces import IPrincipalPermissionManager
+from guillotina.interfaces import IPrincipalRoleManager
+from guillotina.interfaces import IRolePermissionManager
+from guillotina.security.policy import get_security_cache
+from guillotina.security.policy import Interaction
 from guillotina.security.utils import get_principals_with_access_content
 from guillotina.security.utils import get_roles_with_access_content
 from guillotina.tests import utils
@@ -112,3 +122,87 @@ async def test_set_local_guillotina(container_requester):
             testing_object = await container.async_get('testing')
             principals = get_principals_with_access_content(testing_object, request)
             assert principals == ['root']
+
+
+async def test_check_permissions_on_siblings(dummy_guillotina):
+    request = utils.get_mocked_request()
+    user = GuillotinaUser(request)
+    user.id = 'user1'
+    request.security = Interaction(request)
+    request.security.add(utils.TestParticipation(request, user))
+
+    folder = await create_content('Folder', id='folder')
+    IPrincipalRoleManager(folder).assign_role_to_principal('guillotina.Reader', 'user1')
+    IPrincipalPermissionManager(folder).grant_permission_to_principal_no_inherit(
+        'guillotina.ViewContent', 'user1')
+    children = []
+    for idx in range(4):
+        child = await create_content('Item', id=f'item{idx}')
+        child.__parent__ = folder
+        children.append(child)
+    IPrincipalPermissionManager(children[1]).deny_permission_to_principal(
+        'guillotina.AccessContent', 'user1')
+    IPrincipalRoleManager(children[2]).assign_role_to_principal('guillotina.Editor', 'user1')
+    IRolePermissionManager(children[3]).deny_permission_to_role(
+        'guillotina.AccessContent', 'guillotina.Reader')
+
+    for permission in ('guillotina.ViewContent', 'guillotina.AccessContent',
+                       'guillotina.ModifyContent'):
+        expected = [request.security.check_permission(permission, child)
+                    for child in children]
+        request.security.invalidate_cache()
+        assert request.security.check_permissions(permission, children) == expected
+    assert expected == [False, False, True, False]
+    assert request.security.check_permissions(
+        'guillotina.AccessContent', children) == [True, False, True, False]
+    assert request.security.check_permissions(
+        'guillotina.ViewContent', children) == [False, False, False, False]
+
+
+def _get_user_request(db):
+    request = utils.get_mocked_request(db)
+    user = GuillotinaUser(request)
+    user.id = 'user1'
+    request.security = Interaction(request)
+    request.security.add(utils.TestParticipation(request, user))
+    return request
+
+
+async def test_security_cache_shared_between_requests(dummy_guillotina):
+    root = get_utility(IApplication, name='root')
+    db = root['db']
+    request = utils.get_mocked_request(db)
+    utils.login(request)
+    cache = get_security_cache()
+    cache.clear()
+
+    async with managed_transaction(request=request):
+        container = await create_content_in_container(
+            db, 'Container', 'security-cache-container', request=request, title='Container')
+        folder = await create_content_in_container(container, 'Folder', 'folder', request=request)
+        IPrincipalRoleManager(folder).assign_role_to_principal('guillotina.Reader', 'user1')
+        await create_content_in_container(folder, 'Item', 'item', request=request)
+
+    async def check_item(request):
+        async with managed_transaction(request=request, abort_when_done=True):
+            container = await db.async_get('security-cache-container')
+            folder = await container.async_get('folder')
+            item = await folder.async_get('item')
+            return request.security.check_permission('guillotina.AccessContent', item)
+
+    assert await check_item(_get_user_request(db))
+    hits = cache.hits
+    assert await check_item(_get_user_request(db))
+    assert cache.hits > hits
+
+    request = _get_user_request(db)
+    utils.login(request)
+    async with managed_transaction(request=request):
+        container = await db.async_get('security-cache-container')
+        folder = await container.async_get('folder')
+        item = await folder.async_get('item')
+        IPrincipalRoleManager(folder).unset_role_for_principal('guillotina.Reader', 'user1')
+        assert not request.security.cached_decision(
+            item, 'user1', (), 'guillotina.AccessContent')
+
+    assert not await check_item(_get_user_request(db))
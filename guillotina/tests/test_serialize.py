@@ -1,12 +1,16 @@
 from datetime import datetime
 from guillotina import schema
 from guillotina.component import get_adapter
+from guillotina.behaviors.dublincore import IDublinCore
 from guillotina.component import get_multi_adapter
+from guillotina.content import load_cached_schema
+from guillotina.directives import read_permission
 from guillotina.files.dbfile import DBFile
 from guillotina.interfaces import IJSONToValue
 from guillotina.interfaces import IResourceSerializeToJson
 from guillotina.json.deserialize_value import schema_compatible
 from guillotina.json.serialize_value import json_compatible
+from guillotina.json.utils import get_schema_plan
 from guillotina.tests.utils import create_content
 from zope.interface import Interface
 
@@ -64,6 +68,15 @@ async def test_serialize_omit_main_interface_field(dummy_request):
     assert 'file' in result
 
 
+async def test_schema_plan_cached_until_schemas_load(dummy_request):
+    plan = get_schema_plan(IDublinCore, read_permission.key)
+    assert get_schema_plan(IDublinCore, read_permission.key) is plan
+    assert ('creators', 'guillotina.behaviors.dublincore.IDublinCore.creators',
+            IDublinCore['creators'], None) in plan
+    load_cached_schema()
+    assert get_schema_plan(IDublinCore, read_permission.key) is not plan
+
+
 async def test_serialize_cloud_file(dummy_request):
     from guillotina.test_package import FileContent
     obj = create_content(FileContent)
@@ -1,4 +1,5 @@
 from guillotina.db.transaction import Transaction
+from guillotina.db.transaction_manager import TransactionManager
 from guillotina.tests import mocks
 from guillotina.tests import utils
 from guillotina.transactions import managed_transaction
@@ -20,6 +21,56 @@ async def test_tid_created_for_writes(dummy_request, loop):
     assert trns._tid is 1
 
 
+async def test_lazy_connection_for_reads(dummy_request, loop):
+    dummy_request._db_write_enabled = False
+    storage = mocks.MockStorage()
+    storage._lazy_read_connections = True
+    tm = TransactionManager(storage)
+    trns = await tm.begin(request=dummy_request)
+    assert trns._db_conn is None
+    assert storage._open_connections == 0
+    # no db transaction for reads
+    assert storage._transaction is None
+
+    async with trns._lock:
+        assert trns._db_conn is not None
+        assert storage._open_connections == 1
+    assert trns._db_conn is None
+    assert storage._open_connections == 0
+    await tm.abort(txn=trns)
+
+
+async def test_no_lazy_connection_for_writes(dummy_request, loop):
+    dummy_request._db_write_enabled = True
+    storage = mocks.MockStorage()
+    storage._lazy_read_connections = True
+    tm = TransactionManager(storage)
+    trns = await tm.begin(request=dummy_request)
+    assert trns._db_conn is not None
+    async with trns._lock:
+        pass
+    assert storage._open_connections == 1
+    await tm.abort(txn=trns)
+    assert storage._open_connections == 0
+
+
+async def test_resolve_vote_checks_modified_objects(dummy_request, loop):
+    dummy_request._db_write_enabled = True
+    storage = mocks.MockStorage()
+    tm = mocks.MockTransactionManager(storage)
+    trns = Transaction(tm, dummy_request, loop=loop)
+    await trns.tpc_begin(None)
+    trns.modified = {'foobar': None}
+
+    storage._current_tid = 2
+    assert await trns._strategy.tpc_vote()
+    assert storage.resolved_conflicts == 1
+
+    storage._conflicted = ['foobar']
+    assert not await trns._strategy.tpc_vote()
+    assert storage.rejected_conflicts == 1
+
+
 async def test_managed_transaction_with_adoption(container_requester):
     async with container_requester as requester:
         request = utils.get_mocked_request(requester.db)
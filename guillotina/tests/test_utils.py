@@ -1,9 +1,17 @@
 from guillotina import utils
+from guillotina.browser import get_physical_path
+from guillotina.component import get_utility
+from guillotina.content import create_content_in_container
+from guillotina.event import notify
+from guillotina.events import ObjectMovedEvent
+from guillotina.interfaces import IApplication
 from guillotina.interfaces import IPrincipalRoleManager
 from guillotina.interfaces import IResource
 from guillotina.tests.utils import create_content
 from guillotina.tests.utils import get_mocked_request
 from guillotina.tests.utils import get_root
+from guillotina.tests.utils import login
+from guillotina.transactions import managed_transaction
 
 import gc
 import json
@@ -134,3 +142,37 @@ def test_lazy_apply():
     assert utils.lazy_apply(_test_some_kwargs, 'foo', bar='bar', rsdfk='ldskf') == ('foo', 'bar')
     assert (utils.lazy_apply(_test_some_stars, 'foo', 'blah', bar='bar', another='another') ==
             ('foo', 'bar', {'another': 'another'}))
+
+
+async def test_locations_memoized_for_request(dummy_guillotina, monkeypatch):
+    root = get_utility(IApplication, name='root')
+    db = root['db']
+    request = get_mocked_request(db)
+    login(request)
+
+    async with managed_transaction(request=request, abort_when_done=True):
+        container = await create_content_in_container(
+            db, 'Container', 'locations-container', request=request, title='Container')
+        folder1 = await create_content_in_container(container, 'Folder', 'folder1')
+        folder2 = await create_content_in_container(container, 'Folder', 'folder2')
+        item = await create_content_in_container(folder1, 'Item', 'item')
+
+        assert utils.get_content_path(item) == '/folder1/item'
+        assert utils.get_content_depth(item) == 3
+        assert get_physical_path(item) == ['', 'locations-container', 'folder1', 'item']
+        assert len(request._cache_locations) > 0
+        # served from the memo now
+        assert utils.get_content_path(item) == '/folder1/item'
+
+        folder1.__parent__ = folder2
+        await notify(ObjectMovedEvent(folder1, container, 'folder1', folder2, 'folder1'))
+        assert utils.get_content_path(item) == '/folder2/folder1/item'
+        assert utils.get_content_depth(item) == 4
+        assert get_physical_path(item) == [
+            '', 'locations-container', 'folder2', 'folder1', 'item']
+
+        # only the most recently used are kept
+        monkeypatch.setattr(utils, 'MEMOIZED_LOCATIONS_SIZE', 2)
+        request._cache_locations = None
+        utils.get_content_path(item)
+        assert len(request._cache_locations) == 2
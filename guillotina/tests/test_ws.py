@@ -31,3 +31,24 @@ async def test_hello(container_requester, loop):
                     elif msg.tp == aiohttp.WSMsgType.error:
                         break  # noqa
                 return {}
+
+
+async def test_ids(container_requester, loop):
+    async with container_requester as requester:
+        await requester('POST', '/db/guillotina/', data=json.dumps({
+            '@type': 'Item',
+            'id': 'foobar'
+        }))
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect(
+                    'ws://localhost:{port}/db/guillotina/@ws'.format(
+                        port=requester.server.port),
+                    headers={'AUTHORIZATION': 'Basic %s' % ADMIN_TOKEN}) as ws:
+                ws.send_str(json.dumps({
+                    'op': 'GET',
+                    'value': '/@ids'
+                }))
+                msg = await ws.receive()
+                assert msg.tp == aiohttp.WSMsgType.text
+                assert json.loads(msg.data) == ['foobar']
+                await ws.close()
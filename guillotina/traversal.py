@@ -43,6 +43,8 @@ from guillotina.interfaces import ITraversableView
 from guillotina.interfaces import SUBREQUEST_METHODS
 from guillotina.profile import profilable
 from guillotina.registry import REGISTRY_DATA_KEY
+from guillotina.renderers import collect_streamed
+from guillotina.renderers import is_streamed
 from guillotina.security.utils import get_view_permission
 from guillotina.transactions import abort
 from guillotina.transactions import commit
@@ -110,6 +112,16 @@ async def subrequest(
         return caller(path, **params)
 
 
+def _get_content_path(path):
+    """Leading segments of path that can be traversed as content."""
+    content_path = []
+    for segment in path:
+        if segment.startswith(('_', '@')) or segment in ('.', '..'):
+            break
+        content_path.append(segment)
+    return content_path
+
+
 async def traverse(request, parent, path):
     """Do not use outside the main router function."""
     if IApplication.providedBy(parent):
@@ -144,6 +156,8 @@ async def traverse(request, parent, path):
         txn = await tm.begin(request=request)
         # Get the root of the tree
         context = await tm.get_root(txn=txn)
+        # Load the content below in one go instead of a query per segment
+        await txn.prefetch_path(context, _get_content_path(path[1:]))
 
     if IContainer.providedBy(context):
         request._container_id = context.id
@@ -192,6 +206,7 @@ class MatchInfo(AbstractMatchInfo):
     async def handler(self, request):
         """Main handler function for aiohttp."""
         request._view_error = False
+        streamed = False
         if app_settings['check_writable_request'](request):
             try:
                 # We try to avoid collisions on the same instance of
@@ -205,6 +220,13 @@ class MatchInfo(AbstractMatchInfo):
                     await abort(request)
                     request._view_error = True
                 else:
+                    # streamed values are read before the commit, the
+                    # transaction can not stay open while rendering
+                    if isinstance(view_result, Response):
+                        view_result.response = await collect_streamed(
+                            view_result.response)
+                    else:
+                        view_result = await collect_streamed(view_result)
                     await commit(request, warn=False)
 
             except Unauthorized as e:
@@ -222,6 +244,10 @@ class MatchInfo(AbstractMatchInfo):
         else:
             try:
                 view_result = await self.view()
+                # the values of streamed results are read while rendering
+                streamed = is_streamed(
+                    view_result.response if isinstance(view_result, Response)
+                    else view_result)
             except Unauthorized as e:
                 request._view_error = True
                 view_result = generate_unauthorized_response(e, request)
@@ -229,7 +255,8 @@ class MatchInfo(AbstractMatchInfo):
                 request._view_error = True
                 view_result = generate_error_response(e, request, 'ViewError')
             finally:
-                await abort(request)
+                if not streamed:
+                    await abort(request)
 
         # Make sure its a Response object to send to renderer
         if not isinstance(view_result, Response):
@@ -247,7 +274,11 @@ class MatchInfo(AbstractMatchInfo):
         if retry_attempts > 0:
             view_result.headers['X-Retry-Transaction-Count'] = str(retry_attempts)
 
-        resp = await self.rendered(view_result)
+        try:
+            resp = await self.rendered(view_result)
+        finally:
+            if streamed:
+                await abort(request)
         request.record('rendered')
 
         if not resp.prepared:
@@ -45,6 +45,8 @@ except NotImplementedError:
 
 
 RANDOM_SECRET = random.randint(0, 1000000)
+# locations memoized for a request, long running requests walk many objects
+MEMOIZED_LOCATIONS_SIZE = 1000
 logger = glogging.getLogger('guillotina')
 
 
@@ -56,28 +58,61 @@ def import_class(import_string: str) -> types.ModuleType:
     return getattr(importlib.import_module(t[0]), t[1], None)
 
 
+def memoize_location(kind, content, compute):
+    """
+    Memoize `compute(content)`, a value depending on where the content is,
+    for the request that loaded the content. Values are kept while the content
+    has the same parent and name and are all dropped when something is moved.
+    Only the MEMOIZED_LOCATIONS_SIZE most recently used values are kept.
+    """
+    request = getattr(getattr(content, '_p_jar', None), 'request', None)
+    if request is None:
+        return compute(content)
+    if getattr(request, '_cache_locations', None) is None:
+        # circular import
+        from guillotina.db.cache.memory import LRU
+        request._cache_locations = LRU(MEMOIZED_LOCATIONS_SIZE)
+    key = (kind, id(content))
+    parent = getattr(content, '__parent__', None)
+    name = content.__name__
+    cached = request._cache_locations.get(key)
+    if (cached is not None and cached[0] is content and
+            cached[1] is parent and cached[2] == name):
+        return cached[3]
+    value = compute(content)
+    request._cache_locations.set(key, (content, parent, name, value), 1)
+    return value
+
+
+def _get_content_path(content):
+    parent = getattr(content, '__parent__', None)
+    if (content is None or content.__name__ is None or
+            parent is None or IContainer.providedBy(content)):
+        return ''
+    return memoize_location('path', parent, _get_content_path) + '/' + content.__name__
+
+
 def get_content_path(content: IResource) -> str:
     """
     Generate full path of resource object
     """
-    parts = []
+    if content is None:
+        return '/'
+    return memoize_location('path', content, _get_content_path) or '/'
+
+
+def _get_content_depth(content):
     parent = getattr(content, '__parent__', None)
-    while content is not None and content.__name__ is not None and\
-            parent is not None and not IContainer.providedBy(content):
-        parts.append(content.__name__)
-        content = parent
-        parent = getattr(content, '__parent__', None)
-    return '/' + '/'.join(reversed(parts))
+    if parent is None:
+        return 0
+    return memoize_location('depth', parent, _get_content_depth) + 1
 
 
 def get_content_depth(content: IResource) -> int:
     """
     Calculate the depth of a resource object
     """
-    depth = 0
-    for parent in iter_parents(content):
-        depth += 1
-    return depth
+    return memoize_location('depth', content, _get_content_depth)
 
 
 def iter_parents(content: IResource) -> typing.Iterator[IResource]:
@@ -0,0 +1,42 @@
+from guillotina._settings import app_settings
+from guillotina.db.reader import reader
+from guillotina.tests import utils as test_utils
+
+import pickle
+import time
+
+
+ITERATIONS = 100000
+
+
+# ----------------------------------------------------
+# Measure reading the same database row with and without the decoded object cache
+#
+# Run with:
+#   g run -s mesaures/decoded_cache.py
+#
+# Lessons:
+#   - most of the unpickling time goes to BaseObject.__new__ and __setstate__
+#   - copying the decoded object is about twice as fast for a regular item
+# ----------------------------------------------------
+
+
+async def run(app):
+    ob = test_utils.create_content()
+    ob.title = 'Foobar'
+    ob.tags = ['foo', 'bar']
+    result = {
+        'zoid': ob._p_oid,
+        'tid': 1,
+        'id': ob.id,
+        'state': pickle.dumps(ob)
+    }
+
+    for size in (0, 1024 * 1024):
+        app_settings['cache']['decoded_cache_size'] = size
+        start = time.time()
+        for _ in range(ITERATIONS):
+            reader(result)
+        end = time.time()
+        print(f'decoded_cache_size={size}: {ITERATIONS} reads in {end - start} seconds')
+    app_settings['cache']['decoded_cache_size'] = 0
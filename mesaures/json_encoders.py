@@ -0,0 +1,50 @@
+from guillotina.component import get_multi_adapter
+from guillotina.component import get_utilities_for
+from guillotina.component import get_utility
+from guillotina.interfaces import IApplication
+from guillotina.interfaces import IJSONEncoder
+from guillotina.interfaces import IResourceSerializeToJson
+from guillotina.tests import utils as test_utils
+
+import timeit
+
+
+ITERATIONS = 10000
+REPEAT = 5
+
+
+# ----------------------------------------------------
+# Measure performance of the `IJSONEncoder` utilities, selected with the
+# `json_encoder` setting, on `SerializeToJson` output
+#
+# Run with:
+#   g run -s mesaures/json_encoders.py
+#
+# Lessons:
+#   - ujson encodes about twice as fast as the json module, when it has the
+#     `default` hook for the types it does not know
+#   - without the hook (ujson 1.x) the values are converted to JSON types in
+#     python first, which makes it slower than the json module
+# ----------------------------------------------------
+
+
+def measure(name, func):
+    seconds = min(timeit.repeat(func, number=ITERATIONS, repeat=REPEAT))
+    print(f'{name:<50} {seconds * 1000000 / ITERATIONS:.3f} usec')
+
+
+async def run(app):
+    root = get_utility(IApplication, name='root')
+    request = test_utils.get_mocked_request(root['db'])
+    test_utils.login(request)
+    ob = test_utils.create_content()
+    ob.title = 'Foobar'
+    ob.tags = ['foo', 'bar']
+    serialized = await get_multi_adapter((ob, request), IResourceSerializeToJson)()
+    listing = {
+        'items': [serialized] * 20,
+        'items_count': 20
+    }
+    for name, encoder in sorted(get_utilities_for(IJSONEncoder)):
+        measure(f'{name}: resource', lambda: encoder.dumps(serialized))
+        measure(f'{name}: listing of 20 resources', lambda: encoder.dumps(listing))
@@ -1,57 +1,87 @@
 from guillotina.catalog.catalog import DefaultSecurityInfoAdapter
-from guillotina.component import getAdapter
+from guillotina.component import freeze_lookups
+from guillotina.component import get_adapter
 from guillotina.component import get_multi_adapter
+from guillotina.component import query_adapter
+from guillotina.component import thaw_lookups
+from guillotina.interfaces import IInteraction
 from guillotina.interfaces import IItem
-from guillotina.interfaces import IResourceFieldDeserializer
+from guillotina.interfaces import IJSONToValue
+from guillotina.interfaces import IResourceSerializeToJson
+from guillotina.interfaces import ISchemaFieldSerializeToJson
 from guillotina.interfaces import ISecurityInfo
+from guillotina.interfaces import IValueToJson
 from guillotina.tests import utils as test_utils
 
-import time
+import timeit
 
 
-ITERATIONS = 1000000
+ITERATIONS = 100000
+REPEAT = 5
 
 
 # ----------------------------------------------------
-# Measure performance of different types of lookups
+# Measure performance of different types of lookups, with the lookup cache
+# `make_app` freezes after loading the configuration and without it
+#
+# Run with:
+#   g run -s mesaures/lookups.py
 #
 # Lessons:
 #   - Adapters with only 1 lookup aren't much slower than doing your own manual lookup
 #   - Each additional thing you're adapting makes your lookup about 1/3 more slow
 #   - Keep adapter simple, using callable with params is usually faster and more simple
+#   - Frozen lookups skip the registry hooks, which were most of the cost of
+#     single adapter lookups and of `IFoo(ob)`
 # ----------------------------------------------------
 
 
-async def run2(db):
-    ob = test_utils.create_content()
-    start = time.time()
-    for _ in range(ITERATIONS):
-        getAdapter(ob, ISecurityInfo)
-    end = time.time()
-    print(f'Done with {ITERATIONS} in {end - start} seconds')
-
-
-async def run3(db):
+def manual_lookup(ob):
     lookup_registry = {
         ISecurityInfo: DefaultSecurityInfoAdapter
     }
-    ob = test_utils.create_content()
-    start = time.time()
     type_ = type(ob)
-    for _ in range(ITERATIONS):
+
+    def lookup():
         for interface in type_.__implemented__.flattened():
             # this returns in correct order
             if interface in lookup_registry:
-                DefaultSecurityInfoAdapter(ob)
-    end = time.time()
-    print(f'Done with {ITERATIONS} in {end - start} seconds')
+                return lookup_registry[interface](ob)
+    return lookup
+
 
+def measure(name, func):
+    seconds = min(timeit.repeat(func, number=ITERATIONS, repeat=REPEAT))
+    print(f'{name:<70} {seconds * 1000000 / ITERATIONS:.3f} usec')
 
-async def run(db):
+
+async def run(app):
     ob = test_utils.create_content()
     req = test_utils.get_mocked_request()
-    start = time.time()
-    for _ in range(ITERATIONS):
-        get_multi_adapter((IItem['title'], ob, req), IResourceFieldDeserializer)
-    end = time.time()
-    print(f'Done with {ITERATIONS} in {end - start} seconds')
+    field = IItem['title']
+    tags = ['foo', 'bar']
+    benchmarks = [
+        ('manual dict lookup', manual_lookup(ob)),
+        ('ISecurityInfo(ob)', lambda: ISecurityInfo(ob)),
+        ('query_adapter(ob, ISecurityInfo)', lambda: query_adapter(ob, ISecurityInfo)),
+        ('IInteraction(req)', lambda: IInteraction(req)),
+        ('get_multi_adapter((ob, req), IResourceSerializeToJson)',
+         lambda: get_multi_adapter((ob, req), IResourceSerializeToJson)),
+        ('get_multi_adapter((field, IItem, req), ISchemaFieldSerializeToJson)',
+         lambda: get_multi_adapter((field, IItem, req), ISchemaFieldSerializeToJson)),
+        ('query_adapter(value, IValueToJson)', lambda: query_adapter(tags, IValueToJson)),
+        ('get_adapter(field, IJSONToValue, args=[value, ob])',
+         lambda: get_adapter(field, IJSONToValue, args=['Foobar', ob])),
+    ]
+
+    try:
+        for frozen in (False, True):
+            if frozen:
+                freeze_lookups()
+            else:
+                thaw_lookups()
+            print(f'frozen lookups: {frozen}')
+            for name, func in benchmarks:
+                measure(name, func)
+    finally:
+        freeze_lookups()
@@ -0,0 +1,59 @@
+from guillotina.component import get_utility
+from guillotina.db import ROOT_ID
+from guillotina.db.storages.pg import GET_CHILD
+from guillotina.db.storages.pg import PostgresqlStorage
+from guillotina.interfaces import IApplication
+from guillotina.interfaces import IDatabase
+from guillotina.tests import utils as test_utils
+
+import time
+
+
+ITERATIONS = 10000
+
+
+# ----------------------------------------------------
+# Measure latency of the traversal query(get_child) when preparing the
+# statement for every query vs using the per connection statement cache.
+#
+# Run against a local postgresql database:
+#   g run -c config.yaml -s mesaures/prepared_statements.py
+#
+# Lessons:
+#   - preparing for every query doubles the round trips to the database
+# ----------------------------------------------------
+
+
+def get_pg_database():
+    root = get_utility(IApplication, name='root')
+    for _, db in root:
+        if IDatabase.providedBy(db) and isinstance(db._db.storage, PostgresqlStorage):
+            return db
+
+
+async def run(app):
+    db = get_pg_database()
+    if db is None:
+        print('No postgresql database configured')
+        return
+    storage = db._db.storage
+    request = test_utils.get_mocked_request(db)
+    tm = db.get_transaction_manager()
+    txn = await tm.begin(request=request)
+
+    start = time.time()
+    for _ in range(ITERATIONS):
+        smt = await txn._db_conn.prepare(GET_CHILD)
+        await smt.fetchrow(ROOT_ID, 'foobar')
+    end = time.time()
+    print(f'Prepare every query: {ITERATIONS} in {end - start} seconds, '
+          f'{(end - start) / ITERATIONS * 1000} ms per query')
+
+    start = time.time()
+    for _ in range(ITERATIONS):
+        await storage.get_child(txn, ROOT_ID, 'foobar')
+    end = time.time()
+    print(f'Statement cache: {ITERATIONS} in {end - start} seconds, '
+          f'{(end - start) / ITERATIONS * 1000} ms per query')
+
+    await tm.abort(txn=txn)